@@ -3,46 +3,152 @@ Fetch UN entities data from Airtable.
 
 This script:
 1. Connects to Airtable using API credentials from .env
-2. Fetches all records from the specified base and table
-3. Validates data quality (checks for duplicates, URL safety)
-4. Selects relevant columns for processing
-5. Exports raw data to CSV and pickle formats
+2. Syncs the entities and organs tables concurrently into local snapshots (only
+   records modified since the last run are requested; see api.airtable)
+3. Streams the entities page by page into Parquet and CSV, requesting only the
+   columns declared in schema.py, so memory stays around one page of records.
+   Cells are fetched in Airtable's JSON format and keep their types (lists,
+   booleans, attachments) in Parquet; pass --string-cells for the old
+   all-text format
+4. Validates data quality with the rules in validation.py (record count,
+   duplicates, URL safety, known organs/categories, link shapes) and writes
+   data/output/validation_report.json
+5. Exports organ contacts to JSON
 
 Environment variables required:
 - AIRTABLE_API_KEY: API token from https://airtable.com/create/tokens
 - AIRTABLE_BASE_ID: The base ID containing entity data
 - AIRTABLE_TABLE_ID: The table ID within the base
 
-The output CSV is consumed by 02-process_entities_data.py for further processing.
+The output Parquet file is consumed by 02-process_entities_data.py for further processing.
 """
 
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from urllib.parse import quote
 
-from api.airtable import fetch_airtable_table
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from api.airtable import iterate_synced_pages, sync_airtable_table
 from dotenv import load_dotenv
+from organs.organ_contacts import ORGANS_TABLE_ID, export_organ_contacts
+from schema import (
+    AIRTABLE_FIELDS,
+    BOOL,
+    INPUT,
+    INPUT_CSV,
+    arrow_schema,
+    coerce_fields,
+    coerce_value,
+    columns_for,
+)
+from validation import (
+    REPORT_PATH,
+    prepare_frame,
+    print_report,
+    rule_columns,
+    rules_for,
+    validate,
+    write_report,
+)
 
 # Load environment variables from .env file
 load_dotenv()
 
-df = fetch_airtable_table(os.environ["AIRTABLE_TABLE_ID"])
+# Columns to include in the export are declared in schema.py; only those
+# fields are requested from the API
+selected_columns = columns_for(INPUT)
+csv_columns = columns_for(INPUT_CSV)
 
-# Drop rows that are completely empty (in case of accidentially added empty rows in Airtable)
-df = df.dropna(how="all")
+typed = "--string-cells" not in sys.argv
 
-# Filter out rows where 'added_via_form' is True (user submissions pending review)
-if "added_via_form" in df.columns:
-    df = df[df["added_via_form"] != "TRUE"]
+# Airtable's string cell format returns every field as text
+schema = (
+    arrow_schema(INPUT)
+    if typed
+    else pa.schema([(column, pa.string()) for column in selected_columns])
+)
 
-# Drop rows where entity OR entity_long is NA
-df = df.dropna(subset=["entity", "entity_long"])
-
-# Sanity check: ensure we have a reasonable number of entities
-if len(df) < 200:
-    raise ValueError(f"\nExpected more than 200 records, but got {len(df)}")
+# Export raw data with all fields (including attachments) for backup
+parquet_path = Path("data") / "input" / "input_entities.parquet"
+# CSV for next processing step, without the large head_of_entity_headshot attachment field
+csv_path = Path("data") / "input" / "input_entities.csv"
+parquet_path.parent.mkdir(parents=True, exist_ok=True)
+
+# Outputs are written to temporary files and only replace the previous ones
+# once all validations below have passed
+parquet_temp_path = parquet_path.with_suffix(".parquet.tmp")
+csv_temp_path = csv_path.with_suffix(".csv.tmp")
+
+reference_frames = []
+
+# Both tables live in the same base and share its rate limit, so the organs
+# table is synced in the background while the entities are streamed
+with ThreadPoolExecutor(max_workers=1) as executor:
+    organs_future = executor.submit(sync_airtable_table, ORGANS_TABLE_ID)
+
+    with (
+        pq.ParquetWriter(parquet_temp_path, schema) as writer,
+        open(csv_temp_path, "w", encoding="utf-8", newline="") as csv_file,
+    ):
+        for page in iterate_synced_pages(
+            os.environ["AIRTABLE_TABLE_ID"], fields=AIRTABLE_FIELDS, typed=typed
+        ):
+            rows = []
+            for record in page:
+                fields = record["fields"]
+
+                # Skip rows that are completely empty (in case of accidentially added empty rows in Airtable)
+                if not fields:
+                    continue
+                # Skip rows where 'added_via_form' is True (user submissions pending review)
+                if coerce_value(fields.get("added_via_form"), BOOL):
+                    continue
+                # Skip rows where entity OR entity_long is NA
+                if not fields.get("entity") or not fields.get("entity_long"):
+                    continue
+                rows.append(coerce_fields(fields, INPUT) if typed else fields)
+
+            writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=schema))
+
+            # Lists are written to the CSV as literals like "['General Assembly']"
+            page_df = pd.DataFrame(rows, columns=csv_columns)
+            page_df.to_csv(csv_file, header=csv_file.tell() == 0, index=False)
+            reference_frames.append(page_df[["entity", "entity_long"]])
+
+    organs_count = export_organ_contacts(organs_future.result())
+    print(f"✓ Organ contacts exported to JSON: {organs_count} organs")
+
+# Only entity and entity_long are kept in memory for the entity reference
+df = pd.concat(reference_frames, ignore_index=True)
 print(f"\nNumber of entities fetched: {len(df)}")
 
+# Validate the snapshot (record count, duplicates, URL safety, enums, link
+# shapes, ...) with the rules in validation.py, reading only their columns.
+# The record count may not drop far below that of the previous snapshot
+previous_count = (
+    pq.read_metadata(parquet_path).num_rows if parquet_path.exists() else None
+)
+snapshot_columns = set(pq.read_schema(parquet_temp_path).names)
+report = validate(
+    prepare_frame(
+        pq.read_table(
+            parquet_temp_path,
+            columns=[c for c in rule_columns() if c in snapshot_columns],
+        ).to_pandas()
+    ),
+    rules_for(previous_count),
+)
+write_report(report)
+print()
+print_report(report)
+if not report["passed"]:
+    raise ValueError(
+        f"Validation failed with {report['errors']} errors, see {REPORT_PATH}"
+    )
+
 # Sort by entity for consistent ordering
 df = df.sort_values("entity").reset_index(drop=True)
 
@@ -51,111 +157,11 @@ df = df.sort_values("entity").reset_index(drop=True)
 # Export CSV with just entity and entity_long for quick reference
 entity_ref_path = Path("data") / "output" / "entity_reference.csv"
 entity_ref_path.parent.mkdir(parents=True, exist_ok=True)
-df[["entity", "entity_long"]].to_csv(entity_ref_path, index=False)
+df.to_csv(entity_ref_path, index=False)
 print(f"✓ Entity reference exported to CSV: {entity_ref_path}")
 
-# Check for duplicate entities (data integrity validation)
-duplicates_mask = df["entity"].duplicated(keep=False)
-if duplicates_mask.any():
-    duplicate_rows = df[duplicates_mask][["entity", "entity_long"]].drop_duplicates()
-    duplicates_info = duplicate_rows.to_string(index=False)
-    raise ValueError(f"Duplicate entities found in the input data:\n{duplicates_info}")
-else:
-    print("\nAll entities are unique.")
-
-
-print(f"\nNumber of entities showing: {df.shape[0]}")
-
-# Validate that all entity codes are URL-safe (for routing)
-unsafe_entities = []
-for entity in df["entity"]:
-    if quote(entity, safe="") != entity:
-        unsafe_entities.append(entity)
-
-if unsafe_entities:
-    print("\nWarning: Entities not URL safe:\n", unsafe_entities, "\n")
-else:
-    print("\nAll entities are URL safe.")
-
-# df.columns
-# Define columns to include in the export
-# This ensures we only process relevant fields and maintain consistency
-selected_columns = [
-    # Core entity identifiers
-    "entity",
-    "entity_long",
-    "entity_combined",
-    "entity_aliases",
-    "entity_description",
-    "entity_footnotes",
-    # Links and references
-    "entity_link",
-    "entity_wikipedia_page",
-    "entity_news_page",
-    "entity_branding_page",
-    "entity_data_page",
-    "entity_logo_page",
-    "entity_logo_url",
-    "entity_logo_available",
-    "entity_careers_page",
-    "entity_headquarters",
-    # UN structure and classification
-    "un_principal_organ",
-    "category",
-    "subcategory",
-    "is_ceb_member",
-    # Mandate and registry
-    "foundational_mandate",
-    "entity_mandate_registry",
-    "entity_custom_mandate_registry",
-    # Leadership
-    "head_of_entity_title_general",
-    "head_of_entity_title_specific",
-    "head_of_entity_name",
-    "head_of_entity_level",
-    "head_of_entity_bio_link",
-    "head_of_entity_headshot",
-    "global_leadership_team_url",
-    # Documents and resources
-    "organizational_chart_link",
-    "budget_financial_reporting_link",
-    "results_framework_link",
-    "strategic_plan_link",
-    "annual_reports_link",
-    "transparency_portal_link",
-    # Socials
-    "socials_linkedin",
-    "socials_twitter",
-    "socials_instagram",
-    # Misc
-    "record_id",
-    "review_needed",
-    "on_display",
-    "is_on_pdf",
-]
-
-# Compare with all available columns (for debugging)
-all_columns = df.columns.tolist()
-not_selected_columns = [col for col in all_columns if col not in selected_columns]
-
-# Print columns that are not selected
-print("\nColumns not selected:\n", not_selected_columns, "\n")
-
-# Filter the DataFrame to include only selected columns
-df = df[selected_columns]
-
-# Export raw data with all fields (including attachments) for backup
-output_path = Path("data") / "input" / "input_entities.parquet"
-output_path.parent.mkdir(parents=True, exist_ok=True)
-
-df.to_parquet(output_path)
-print(f"✓ Raw data exported to Parquet: {output_path}")
-
-# Drop head_of_entity_headshot column (large attachment field) before CSV export
-if "head_of_entity_headshot" in df.columns:
-    df = df.drop(columns=["head_of_entity_headshot"])
+parquet_temp_path.replace(parquet_path)
+print(f"✓ Raw data exported to Parquet: {parquet_path}")
 
-# Export to CSV for next processing step
-output_path = Path("data") / "input" / "input_entities.csv"
-df.to_csv(output_path, index=False)
-print(f"✓ Raw data exported to CSV: {output_path}")
+csv_temp_path.replace(csv_path)
+print(f"✓ Raw data exported to CSV: {csv_path}")
@@ -2,60 +2,96 @@
 Process UN entities data from Airtable export.
 
 This script:
-1. Loads entity data from CSV (fetched from Airtable)
-2. Parses and normalizes un_principal_organ field
+1. Loads entity data from the Parquet snapshot (fetched from Airtable)
+2. Normalizes list and boolean fields (already typed unless fetched with --string-cells)
 3. Links local headshot images to entities
-4. Exports processed data to CSV and JSON formats
+4. Hashes every entity and skips the exports when nothing changed since the
+   last run (see manifest.py); pass --force to export anyway
+5. Exports processed data to CSV, XLSX and JSON formats, concurrently, plus a
+   slim index, one detail JSON file per entity (see entity_shards.py) and
+   lookup indexes by slug, organ, category and CEB membership (see lookups.py)
+6. With --compact, also writes dictionary-encoded, minified and pre-compressed
+   variants of the JSON files (see compact.py)
 
 The JSON output is used by the Next.js frontend for static site generation.
 """
 
 import datetime
 import json
+import sys
 from pathlib import Path
 
-import pandas as pd
-from utils import parse_airtable_list_literal
-
-# Load data from csv file (fetched from Airtable)
-input_path = Path("data") / "input" / "input_entities.csv"
-df = pd.read_csv(input_path)
+import pyarrow as pa
+import pyarrow.parquet as pq
+from assets import HEADSHOTS_DIR, asset_index, web_path
+from compact import print_size_report, write_compact
+from entity_shards import (
+    DETAILS_DIR,
+    INDEX_PATH,
+    check_size_budget,
+    write_entity_details,
+    write_entity_index,
+)
+from exports import export_files, write_xlsx
+from lookups import LOOKUPS_PATH, write_lookups
+from manifest import MANIFEST_PATH, build_manifest, load_manifest, write_manifest
+from schema import (
+    BOOL,
+    INDEX,
+    INPUT_CSV,
+    LIST,
+    MANDATE,
+    PROCESSED,
+    PUBLIC,
+    coerce_value,
+    columns_for,
+    columns_of_type,
+)
+from utils import parse_airtable_list_column
+
+# Load data from the Parquet snapshot (fetched from Airtable), without the
+# large head_of_entity_headshot attachment column
+input_path = Path("data") / "input" / "input_entities.parquet"
+input_table = pq.read_table(input_path, columns=columns_for(INPUT_CSV))
+
+# Typed fetches keep Airtable's lists and booleans; --string-cells fetches hold text
+typed = not pa.types.is_string(input_table.schema.field("un_principal_organ").type)
+df = input_table.to_pandas()
 
 # Configuration
-HEADSHOTS_DIR = Path("public") / "images" / "headshots"
 HEADSHOTS_DIR.mkdir(parents=True, exist_ok=True)
 
 # Wrangle ------------------------------------------------------
 
 df = df.sort_values("entity")
 
-# Parse un_principal_organ from string representation to list
-# Airtable exports arrays as string literals like "['General Assembly']"
-df["un_principal_organ"] = df["un_principal_organ"].apply(parse_airtable_list_literal)
-
-
-def parse_review_needed(value) -> bool | None:
-    """Normalize Airtable's "TRUE"/"FALSE"/blank review flag to bool | None.
-
-    Exported as a real JSON boolean so the frontend can rely on truthiness —
-    the raw string "FALSE" would otherwise be truthy in JavaScript.
-    """
-    text = str(value).strip().upper()
-    if text == "TRUE":
-        return True
-    if text == "FALSE":
-        return False
-    return None
-
+if typed:
+    # Arrow list columns arrive as arrays; plain lists serialize cleanly to JSON
+    for column in columns_of_type(LIST):
+        df[column] = df[column].map(list, na_action="ignore")
+else:
+    # Parse list columns from their string representation, e.g. "['General Assembly']".
+    # Headquarters like "Vienna, Austria" are never split on commas
+    for column in columns_of_type(LIST):
+        df[column] = parse_airtable_list_column(
+            df[column], split_commas=column != "entity_headquarters"
+        )
 
-df["review_needed"] = df["review_needed"].apply(parse_review_needed)
+    # Normalize "TRUE"/"FALSE"/blank flags to bool | None. Exported as real JSON
+    # booleans so the frontend can rely on truthiness — the raw string "FALSE"
+    # would otherwise be truthy in JavaScript.
+    for column in columns_of_type(BOOL):
+        if column in df.columns:
+            df[column] = df[column].map(lambda value: coerce_value(value, BOOL))
 
 
 def get_local_headshot_path(entity: str) -> str | None:
     """
     Check if a local headshot exists for the entity and return the web path.
 
-    Searches for headshot images in multiple formats (jpg, jpeg, png, gif, webp).
+    Looks the entity up in the headshot folder's asset index (one directory
+    scan for all entities, see assets.py), preferring jpg, jpeg, png, gif,
+    then webp.
 
     Args:
         entity: The entity short name (e.g., "UNICEF", "WHO")
@@ -67,11 +103,8 @@ def get_local_headshot_path(entity: str) -> str | None:
         >>> get_local_headshot_path("UNICEF")
         '/images/headshots/UNICEF.jpg'
     """
-    for ext in ["jpg", "jpeg", "png", "gif", "webp"]:
-        path = HEADSHOTS_DIR / f"{entity}.{ext}"
-        if path.exists():
-            return f"/images/headshots/{entity}.{ext}"
-    return None
+    path = asset_index(HEADSHOTS_DIR).get(entity)
+    return web_path(path) if path else None
 
 
 # Generate head_of_entity_headshot_link from local files
@@ -81,91 +114,42 @@ df["head_of_entity_headshot_link"] = df["entity"].apply(get_local_headshot_path)
 headshots_found = df["head_of_entity_headshot_link"].notna().sum()
 print(f"Local headshots found: {headshots_found}")
 
-# Drop the raw Airtable attachment column (not needed in output)
-if "head_of_entity_headshot" in df.columns:
-    df = df.drop(columns=["head_of_entity_headshot"])
-
 # len(df)
 
-# Export ------------------------------------------------------
+# Change detection ------------------------------------------------------
 
-# Export to data directory (for reference)
-output_path = Path("data") / "output" / "entities.csv"
-df.to_csv(output_path, index=False)
+# All exports are derived from the processed columns, so identical entity
+# hashes mean identical exports
+previous_manifest = load_manifest()
+manifest = build_manifest(df[columns_for(PROCESSED)], previous_manifest)
+unchanged = manifest["dataset"] == previous_manifest.get("dataset")
 
+if not unchanged:
+    print(
+        f"Entities added: {len(manifest['added'])}, "
+        f"changed: {len(manifest['changed'])}, removed: {len(manifest['removed'])}"
+    )
 
-################
+# Export ------------------------------------------------------
+
+# All files are written at the same time, each to a temporary file that only
+# replaces the previous export once complete (see exports.py)
+processed_df = df[columns_for(PROCESSED)]
 
 # Filter out rows where on_display is not TRUE (hidden entities)
-df = df[df["on_display"] == "True"]
-
-# FIXME
-df = df[
-    [
-        "entity",
-        "entity_long",
-        "entity_combined",
-        "entity_aliases",
-        "entity_description",
-        "entity_footnotes",
-        "entity_link",
-        "entity_wikipedia_page",
-        "entity_news_page",
-        "entity_branding_page",
-        "entity_data_page",
-        "entity_logo_page",
-        "entity_logo_url",
-        "entity_logo_available",
-        "entity_careers_page",
-        "entity_headquarters",
-        "un_principal_organ",
-        "category",
-        "subcategory",
-        "is_ceb_member",
-        "foundational_mandate",
-        "entity_mandate_registry",
-        "entity_custom_mandate_registry",
-        # "head_of_entity_title_general",
-        # "head_of_entity_title_specific",
-        # "head_of_entity_name",
-        # "head_of_entity_level",
-        # "head_of_entity_bio_link",
-        # "head_of_entity_headshot_link",
-        # "global_leadership_team_url",
-        "organizational_chart_link",
-        "budget_financial_reporting_link",
-        "results_framework_link",
-        "strategic_plan_link",
-        "annual_reports_link",
-        "transparency_portal_link",
-        "socials_linkedin",
-        "socials_twitter",
-        "socials_instagram",
-        "is_on_pdf",
-        "review_needed",
-        # "record_id",
-        # "on_display",  # redundant: always "True" after filtering above; not used by frontend
-    ]
-]
-
-
-# Export to public directory (for Next.js static site)
-output_path = Path("public") / "un-entities.csv"
-df.to_csv(output_path, index=False)
-
-# Excel export
-output_path = Path("public") / "un-entities.xlsx"
-df.to_excel(output_path, index=False, engine="openpyxl")
+df = df[df["on_display"].eq(True)]
+
+df = df[columns_for(PUBLIC)]
 
 # JSON export (primary format for Next.js import)
-output_path = Path("public") / "un-entities.json"
+json_path = Path("public") / "un-entities.json"
 meta_path = Path("public") / "un-entities-meta.json"
 
 # Stamp the "last updated" date only when the entity data actually changes.
 # Comparing the freshly generated JSON against the committed file means the
 # date tracks real content changes, not merely when the pipeline last ran.
 new_json = df.to_json(orient="records", indent=2)
-old_json = output_path.read_text() if output_path.exists() else None
+old_json = json_path.read_text() if json_path.exists() else None
 
 today = datetime.date.today().isoformat()
 if old_json == new_json and meta_path.exists():
@@ -173,16 +157,67 @@ if old_json == new_json and meta_path.exists():
 else:
     last_updated = today
 
-output_path.write_text(new_json)
-meta_path.write_text(json.dumps({"last_updated": last_updated}, indent=2) + "\n")
-
-
-# Export for other pages -----------------------------------
-
 # Create minimal entity list for mandate registry integration
-columns_to_select = ["entity", "entity_long"]
-
-df = df[columns_to_select]
-
-output_path = Path("data") / "output" / "mandate_entities.csv"
-df.to_csv(output_path, index=False)
+mandate_df = df[columns_for(MANDATE)]
+
+exports = {
+    # Export to data directory (for reference)
+    Path("data")
+    / "output"
+    / "entities.csv": lambda path: processed_df.to_csv(path, index=False),
+    # Export to public directory (for Next.js static site)
+    Path("public") / "un-entities.csv": lambda path: df.to_csv(path, index=False),
+    Path("public") / "un-entities.xlsx": lambda path: write_xlsx(df, path),
+    json_path: lambda path: path.write_text(new_json),
+    meta_path: lambda path: path.write_text(
+        json.dumps({"last_updated": last_updated}, indent=2) + "\n"
+    ),
+    # Slim index for listing and filtering views
+    INDEX_PATH: lambda path: write_entity_index(df[columns_for(INDEX)], path),
+    # Slug, organ, category and CEB lookups by row number
+    LOOKUPS_PATH: lambda path: write_lookups(df, path),
+    # Export for other pages
+    Path("data")
+    / "output"
+    / "mandate_entities.csv": lambda path: mandate_df.to_csv(path, index=False),
+}
+
+# Unchanged data only skips the exports while every one of them still exists
+up_to_date = (
+    unchanged
+    and all(path.exists() for path in exports)
+    and any(DETAILS_DIR.glob("*.json"))
+)
+
+if up_to_date and "--force" not in sys.argv:
+    print("✓ No entity changes since the last run, exports are up to date")
+else:
+    export_times = export_files(exports)
+    for path, seconds in export_times.items():
+        print(f"✓ Exported {path} ({seconds:.2f} s)")
+
+    # One detail file per entity, loaded by the entity modal
+    details_updated = write_entity_details(df)
+    print(f"✓ Entity detail files updated: {details_updated}")
+
+    # Fails the run if the index outgrows its size budget
+    check_size_budget()
+
+# Optional dictionary-encoded, minified and pre-compressed variants
+if "--compact" in sys.argv:
+    print_size_report(
+        [
+            write_compact(df, json_path),
+            write_compact(df[columns_for(INDEX)], INDEX_PATH),
+        ]
+    )
+
+# Only written when the dataset changed, so its added/changed/removed lists
+# always describe the most recent change
+if not unchanged:
+    write_manifest(manifest)
+    print(f"✓ Entity hashes written to: {MANIFEST_PATH}")
+elif not MANIFEST_PATH.exists():
+    # Loaded from its old location in public/; move it out
+    write_manifest(previous_manifest)
+    print(f"✓ Entity hashes moved to: {MANIFEST_PATH}")
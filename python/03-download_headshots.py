@@ -2,38 +2,60 @@
 Download headshots from Airtable attachments.
 
 This script downloads the largest available version of headshot images
-and stores them locally in public/images/headshots/.
+and stores them locally in public/images/headshots/. Only the entity and
+attachment columns are read from the Parquet snapshot written by
+01-fetch_from_airtable.py. Downloads run on a bounded thread pool sharing one
+pooled HTTP session; each image is written to a hidden .part file, checked
+(content type, size) and only then renamed into place, so an interrupted run
+never leaves a broken image behind. Partial downloads are resumed with HTTP
+range requests on the next run when the server supports them.
 
 Run separately from the main data update pipeline - only needed when
 headshots change or new entities are added.
 
 Usage:
-    uv run python/04-download_headshots.py [--force]
+    uv run python/03-download_headshots.py [--force] [--workers 8]
 
 Options:
-    --force    Re-download all headshots even if they already exist
+    --force      Re-download all headshots even if they already exist
+    --workers    Number of concurrent downloads (default: 8)
 """
 
+import argparse
 import ast
+import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import pandas as pd
+import pyarrow.parquet as pq
 import requests
+from assets import HEADSHOTS_DIR, asset_index
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configuration
-INPUT_PATH = Path("data") / "input" / "input_entities.pkl"
-OUTPUT_DIR = Path("public") / "images" / "headshots"
+INPUT_PATH = Path("data") / "input" / "input_entities.parquet"
+OUTPUT_DIR = HEADSHOTS_DIR
 TIMEOUT = 30  # seconds
+WORKERS = 8
+CHUNK_SIZE = 64 * 1024
+
+# Airtable's string cell format renders attachments as "name.jpg (https://...)"
+_STRING_ATTACHMENT = re.compile(r"^(?P<filename>.*?)\s*\((?P<url>https?://[^)]+)\)")
 
 
 def parse_airtable_attachment(attachment_data) -> dict | None:
     """
     Parse Airtable attachment data and extract the best image URL.
 
-    Handles both string representations and native Python objects (from pickle).
+    Handles native attachment objects (typed Parquet snapshot), list literals
+    (older CSV exports) and Airtable's "name.jpg (https://...)" string cells.
 
-    Returns dict with 'url', 'filename', and 'extension' or None if invalid.
+    Returns dict with 'url', 'filename', 'extension' and 'size' (bytes, when
+    known) or None if invalid.
     """
     if attachment_data is None or (
         isinstance(attachment_data, float) and pd.isna(attachment_data)
@@ -41,14 +63,18 @@ def parse_airtable_attachment(attachment_data) -> dict | None:
         return None
 
     try:
-        # If it's already a list (from pickle), use it directly
+        # If it's already a list (typed snapshot), use it directly
         if isinstance(attachment_data, list):
             attachments = attachment_data
         elif isinstance(attachment_data, str):
             if attachment_data == "nan" or not attachment_data:
                 return None
-            # Parse the string representation of the list
-            attachments = ast.literal_eval(attachment_data)
+            match = _STRING_ATTACHMENT.match(attachment_data)
+            if match:
+                attachments = [match.groupdict()]
+            else:
+                # Parse the string representation of the list
+                attachments = ast.literal_eval(attachment_data)
         else:
             return None
 
@@ -60,14 +86,17 @@ def parse_airtable_attachment(attachment_data) -> dict | None:
 
         # Prefer the 'full' thumbnail (highest quality available)
         # Fall back to 'large', then the main URL
-        thumbnails = attachment.get("thumbnails", {})
+        thumbnails = attachment.get("thumbnails") or {}
 
-        if "full" in thumbnails and thumbnails["full"].get("url"):
+        # Size is only known for the original file, not for thumbnails
+        expected_size = None
+        if (thumbnails.get("full") or {}).get("url"):
             url = thumbnails["full"]["url"]
-        elif "large" in thumbnails and thumbnails["large"].get("url"):
+        elif (thumbnails.get("large") or {}).get("url"):
             url = thumbnails["large"]["url"]
         else:
             url = attachment.get("url")
+            expected_size = attachment.get("size")
 
         if not url:
             return None
@@ -96,6 +125,7 @@ def parse_airtable_attachment(attachment_data) -> dict | None:
             "url": url,
             "filename": original_filename,
             "extension": extension,
+            "size": expected_size,
         }
 
     except (ValueError, SyntaxError, KeyError, TypeError) as e:
@@ -103,50 +133,121 @@ def parse_airtable_attachment(attachment_data) -> dict | None:
         return None
 
 
-def download_image(url: str, output_path: Path) -> bool:
+def create_session(workers: int = WORKERS) -> requests.Session:
     """
-    Download an image from URL to the specified path.
+    Create an HTTP session shared by all download threads.
 
-    Returns True if successful, False otherwise.
+    The connection pool is sized to the number of workers, and connection
+    errors and 429/5xx responses are retried with backoff.
     """
-    try:
-        response = requests.get(url, timeout=TIMEOUT, stream=True)
-        response.raise_for_status()
+    session = requests.Session()
+    retries = Retry(
+        total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504]
+    )
+    adapter = HTTPAdapter(
+        pool_connections=workers, pool_maxsize=workers, max_retries=retries
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def download_image(
+    session: requests.Session,
+    url: str,
+    output_path: Path,
+    expected_size: int | None = None,
+) -> tuple[bool, str]:
+    """
+    Download an image to `output_path` through a temporary .part file.
+
+    A .part file left by an interrupted run is resumed with a Range request
+    conditional on the validator (strong ETag or Last-Modified) saved when it
+    was started, in If-Range. If the image changed since, the server sends
+    it whole and the download starts over, so two versions are never
+    spliced; parts without a validator, or a 206 for another range, are
+    downloaded again too. The file is only renamed into place if the
+    response is an image and its size matches Content-Length (and
+    `expected_size`, when known).
+
+    Returns (success, message).
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = output_path.with_name(f".{output_path.name}.part")
+    validator_path = part_path.with_name(f"{part_path.name}.validator")
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    validator = validator_path.read_text() if validator_path.exists() else None
+    headers = {}
+    if offset and validator:
+        headers = {"Range": f"bytes={offset}-", "If-Range": validator}
 
-        # Verify it's actually an image
-        content_type = response.headers.get("content-type", "")
-        if not content_type.startswith("image/"):
-            print(f"  Warning: URL did not return an image (got {content_type})")
-            return False
+    try:
+        with session.get(
+            url, timeout=TIMEOUT, stream=True, headers=headers
+        ) as response:
+            content_range = response.headers.get("content-range", "")
+            if response.status_code == 416 or (
+                response.status_code == 206
+                and not content_range.startswith(f"bytes {offset}-")
+            ):
+                # Range beyond the end, or not the one requested: start over
+                part_path.unlink()
+                validator_path.unlink(missing_ok=True)
+                return download_image(session, url, output_path, expected_size)
+            response.raise_for_status()
+
+            # Verify it's actually an image
+            content_type = response.headers.get("content-type", "")
+            if not content_type.startswith("image/"):
+                return False, f"URL did not return an image (got {content_type})"
+
+            resumed = response.status_code == 206
+            if not resumed:
+                offset = 0
+                # If-Range needs a strong ETag; Last-Modified works as well
+                etag = response.headers.get("etag", "")
+                validator = (
+                    etag if etag and not etag.startswith("W/") else None
+                ) or response.headers.get("last-modified")
+                if validator:
+                    validator_path.write_text(validator)
+                else:
+                    validator_path.unlink(missing_ok=True)
+            content_length = response.headers.get("content-length")
+            total_size = offset + int(content_length) if content_length else None
+
+            with open(part_path, "ab" if resumed else "wb") as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
 
-        # Write to file
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+    except requests.exceptions.RequestException as e:
+        # The .part file is kept, so the next run can resume it
+        return False, f"Error downloading: {e}"
 
-        return True
+    size = part_path.stat().st_size
+    for expected in (total_size, expected_size):
+        if expected is not None and size != expected:
+            part_path.unlink()
+            validator_path.unlink(missing_ok=True)
+            return False, f"Size mismatch: got {size} bytes, expected {expected}"
 
-    except requests.exceptions.RequestException as e:
-        print(f"  Error downloading: {e}")
-        return False
+    part_path.replace(output_path)
+    validator_path.unlink(missing_ok=True)
+    return True, f"{size / 1024:.1f} KB" + (" (resumed)" if resumed else "")
 
 
 def get_existing_headshot(entity: str, output_dir: Path) -> Path | None:
     """
     Check if a headshot already exists for the given entity.
 
+    Uses the folder's asset index (one directory scan, see assets.py).
+
     Returns the path if found, None otherwise.
     """
-    # Check for common image extensions
-    for ext in ["jpg", "jpeg", "png", "gif", "webp"]:
-        path = output_dir / f"{entity}.{ext}"
-        if path.exists():
-            return path
-    return None
+    return asset_index(output_dir).get(entity)
 
 
-def main(force: bool = False):
+def main(force: bool = False, workers: int = WORKERS):
     """Main function to download all headshots."""
 
     print("📸 Headshot Download Script")
@@ -161,22 +262,25 @@ def main(force: bool = False):
     # Create output directory
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Load data
-    df = pd.read_pickle(INPUT_PATH)
-
     # Check if headshot column exists
-    if "head_of_entity_headshot" not in df.columns:
+    if "head_of_entity_headshot" not in pq.read_schema(INPUT_PATH).names:
         print("\n❌ Error: 'head_of_entity_headshot' column not found in data.")
         print("   Make sure this column is included in the Airtable fetch.")
         sys.exit(1)
 
+    # Load only the two columns needed from the snapshot
+    rows = pq.read_table(
+        INPUT_PATH, columns=["entity", "head_of_entity_headshot"]
+    ).to_pylist()
+
     # Filter to entities with headshots
-    entities_with_headshots = df[df["head_of_entity_headshot"].notna()].copy()
+    entities_with_headshots = [row for row in rows if row["head_of_entity_headshot"]]
     total = len(entities_with_headshots)
 
     print(f"\nFound {total} entities with headshot attachments")
     print(f"Output directory: {OUTPUT_DIR}")
     print(f"Force re-download: {force}")
+    print(f"Concurrent downloads: {workers}")
     print()
 
     # Stats
@@ -184,37 +288,51 @@ def main(force: bool = False):
     skipped = 0
     failed = 0
 
-    for _, row in entities_with_headshots.iterrows():
+    jobs = []
+    for row in entities_with_headshots:
         entity = row["entity"]
-        attachment_str = row["head_of_entity_headshot"]
-
-        print(f"Processing: {entity}")
 
         # Check if already exists (unless force mode)
         if not force:
             existing = get_existing_headshot(entity, OUTPUT_DIR)
             if existing:
-                print(f"  ⏭️  Already exists: {existing.name}")
+                print(f"{entity}: ⏭️  Already exists: {existing.name}")
                 skipped += 1
                 continue
 
         # Parse attachment
-        attachment = parse_airtable_attachment(attachment_str)
+        attachment = parse_airtable_attachment(row["head_of_entity_headshot"])
         if not attachment:
-            print("  ⚠️  No valid attachment found")
+            print(f"{entity}: ⚠️  No valid attachment found")
             failed += 1
             continue
 
-        # Download
-        output_path = OUTPUT_DIR / f"{entity}.{attachment['extension']}"
-        print(f"  ⬇️  Downloading to {output_path.name}...")
-
-        if download_image(attachment["url"], output_path):
-            file_size = output_path.stat().st_size / 1024  # KB
-            print(f"  ✅ Downloaded ({file_size:.1f} KB)")
-            downloaded += 1
-        else:
-            failed += 1
+        jobs.append((entity, attachment))
+
+    # Download
+    session = create_session(workers)
+    print_lock = threading.Lock()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                download_image,
+                session,
+                attachment["url"],
+                OUTPUT_DIR / f"{entity}.{attachment['extension']}",
+                attachment["size"],
+            ): entity
+            for entity, attachment in jobs
+        }
+        for future in as_completed(futures):
+            entity = futures[future]
+            success, message = future.result()
+            with print_lock:
+                if success:
+                    print(f"{entity}: ✅ Downloaded ({message})")
+                    downloaded += 1
+                else:
+                    print(f"{entity}: ❌ {message}")
+                    failed += 1
 
     # Summary
     print()
@@ -233,5 +351,17 @@ def main(force: bool = False):
 
 
 if __name__ == "__main__":
-    force_mode = "--force" in sys.argv
-    main(force=force_mode)
+    parser = argparse.ArgumentParser(description="Download headshots from Airtable")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-download all headshots even if they already exist",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help=f"Number of concurrent downloads (default: {WORKERS})",
+    )
+    args = parser.parse_args()
+    main(force=args.force, workers=args.workers)
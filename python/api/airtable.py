@@ -1,18 +1,148 @@
+import datetime
+import functools
+import json
 import os
+import threading
+import time
+from pathlib import Path
 
 import pandas as pd
 from dotenv import load_dotenv
-from pyairtable import Api
+from pyairtable import Api, Table
+from pyairtable.formulas import IS_AFTER, LAST_MODIFIED_TIME
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Initialize Airtable API connection
-api = Api(os.environ["AIRTABLE_API_KEY"])
+# Local copies of each table, kept between runs for incremental syncs
+SNAPSHOT_DIR = Path("data") / "input" / "airtable_snapshots"
+
+# Re-fetch records modified slightly before the last sync to absorb clock skew
+# between this machine and Airtable; re-applying an upsert is harmless.
+SYNC_OVERLAP = datetime.timedelta(minutes=10)
+
+# LAST_MODIFIED_TIME() only tracks user-editable fields, so changes that arrive
+# via formulas or lookups are picked up by a periodic full refresh.
+FULL_REFRESH_INTERVAL = datetime.timedelta(days=7)
+
+# Airtable allows 5 requests per second per base; every page request goes through
+# the base's shared limiter so concurrent fetches stay under it together.
+# Docs: https://airtable.com/developers/web/api/rate-limits
+# AIRTABLE_REQUESTS_PER_SECOND overrides it, e.g. for the local stand-in in benchmarks/.
+REQUESTS_PER_SECOND = float(os.environ.get("AIRTABLE_REQUESTS_PER_SECOND", 5))
+
+# Docs: https://pyairtable.readthedocs.io/en/stable/api.html?highlight=cell_format#pyairtable.Table.all
+# cell_format – The cell format to request from the Airtable API. Supported options are json (the default) and string. json will return cells as a JSON object. string will return the cell as a string. user_locale and time_zone must be set when using string.
+STRING_CELL_FORMAT = {
+    "cell_format": "string",
+    "user_locale": "en-ca",
+    "time_zone": "America/New_York",
+}
+# Typed fetches use the default JSON cell format, which keeps lists, booleans,
+# numbers and attachments as native JSON values (see schema.arrow_schema).
+JSON_CELL_FORMAT = {"cell_format": "json"}
+
+
+def cell_format_options(typed: bool) -> dict:
+    """Return the request options for typed (JSON) or string cells."""
+    return JSON_CELL_FORMAT if typed else STRING_CELL_FORMAT
+
+
+@functools.cache
+def get_api() -> Api:
+    """
+    Return the Airtable API connection, created on first use.
+
+    AIRTABLE_ENDPOINT_URL points the client at another server (e.g. the local
+    stand-in in benchmarks/airtable_stub.py) instead of api.airtable.com.
+    """
+    return Api(
+        os.environ["AIRTABLE_API_KEY"],
+        endpoint_url=os.environ.get(
+            "AIRTABLE_ENDPOINT_URL", "https://api.airtable.com"
+        ),
+    )
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting how often requests can be made.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request takes one token and waits if the bucket is empty.
+    """
+
+    def __init__(self, rate: float, capacity: int | None = None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_rate_limiters: dict[str, TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(base_id: str) -> TokenBucket:
+    """Return the token bucket shared by all requests to an Airtable base."""
+    with _rate_limiters_lock:
+        if base_id not in _rate_limiters:
+            _rate_limiters[base_id] = TokenBucket(REQUESTS_PER_SECOND)
+        return _rate_limiters[base_id]
+
+
+def iterate_airtable_pages(table: Table, **options):
+    """
+    Yield pages of records from an Airtable table, one rate-limited request per page.
+
+    Args:
+        table: The pyairtable Table to read
+        **options: Passed through to Table.iterate (formula, fields, cell_format, ...).
+            Options set to None are left out of the request.
+
+    Yields:
+        Lists of up to 100 record dicts
+    """
+    limiter = get_rate_limiter(table.base.id)
+    options = {key: value for key, value in options.items() if value is not None}
+    pages = table.iterate(**options)
+    while True:
+        limiter.acquire()
+        try:
+            page = next(pages)
+        except StopIteration:
+            return
+        yield page
+
+
+def fetch_all_records(table: Table, **options) -> list[dict]:
+    """Fetch every record matching `options`, going through the base's rate limiter."""
+    return [
+        record for page in iterate_airtable_pages(table, **options) for record in page
+    ]
 
 
 def fetch_airtable_table(
-    table_id: str, base_id: str = os.environ["AIRTABLE_BASE_ID"]
+    table_id: str,
+    base_id: str | None = None,
+    fields: list[str] | None = None,
+    typed: bool = False,
 ) -> pd.DataFrame:
     """
     Fetch all records from an Airtable table and return as a pandas DataFrame.
@@ -20,6 +150,8 @@ def fetch_airtable_table(
     Args:
         table_id: The ID of the Airtable table
         base_id: The ID of the Airtable base. Uses AIRTABLE_BASE_ID from .env by default.
+        fields: Only request these fields from the API. Requests all fields by default.
+        typed: Request Airtable's JSON cell format instead of strings
 
     Returns:
         DataFrame containing all records from the table
@@ -27,20 +159,206 @@ def fetch_airtable_table(
     Raises:
         ValueError: If no records found in the table.
     """
-    table = api.table(
-        base_id,
+    table = get_api().table(
+        base_id or os.environ["AIRTABLE_BASE_ID"],
         table_id,
     )
 
-    # Docs: https://pyairtable.readthedocs.io/en/stable/api.html?highlight=cell_format#pyairtable.Table.all
-    records = table.all(
-        cell_format="string", user_locale="en-ca", time_zone="America/New_York"
-    )
-
-    # cell_format – The cell format to request from the Airtable API. Supported options are json (the default) and string. json will return cells as a JSON object. string will return the cell as a string. user_locale and time_zone must be set when using string.
+    records = fetch_all_records(table, fields=fields, **cell_format_options(typed))
 
     if not records:
         raise ValueError(f"No records found in Airtable table {table_id}")
 
     data = [record["fields"] for record in records]
     return pd.DataFrame(data)
+
+
+def iterate_synced_pages(
+    table_id: str,
+    base_id: str | None = None,
+    fields: list[str] | None = None,
+    typed: bool = False,
+    id_field: str = "entity",
+    sort_field: str = "entity",
+    page_size: int = 100,
+    snapshot_dir: Path = SNAPSHOT_DIR,
+):
+    """
+    Incrementally sync an Airtable table into a local snapshot, yielding it page by page.
+
+    The first run (or any run after FULL_REFRESH_INTERVAL) streams the full table
+    from the API. Later runs only request records modified since the last sync,
+    list the remaining record IDs to detect deletions, and merge both into the
+    snapshot while reading it line by line. Either way only one page of records
+    (plus the changed records) is held in memory at a time.
+
+    The new snapshot is written to a temporary file and only replaces the old one
+    once every page has been consumed. Changing `fields` or `typed` forces a full
+    sync, since the existing snapshot was taken with a different projection.
+
+    Args:
+        table_id: The ID of the Airtable table
+        base_id: The ID of the Airtable base. Uses AIRTABLE_BASE_ID from .env by default.
+        fields: Only request these fields from the API. Requests all fields by default.
+        typed: Request Airtable's JSON cell format instead of strings
+        id_field: A small field requested when listing record IDs for deletion checks
+        sort_field: Field the snapshot is kept sorted by
+        page_size: Number of records per yielded page
+        snapshot_dir: Directory holding the `<table_id>.jsonl` snapshot and its metadata
+
+    Yields:
+        Lists of up to `page_size` record dicts
+
+    Raises:
+        ValueError: If no records found in the table.
+    """
+    table = get_api().table(base_id or os.environ["AIRTABLE_BASE_ID"], table_id)
+    snapshot_path = snapshot_dir / f"{table_id}.jsonl"
+    meta_path = snapshot_dir / f"{table_id}.meta.json"
+
+    meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+    started_at = datetime.datetime.now(datetime.timezone.utc)
+    last_sync = meta.get("last_sync")
+    last_full_sync = meta.get("last_full_sync")
+
+    def sort_key(record: dict) -> str:
+        return str(record["fields"].get(sort_field, "")).casefold()
+
+    def merge_snapshot(changed: dict[str, dict], current_ids: set[str]):
+        # Both the snapshot and the changed records are sorted, so upserts can be
+        # slotted in while streaming the snapshot instead of loading it whole.
+        pending = sorted(
+            (record for record in changed.values() if record["id"] in current_ids),
+            key=sort_key,
+        )
+        position = 0
+        with open(snapshot_path, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if record["id"] in changed or record["id"] not in current_ids:
+                    continue
+                while position < len(pending) and sort_key(
+                    pending[position]
+                ) <= sort_key(record):
+                    yield pending[position]
+                    position += 1
+                yield record
+        yield from pending[position:]
+
+    if (
+        not snapshot_path.exists()
+        or last_sync is None
+        or last_full_sync is None
+        or meta.get("fields") != fields
+        or meta.get("typed", False) != typed
+        or started_at - datetime.datetime.fromisoformat(last_full_sync)
+        > FULL_REFRESH_INTERVAL
+    ):
+        records = (
+            record
+            for page in iterate_airtable_pages(
+                table, fields=fields, sort=[sort_field], **cell_format_options(typed)
+            )
+            for record in page
+        )
+        last_full_sync = started_at.isoformat()
+        print(f"Full sync of Airtable table {table_id}")
+    else:
+        since = datetime.datetime.fromisoformat(last_sync) - SYNC_OVERLAP
+        changed = {
+            record["id"]: record
+            for record in fetch_all_records(
+                table,
+                formula=IS_AFTER(LAST_MODIFIED_TIME(), since),
+                fields=fields,
+                **cell_format_options(typed),
+            )
+        }
+        current_ids = {
+            record["id"]
+            for record in fetch_all_records(
+                table, fields=[id_field], **STRING_CELL_FORMAT
+            )
+        }
+        records = merge_snapshot(changed, current_ids)
+        print(
+            f"Incremental sync of Airtable table {table_id}: "
+            f"{len(changed)} changed, {meta.get('record_count', 0)} in snapshot"
+        )
+
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    temp_path = snapshot_path.with_suffix(".jsonl.tmp")
+    record_count = 0
+    page = []
+    with open(temp_path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            record_count += 1
+            page.append(record)
+            if len(page) == page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    if not record_count:
+        temp_path.unlink()
+        raise ValueError(f"No records found in Airtable table {table_id}")
+
+    temp_path.replace(snapshot_path)
+    meta_path.write_text(
+        json.dumps(
+            {
+                "last_sync": started_at.isoformat(),
+                "last_full_sync": last_full_sync,
+                "record_count": record_count,
+                "fields": fields,
+                "typed": typed,
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+    print(f"Synced Airtable table {table_id}: {record_count} records")
+
+
+def sync_airtable_table(
+    table_id: str,
+    base_id: str | None = None,
+    fields: list[str] | None = None,
+    typed: bool = False,
+    id_field: str = "entity",
+    snapshot_dir: Path = SNAPSHOT_DIR,
+) -> pd.DataFrame:
+    """
+    Incrementally sync an Airtable table and return it as a pandas DataFrame.
+
+    See iterate_synced_pages for how the local snapshot is kept up to date.
+
+    Args:
+        table_id: The ID of the Airtable table
+        base_id: The ID of the Airtable base. Uses AIRTABLE_BASE_ID from .env by default.
+        fields: Only request these fields from the API. Requests all fields by default.
+        typed: Request Airtable's JSON cell format instead of strings
+        id_field: A small field requested when listing record IDs for deletion checks
+        snapshot_dir: Directory holding the `<table_id>.jsonl` snapshot and its metadata
+
+    Returns:
+        DataFrame containing all records from the table, same as fetch_airtable_table
+
+    Raises:
+        ValueError: If no records found in the table.
+    """
+    data = [
+        record["fields"]
+        for page in iterate_synced_pages(
+            table_id,
+            base_id,
+            fields=fields,
+            typed=typed,
+            id_field=id_field,
+            snapshot_dir=snapshot_dir,
+        )
+        for record in page
+    ]
+    return pd.DataFrame(data)
@@ -0,0 +1,76 @@
+"""
+Index of the entity image files in public/images.
+
+Headshots and logos are stored as <ENTITY>.<ext>. Instead of probing every
+possible extension with Path.exists() for every entity, asset_index() scans
+a directory once with os.scandir and maps each entity to its file. The map
+is cached per directory and rebuilt only when the directory's mtime changes
+(i.e. when files are added, removed or renamed).
+"""
+
+import os
+from pathlib import Path
+
+PUBLIC_DIR = Path("public")
+HEADSHOTS_DIR = PUBLIC_DIR / "images" / "headshots"
+LOGOS_DIR = PUBLIC_DIR / "images" / "logos"
+
+# In order of preference when an entity has several files
+IMAGE_EXTENSIONS = ("jpg", "jpeg", "png", "gif", "webp")
+LOGO_EXTENSIONS = ("svg", "webp", "png", "jpg", "jpeg")
+
+# (directory, extensions) -> (directory mtime_ns, entity -> path)
+_cache: dict[tuple[Path, tuple[str, ...]], tuple[int, dict[str, Path]]] = {}
+
+
+def asset_index(
+    directory: Path = HEADSHOTS_DIR, extensions: tuple[str, ...] = IMAGE_EXTENSIONS
+) -> dict[str, Path]:
+    """
+    Map each entity to its file in `directory`, from a single directory scan.
+
+    Args:
+        directory: Folder with <ENTITY>.<ext> files
+        extensions: Accepted extensions, in order of preference
+
+    Returns:
+        Dict mapping entity short name to file path (empty if the folder is missing)
+
+    Example:
+        >>> asset_index(HEADSHOTS_DIR).get("OLA")
+        PosixPath('public/images/headshots/OLA.jpg')
+    """
+    try:
+        mtime = directory.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+
+    key = (directory, extensions)
+    cached = _cache.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    rank = {extension: position for position, extension in enumerate(extensions)}
+    best: dict[str, tuple[int, Path]] = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            entity, _, extension = entry.name.rpartition(".")
+            if not entity or extension not in rank or not entry.is_file():
+                continue
+            if entity not in best or rank[extension] < best[entity][0]:
+                best[entity] = (rank[extension], directory / entry.name)
+
+    index = {entity: path for entity, (_, path) in best.items()}
+    _cache[key] = (mtime, index)
+    return index
+
+
+def web_path(path: Path) -> str:
+    """
+    Return the site URL path of a file under public/.
+
+    Example:
+        >>> web_path(Path("public/images/headshots/UNICEF.jpg"))
+        '/images/headshots/UNICEF.jpg'
+    """
+    return "/" + path.relative_to(PUBLIC_DIR).as_posix()
@@ -0,0 +1,260 @@
+"""
+Local stand-in for the Airtable "list records" API.
+
+Serves recorded or synthetic tables over HTTP with the same pagination,
+field projection, sorting and cell formats as Airtable, plus configurable latency, page
+size and 429 responses, so the fetch stage can be measured without an API key.
+
+Point api.airtable at it with AIRTABLE_ENDPOINT_URL:
+
+    uv run python/benchmarks/airtable_stub.py --records 10000 --latency 0.2
+    AIRTABLE_ENDPOINT_URL=http://127.0.0.1:8765 AIRTABLE_TABLE_ID=tblEntities \
+        uv run python/01-fetch_from_airtable.py
+
+Synthetic entities are served as table `tblEntities` (see synthetic.py) next to
+the organs table. Recorded responses are read from Airtable snapshots
+(data/input/airtable_snapshots/<table_id>.jsonl) with --snapshot, served
+under the file's table ID.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Allow importing the pipeline modules (schema, api) when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.synthetic import (  # noqa: E402
+    synthetic_organ_records,
+    synthetic_records,
+)
+from organs.organ_contacts import ORGANS_TABLE_ID  # noqa: E402
+
+# Airtable never returns more than 100 records per page
+MAX_PAGE_SIZE = 100
+
+ENTITIES_TABLE_ID = "tblEntities"
+
+
+class AirtableStub(ThreadingHTTPServer):
+    """
+    HTTP server answering Airtable list-records requests from in-memory records.
+
+    Any base ID is accepted; unknown table IDs get a 404. Requests with a
+    filterByFormula (the incremental "modified since" query) get no records,
+    as if nothing changed since the last sync.
+
+    Args:
+        tables: Records to serve per table ID, as returned by the Airtable API
+        port: Port to listen on. 0 picks a free port.
+        latency: Seconds to wait before answering each request
+        max_page_size: Largest page returned, whatever the client asks for
+        rate_limit_every: Answer every Nth request with 429 Too Many Requests (0 = never)
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        tables: dict[str, list[dict]],
+        port: int = 0,
+        latency: float = 0.0,
+        max_page_size: int = MAX_PAGE_SIZE,
+        rate_limit_every: int = 0,
+    ):
+        super().__init__(("127.0.0.1", port), AirtableStubHandler)
+        self.tables = tables
+        self.sorted_tables = {}
+        self.latency = latency
+        self.max_page_size = max_page_size
+        self.rate_limit_every = rate_limit_every
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "AirtableStub":
+        """Serve requests on a background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def list_records(
+        self,
+        table_id: str,
+        fields: list[str] | None,
+        sort_field: str | None,
+        formula: str | None,
+        page_size: int,
+        offset: int,
+        cell_format: str | None = None,
+    ) -> dict:
+        """Build one page of a list-records response."""
+        records = self.tables[table_id]
+        if formula:
+            records = []
+        elif sort_field:
+            with self.lock:
+                if (table_id, sort_field) not in self.sorted_tables:
+                    self.sorted_tables[table_id, sort_field] = sorted(
+                        records,
+                        key=lambda record: str(
+                            record["fields"].get(sort_field, "")
+                        ).casefold(),
+                    )
+            records = self.sorted_tables[table_id, sort_field]
+        page = records[offset : offset + min(page_size, self.max_page_size)]
+        if fields or cell_format == "string":
+            page = [
+                {
+                    **record,
+                    "fields": {
+                        name: (
+                            format_string_cell(value)
+                            if cell_format == "string"
+                            else value
+                        )
+                        for name, value in record["fields"].items()
+                        if not fields or name in fields
+                    },
+                }
+                for record in page
+            ]
+        response = {"records": page}
+        if offset + len(page) < len(records):
+            response["offset"] = str(offset + len(page))
+        return response
+
+
+def format_string_cell(value):
+    """Render a JSON-format cell as Airtable's string cell format does."""
+    if isinstance(value, bool):
+        return "checked" if value else ""
+    if isinstance(value, list):
+        return ", ".join(
+            f"{item['filename']} ({item['url']})" if isinstance(item, dict) else item
+            for item in value
+        )
+    return value
+
+
+class AirtableStubHandler(BaseHTTPRequestHandler):
+    server: AirtableStub
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        self.respond(
+            url.path,
+            fields=query.get("fields[]"),
+            sort_field=query.get("sort[0][field]", [None])[0],
+            formula=query.get("filterByFormula", [None])[0],
+            page_size=int(query.get("pageSize", [MAX_PAGE_SIZE])[0]),
+            offset=int(query.get("offset", [0])[0]),
+            cell_format=query.get("cellFormat", [None])[0],
+        )
+
+    def do_POST(self):
+        # pyairtable switches to POST .../listRecords when the URL gets too long
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}")
+        sort = body.get("sort") or [{}]
+        self.respond(
+            urlparse(self.path).path.removesuffix("/listRecords"),
+            fields=body.get("fields"),
+            sort_field=sort[0].get("field"),
+            formula=body.get("filterByFormula"),
+            page_size=int(body.get("pageSize", MAX_PAGE_SIZE)),
+            offset=int(body.get("offset", 0)),
+            cell_format=body.get("cellFormat"),
+        )
+
+    def respond(self, path: str, **query):
+        server = self.server
+        # Paths look like /v0/{base_id}/{table_id}
+        table_id = path.rstrip("/").rsplit("/", 1)[-1]
+        with server.lock:
+            server.request_count += 1
+            rate_limited = (
+                server.rate_limit_every
+                and server.request_count % server.rate_limit_every == 0
+            )
+            if rate_limited:
+                server.rate_limited_count += 1
+
+        time.sleep(server.latency)
+
+        if rate_limited:
+            status, payload = 429, {"errors": [{"error": "RATE_LIMIT_REACHED"}]}
+        elif table_id not in server.tables:
+            status, payload = 404, {"error": {"type": "TABLE_NOT_FOUND"}}
+        else:
+            status, payload = 200, server.list_records(table_id, **query)
+
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def load_snapshot(path: Path) -> list[dict]:
+    """Load records recorded by api.airtable.iterate_synced_pages."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local Airtable stand-in")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--records", type=int, default=250, help="Number of synthetic records"
+    )
+    parser.add_argument(
+        "--snapshot",
+        type=Path,
+        action="append",
+        default=[],
+        help="Also serve a recorded snapshot (repeatable)",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds per request"
+    )
+    parser.add_argument("--page-size", type=int, default=MAX_PAGE_SIZE)
+    parser.add_argument(
+        "--rate-limit-every",
+        type=int,
+        default=0,
+        help="Answer every Nth request with 429",
+    )
+    args = parser.parse_args()
+
+    tables = {
+        ENTITIES_TABLE_ID: synthetic_records(args.records),
+        ORGANS_TABLE_ID: synthetic_organ_records(),
+    }
+    for snapshot_path in args.snapshot:
+        tables[snapshot_path.stem] = load_snapshot(snapshot_path)
+
+    server = AirtableStub(
+        tables,
+        port=args.port,
+        latency=args.latency,
+        max_page_size=args.page_size,
+        rate_limit_every=args.rate_limit_every,
+    )
+    for table_id, records in tables.items():
+        print(f"Serving {len(records)} records as {table_id}")
+    print(f"Listening at {server.url} (Ctrl+C to stop)")
+    server.serve_forever()
@@ -0,0 +1,159 @@
+"""
+Benchmark the Airtable fetch stage offline, against the local stand-in.
+
+For each table size this measures:
+- fetch_airtable_table: a full pull into a DataFrame, in-process
+- 01-fetch_from_airtable.py (full): the whole fetch script with no snapshot
+- 01-fetch_from_airtable.py (incremental): a second run with the snapshot in place
+
+and reports wall time and records/s. No Airtable key is needed.
+
+Usage:
+    uv run python/benchmarks/fetch_benchmark.py [--sizes 250 10000 100000]
+        [--latency 0.05] [--rate-limit-every 50] [--requests-per-second 5]
+        [--output data/benchmarks/fetch.json]
+
+By default the client-side rate limiter is lifted so the numbers reflect the
+pipeline itself; pass --requests-per-second 5 to include Airtable's limit.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+
+# Allow importing the pipeline modules (schema, api) when run as a script
+sys.path.insert(0, str(PYTHON_DIR))
+
+from benchmarks.airtable_stub import (  # noqa: E402
+    ENTITIES_TABLE_ID,
+    AirtableStub,
+)
+from benchmarks.synthetic import (  # noqa: E402
+    synthetic_organ_records,
+    synthetic_records,
+)
+from organs.organ_contacts import ORGANS_TABLE_ID  # noqa: E402
+
+FETCH_SCRIPT = PYTHON_DIR / "01-fetch_from_airtable.py"
+
+
+def run_fetch_script(env: dict[str, str], workdir: Path) -> float:
+    """Run 01-fetch_from_airtable.py in `workdir` and return its wall time."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(FETCH_SCRIPT)],
+        cwd=workdir,
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def benchmark_size(server: AirtableStub, size: int, args: argparse.Namespace):
+    """Run every benchmark for one table size against the stand-in."""
+    server.tables[ENTITIES_TABLE_ID] = synthetic_records(size)
+    server.sorted_tables.clear()
+
+    # Imported once the environment points at the stand-in (see __main__)
+    from api.airtable import fetch_airtable_table
+
+    results = []
+
+    def record(stage: str, seconds: float, requests: int):
+        results.append(
+            {
+                "stage": stage,
+                "records": size,
+                "seconds": round(seconds, 4),
+                "records_per_second": round(size / seconds, 1),
+                "requests": requests,
+            }
+        )
+
+    requests_before = server.request_count
+    start = time.perf_counter()
+    fetch_airtable_table(ENTITIES_TABLE_ID)
+    record(
+        "fetch_airtable_table",
+        time.perf_counter() - start,
+        server.request_count - requests_before,
+    )
+
+    if not args.skip_script:
+        with tempfile.TemporaryDirectory() as workdir:
+            for stage in ["01 (full)", "01 (incremental)"]:
+                requests_before = server.request_count
+                seconds = run_fetch_script(os.environ.copy(), Path(workdir))
+                record(stage, seconds, server.request_count - requests_before)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Airtable fetch stage")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[250, 1_000, 10_000, 100_000]
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Stand-in seconds per request"
+    )
+    parser.add_argument(
+        "--rate-limit-every",
+        type=int,
+        default=0,
+        help="Stand-in answers every Nth request with 429",
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=1_000_000,
+        help="Client-side rate limit (Airtable's is 5)",
+    )
+    parser.add_argument(
+        "--skip-script",
+        action="store_true",
+        help="Only benchmark fetch_airtable_table, not 01-fetch_from_airtable.py",
+    )
+    parser.add_argument("--output", type=Path, help="Save results as JSON")
+    args = parser.parse_args()
+
+    server = AirtableStub(
+        {ORGANS_TABLE_ID: synthetic_organ_records()},
+        latency=args.latency,
+        rate_limit_every=args.rate_limit_every,
+    ).start()
+    os.environ.update(
+        {
+            "AIRTABLE_API_KEY": "benchmark",
+            "AIRTABLE_BASE_ID": "appBenchmark",
+            "AIRTABLE_TABLE_ID": ENTITIES_TABLE_ID,
+            "AIRTABLE_ENDPOINT_URL": server.url,
+            "AIRTABLE_REQUESTS_PER_SECOND": str(args.requests_per_second),
+        }
+    )
+
+    results = []
+    print(
+        f"{'stage':<24} {'records':>8} {'seconds':>9} {'records/s':>11} {'requests':>9}"
+    )
+    for size in args.sizes:
+        for result in benchmark_size(server, size, args):
+            results.append(result)
+            print(
+                f"{result['stage']:<24} {result['records']:>8} "
+                f"{result['seconds']:>9.3f} {result['records_per_second']:>11.1f} "
+                f"{result['requests']:>9}"
+            )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\n📄 Results saved to: {args.output}")
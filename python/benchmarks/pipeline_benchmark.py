@@ -0,0 +1,212 @@
+"""
+Benchmark the pipeline stages on synthetic tables of increasing size.
+
+For each table size this runs, in a temporary working directory:
+- 01-fetch_from_airtable.py: fetch from the local stand-in, coercion, Parquet
+  and CSV writes, and validation of the snapshot
+- 02-process_entities_data.py --force: processing and all exports
+- validate_data.py: the validation rules and report
+
+Each stage runs as its own process, as in production, and is measured for
+wall time and peak memory (maximum resident set size of that process).
+Results are saved as JSON together with the git commit, so runs on two
+commits can be compared with --compare.
+
+Usage:
+    uv run python/benchmarks/pipeline_benchmark.py [--sizes 250 10000 100000]
+        [--skip-fetch] [--output data/benchmarks/pipeline.json]
+        [--compare data/benchmarks/pipeline-main.json]
+
+With --skip-fetch, the input files are generated directly
+(synthetic.write_synthetic_inputs) instead of being fetched from the stand-in.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+
+# Allow importing the pipeline modules (schema, api) when run as a script
+sys.path.insert(0, str(PYTHON_DIR))
+
+from benchmarks.airtable_stub import (  # noqa: E402
+    ENTITIES_TABLE_ID,
+    AirtableStub,
+)
+from benchmarks.synthetic import (  # noqa: E402
+    synthetic_organ_records,
+    synthetic_records,
+    write_synthetic_inputs,
+)
+from organs.organ_contacts import ORGANS_TABLE_ID  # noqa: E402
+
+STAGES = [
+    ("01 fetch", ["01-fetch_from_airtable.py"]),
+    ("02 process", ["02-process_entities_data.py", "--force"]),
+    ("validate", ["validate_data.py"]),
+]
+# Slower than this relative to the baseline is flagged by --compare
+REGRESSION_THRESHOLD = 1.2
+
+
+def run_stage(args: list[str], env: dict[str, str], workdir: Path) -> dict:
+    """
+    Run a pipeline script in `workdir` and measure it.
+
+    Returns:
+        Dict with wall time in seconds and the process's peak memory in MB
+
+    Raises:
+        subprocess.CalledProcessError: If the script fails
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(PYTHON_DIR / args[0]), *args[1:]],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    # wait4 returns the resource usage of this child alone
+    _, status, usage = os.wait4(process.pid, 0)
+    seconds = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, args)
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_bytes = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    return {"seconds": seconds, "peak_memory_mb": peak_bytes / 1024**2}
+
+
+def benchmark_size(
+    server: AirtableStub | None, size: int, env: dict[str, str]
+) -> list[dict]:
+    """Run every stage for one table size and return one result per stage."""
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        stages = STAGES
+        if server is None:
+            write_synthetic_inputs(size, workdir)
+            stages = STAGES[1:]
+        else:
+            server.tables[ENTITIES_TABLE_ID] = synthetic_records(size)
+            server.sorted_tables.clear()
+
+        for stage, args in stages:
+            measured = run_stage(args, env, workdir)
+            results.append(
+                {
+                    "stage": stage,
+                    "records": size,
+                    "seconds": round(measured["seconds"], 4),
+                    "records_per_second": round(size / measured["seconds"], 1),
+                    "peak_memory_mb": round(measured["peak_memory_mb"], 1),
+                }
+            )
+    return results
+
+
+def git_commit() -> str | None:
+    """Return the current git commit, or None outside a repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PYTHON_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[dict], baseline: dict) -> None:
+    """Print each result's time and memory relative to a previous run."""
+    previous = {
+        (result["stage"], result["records"]): result for result in baseline["results"]
+    }
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for result in results:
+        before = previous.get((result["stage"], result["records"]))
+        if not before:
+            continue
+        time_ratio = result["seconds"] / before["seconds"]
+        memory_ratio = result["peak_memory_mb"] / before["peak_memory_mb"]
+        flag = "  ⚠️  slower" if time_ratio > REGRESSION_THRESHOLD else ""
+        print(
+            f"  {result['stage']:<12} {result['records']:>8}  "
+            f"time x{time_ratio:.2f}  memory x{memory_ratio:.2f}{flag}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 10_000, 100_000])
+    parser.add_argument(
+        "--skip-fetch",
+        action="store_true",
+        help="Generate the input files instead of fetching them from the stand-in",
+    )
+    parser.add_argument("--output", type=Path, help="Save results as JSON")
+    parser.add_argument(
+        "--compare", type=Path, help="Previous results (JSON) to compare against"
+    )
+    args = parser.parse_args()
+
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(
+            [str(PYTHON_DIR), os.environ.get("PYTHONPATH", "")]
+        ),
+        # The index size budget is meant for the real ~200 entities
+        "INDEX_SIZE_BUDGET": str(2**40),
+    }
+    server = None
+    if not args.skip_fetch:
+        server = AirtableStub({ORGANS_TABLE_ID: synthetic_organ_records()}).start()
+        env.update(
+            {
+                "AIRTABLE_API_KEY": "benchmark",
+                "AIRTABLE_BASE_ID": "appBenchmark",
+                "AIRTABLE_TABLE_ID": ENTITIES_TABLE_ID,
+                "AIRTABLE_ENDPOINT_URL": server.url,
+                "AIRTABLE_REQUESTS_PER_SECOND": "1000000",
+            }
+        )
+
+    results = []
+    print(
+        f"{'stage':<12} {'records':>8} {'seconds':>9} {'records/s':>11} {'peak MB':>9}"
+    )
+    for size in args.sizes:
+        for result in benchmark_size(server, size, env):
+            results.append(result)
+            print(
+                f"{result['stage']:<12} {result['records']:>8} "
+                f"{result['seconds']:>9.3f} {result['records_per_second']:>11.1f} "
+                f"{result['peak_memory_mb']:>9.1f}"
+            )
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            "commit": git_commit(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\n📄 Results saved to: {args.output}")
@@ -0,0 +1,160 @@
+"""
+Synthetic Airtable records for the entities table.
+
+Records follow the columns declared in schema.py and look like what the API
+returns with the JSON cell format (lists, booleans and attachment objects), so
+they can be served by the local stand-in (airtable_stub.py) in place of the
+real base. Organs and categories come from the known values in validation.py.
+
+write_synthetic_inputs() writes the same records as the input files of
+01-fetch_from_airtable.py (Parquet, and CSV with list literals), so later
+stages can be run on large tables without the stand-in.
+"""
+
+import random
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from schema import (
+    ATTACHMENT,
+    BOOL,
+    COLUMNS,
+    INPUT,
+    INPUT_CSV,
+    LIST,
+    arrow_schema,
+    coerce_fields,
+    columns_for,
+)
+from validation import CATEGORIES, PRINCIPAL_ORGANS
+
+HEADQUARTERS = [
+    "New York, USA",
+    "Geneva, Switzerland",
+    "Vienna, Austria",
+    "Nairobi, Kenya",
+]
+WORDS = "united nations office programme development peace security rights council fund".split()
+
+
+def synthetic_fields(index: int, rng: random.Random) -> dict:
+    """Return the fields of one synthetic entity, leaving out empty cells like Airtable does."""
+    entity = f"E{index:06d}"
+    fields = {
+        "entity": entity,
+        "entity_long": " ".join(rng.choices(WORDS, k=5)).title(),
+        "record_id": f"rec{index:014d}",
+        "on_display": True,
+    }
+    fields["entity_combined"] = f"{fields['entity_long']} ({entity})"
+
+    for column in COLUMNS:
+        if not column.airtable or column.name in fields or rng.random() < 0.4:
+            continue
+        if column.name == "un_principal_organ":
+            fields[column.name] = rng.sample(PRINCIPAL_ORGANS, k=rng.randint(1, 2))
+        elif column.name == "category":
+            fields[column.name] = rng.choice(CATEGORIES)
+        elif column.name == "subcategory" and "category" not in fields:
+            continue
+        elif column.name == "entity_aliases":
+            fields[column.name] = [
+                w.upper() for w in rng.sample(WORDS, k=rng.randint(1, 3))
+            ]
+        elif column.name == "entity_headquarters":
+            fields[column.name] = [rng.choice(HEADQUARTERS)]
+        elif column.name == "added_via_form":
+            continue
+        elif column.type == BOOL:
+            fields[column.name] = rng.choice([True, False])
+        elif column.type == LIST:
+            fields[column.name] = [w.upper() for w in rng.sample(WORDS, k=2)]
+        elif column.type == ATTACHMENT:
+            fields[column.name] = [
+                {
+                    "id": f"att{index:014d}",
+                    "url": f"https://dl.airtable.com/{entity}.jpg",
+                    "filename": f"{entity}.jpg",
+                    "size": rng.randint(10_000, 500_000),
+                    "type": "image/jpeg",
+                }
+            ]
+        elif column.name.endswith(("_link", "_page", "_url", "_registry")) or (
+            column.name.startswith("socials_")
+        ):
+            fields[column.name] = f"https://www.un.org/{entity.lower()}/{column.name}"
+        else:
+            fields[column.name] = " ".join(rng.choices(WORDS, k=rng.randint(3, 40)))
+
+    # Keep cross-field rules consistent (see validation.py)
+    if "entity_logo_url" in fields:
+        fields["entity_logo_available"] = True
+    return fields
+
+
+def synthetic_records(count: int, seed: int = 0) -> list[dict]:
+    """
+    Generate `count` synthetic Airtable records for the entities table.
+
+    Args:
+        count: Number of records
+        seed: Random seed, so runs with the same arguments serve identical data
+
+    Returns:
+        List of record dicts with id, createdTime and fields
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"rec{index:014d}",
+            "createdTime": "2025-01-01T00:00:00.000Z",
+            "fields": synthetic_fields(index, rng),
+        }
+        for index in range(count)
+    ]
+
+
+def synthetic_organ_records() -> list[dict]:
+    """Return records for the principal organs table (see organs/organ_contacts.py)."""
+    return [
+        {
+            "id": f"recOrgan{index:09d}",
+            "createdTime": "2025-01-01T00:00:00.000Z",
+            "fields": {
+                "entity": organ,
+                "entity_long": organ,
+                "governing_bodies": organ,
+                "intergov_bodies_link": "https://www.un.org/en/about-us/main-bodies",
+                "secretariats": "Secretariat",
+                "order": str(index),
+                "system_grouping": "Principal Organs",
+                "is_displayed": "True",
+            },
+        }
+        for index, organ in enumerate(PRINCIPAL_ORGANS)
+    ]
+
+
+def write_synthetic_inputs(count: int, directory: Path, seed: int = 0) -> None:
+    """
+    Write `count` synthetic entities as data/input files under `directory`.
+
+    Rows are filtered and coerced like 01-fetch_from_airtable.py does, and
+    written to input_entities.parquet and input_entities.csv (with lists as
+    literals like "['General Assembly']").
+    """
+    input_dir = directory / "data" / "input"
+    input_dir.mkdir(parents=True, exist_ok=True)
+    rows = [
+        coerce_fields(record["fields"], INPUT)
+        for record in synthetic_records(count, seed)
+    ]
+    pq.write_table(
+        pa.Table.from_pylist(rows, schema=arrow_schema(INPUT)),
+        input_dir / "input_entities.parquet",
+    )
+    pd.DataFrame(rows, columns=columns_for(INPUT_CSV)).to_csv(
+        input_dir / "input_entities.csv", index=False
+    )
@@ -0,0 +1,174 @@
+"""
+Compact, dictionary-encoded variants of the JSON exports.
+
+With --compact, 02-process_entities_data.py also writes
+public/<name>.compact.json for un-entities.json and un-entities-index.json,
+plus pre-compressed .gz and .br siblings. The compact format stores rows as
+arrays instead of repeating every key, has no indentation, and replaces the
+values of low-cardinality columns (category, subcategory, headquarters,
+principal organs, ...) by integer codes into a per-column dictionary:
+
+    {
+      "columns": ["entity", "category", "un_principal_organ", ...],
+      "dictionaries": {"category": ["Funds and Programmes", ...], ...},
+      "rows": [["UNICEF", 0, [2, 5], ...], ...]
+    }
+
+decode_compact() (and decodeCompact() in src/lib/compact.ts) turn this back
+into the list of records of the original file.
+"""
+
+import gzip
+import json
+from pathlib import Path
+
+import brotli
+import pandas as pd
+from exports import write_atomic
+
+# Encode a column when it has at most this many distinct values per row
+MAX_DISTINCT_RATIO = 0.2
+
+
+def _items(value) -> list:
+    return value if isinstance(value, list) else [value]
+
+
+def encode_compact(
+    records: list[dict], max_distinct_ratio: float = MAX_DISTINCT_RATIO
+) -> dict:
+    """
+    Dictionary-encode the low-cardinality string columns of a list of records.
+
+    A column is encoded when all its values are strings or lists of strings
+    and it has no more than `max_distinct_ratio` distinct values per record.
+
+    Args:
+        records: JSON records, all with the same keys
+        max_distinct_ratio: Largest ratio of distinct values to records to encode
+
+    Returns:
+        Dict with "columns", "dictionaries" and "rows" (see module docstring)
+    """
+    columns = list(records[0]) if records else []
+    dictionaries = {}
+    for column in columns:
+        values = [
+            item
+            for record in records
+            if record[column] is not None
+            for item in _items(record[column])
+        ]
+        distinct = sorted(set(values), key=str) if values else []
+        if (
+            distinct
+            and all(isinstance(value, str) for value in distinct)
+            and len(distinct) <= max_distinct_ratio * len(records)
+        ):
+            dictionaries[column] = distinct
+
+    codes = {
+        column: {value: code for code, value in enumerate(dictionary)}
+        for column, dictionary in dictionaries.items()
+    }
+    rows = []
+    for record in records:
+        row = []
+        for column in columns:
+            value = record[column]
+            if column in codes and value is not None:
+                if isinstance(value, list):
+                    value = [codes[column][item] for item in value]
+                else:
+                    value = codes[column][value]
+            row.append(value)
+        rows.append(row)
+    return {"columns": columns, "dictionaries": dictionaries, "rows": rows}
+
+
+def decode_compact(data: dict) -> list[dict]:
+    """
+    Decode the compact format back into the original list of records.
+
+    Example:
+        >>> data = encode_compact([{"a": "x", "b": ["y"]}] * 10)
+        >>> data["rows"][0]
+        [0, [0]]
+        >>> decode_compact(data)[0]
+        {'a': 'x', 'b': ['y']}
+    """
+    columns, dictionaries = data["columns"], data["dictionaries"]
+    records = []
+    for row in data["rows"]:
+        record = {}
+        for column, value in zip(columns, row):
+            dictionary = dictionaries.get(column)
+            if dictionary is not None and value is not None:
+                if isinstance(value, list):
+                    value = [dictionary[code] for code in value]
+                else:
+                    value = dictionary[value]
+            record[column] = value
+        records.append(record)
+    return records
+
+
+def write_compact(df: pd.DataFrame, raw_path: Path) -> dict:
+    """
+    Write the compact variant of an export and its compressed siblings.
+
+    For public/un-entities.json this writes un-entities.compact.json,
+    un-entities.compact.json.gz and un-entities.compact.json.br.
+    The encoding is checked to round-trip before anything is written.
+
+    Args:
+        df: Records written to `raw_path`
+        raw_path: Path of the regular (indented) JSON export
+
+    Returns:
+        Size report: artifact name and raw, encoded, gzip and brotli sizes in bytes
+
+    Raises:
+        ValueError: If the compact data does not decode to the original records
+    """
+    records = json.loads(df.to_json(orient="records"))
+    data = encode_compact(records)
+    if decode_compact(data) != records:
+        raise ValueError(f"Compact encoding of {raw_path} does not round-trip")
+
+    encoded = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+    compact_path = raw_path.with_suffix(".compact.json")
+    compressed = {
+        ".gz": gzip.compress(encoded, compresslevel=9, mtime=0),
+        ".br": brotli.compress(encoded, quality=11),
+    }
+
+    write_atomic(compact_path, lambda path: path.write_bytes(encoded))
+    for suffix, content in compressed.items():
+        write_atomic(
+            compact_path.with_name(compact_path.name + suffix),
+            lambda path: path.write_bytes(content),
+        )
+
+    return {
+        "artifact": raw_path.name,
+        "raw_bytes": raw_path.stat().st_size if raw_path.exists() else None,
+        "encoded_bytes": len(encoded),
+        "gzip_bytes": len(compressed[".gz"]),
+        "brotli_bytes": len(compressed[".br"]),
+    }
+
+
+def print_size_report(reports: list[dict]) -> None:
+    """Print raw vs encoded vs compressed sizes of the compact artifacts."""
+
+    def kb(size: int | None) -> str:
+        return f"{size / 1024:.1f} KB" if size is not None else "-"
+
+    print(f"\n{'artifact':<26} {'raw':>10} {'encoded':>10} {'gzip':>10} {'brotli':>10}")
+    for report in reports:
+        print(
+            f"{report['artifact']:<26} {kb(report['raw_bytes']):>10} "
+            f"{kb(report['encoded_bytes']):>10} {kb(report['gzip_bytes']):>10} "
+            f"{kb(report['brotli_bytes']):>10}"
+        )
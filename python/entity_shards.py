@@ -0,0 +1,110 @@
+"""
+Slim entity index and per-entity detail files for the frontend.
+
+Listing and filtering views only need a few fields of each entity, so
+02-process_entities_data.py writes them to public/un-entities-index.json,
+and the full record of every entity to public/entities/<slug>.json, which
+the entity modal loads on demand. A size budget keeps the index (part of
+every first page load) from silently growing back to the full dataset.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+from exports import write_atomic
+from utils import create_entity_slug
+
+INDEX_PATH = Path("public") / "un-entities-index.json"
+DETAILS_DIR = Path("public") / "entities"
+
+# The full un-entities.json is ~280 KB; the index should stay a fraction of it.
+# Override with INDEX_SIZE_BUDGET (bytes), e.g. for synthetic benchmark data
+INDEX_SIZE_BUDGET = int(os.environ.get("INDEX_SIZE_BUDGET") or 64 * 1024)
+
+
+def write_entity_index(df: pd.DataFrame, path: Path) -> None:
+    """Write the listing fields of every entity as minified JSON."""
+    df.to_json(path, orient="records")
+
+
+def write_entity_details(df: pd.DataFrame, directory: Path = DETAILS_DIR) -> int:
+    """
+    Write one JSON file per entity, named by its slug, and remove stale files.
+
+    Files whose content is unchanged are left untouched.
+
+    Args:
+        df: Public entity records
+        directory: Folder for the <slug>.json files
+
+    Returns:
+        Number of files written or removed
+
+    Raises:
+        ValueError: If two entities map to the same slug
+    """
+    slugs = df["entity"].map(create_entity_slug)
+    duplicates = slugs[slugs.duplicated(keep=False)]
+    if not duplicates.empty:
+        raise ValueError(
+            f"Entities share a slug: {sorted(df.loc[duplicates.index, 'entity'])}"
+        )
+
+    directory.mkdir(parents=True, exist_ok=True)
+    records = json.loads(df.to_json(orient="records"))
+    updated = 0
+    for slug, record in zip(slugs, records):
+        path = directory / f"{slug}.json"
+        content = json.dumps(record, indent=2) + "\n"
+        if path.exists() and path.read_text() == content:
+            continue
+        write_atomic(path, lambda temp_path: temp_path.write_text(content))
+        updated += 1
+
+    current = set(slugs)
+    for path in directory.glob("*.json"):
+        if path.stem not in current:
+            path.unlink()
+            updated += 1
+    return updated
+
+
+def check_size_budget(
+    index_path: Path = INDEX_PATH,
+    full_path: Path = Path("public") / "un-entities.json",
+    details_dir: Path = DETAILS_DIR,
+    budget: int = INDEX_SIZE_BUDGET,
+) -> dict:
+    """
+    Report the size of the index against the full dataset and the detail files.
+
+    Returns:
+        Dict with index, full and detail sizes in bytes
+
+    Raises:
+        ValueError: If the index is larger than `budget` bytes
+    """
+    detail_sizes = [path.stat().st_size for path in details_dir.glob("*.json")]
+    report = {
+        "index_bytes": index_path.stat().st_size,
+        "full_bytes": full_path.stat().st_size,
+        "detail_files": len(detail_sizes),
+        "largest_detail_bytes": max(detail_sizes, default=0),
+        "budget_bytes": budget,
+    }
+    share = report["index_bytes"] / report["full_bytes"]
+    print(
+        f"📦 Index: {report['index_bytes'] / 1024:.1f} KB "
+        f"({share:.0%} of {report['full_bytes'] / 1024:.1f} KB, "
+        f"budget {budget / 1024:.0f} KB); {report['detail_files']} detail files, "
+        f"largest {report['largest_detail_bytes'] / 1024:.1f} KB"
+    )
+    if report["index_bytes"] > budget:
+        raise ValueError(
+            f"{index_path} is {report['index_bytes']} bytes, over the budget of "
+            f"{budget} bytes. Move fields out of the INDEX output in schema.py "
+            "or raise INDEX_SIZE_BUDGET."
+        )
+    return report
@@ -0,0 +1,113 @@
+"""
+Concurrent, atomic writers for the exported entity files.
+
+02-process_entities_data.py hands every output file to export_files(), which
+writes them side by side on a thread pool. Each file is written to a
+temporary sibling and renamed into place once complete, so readers (and the
+git diff in the workflow) never see a half-written export. The XLSX export
+uses openpyxl's write-only mode, which streams rows to disk instead of
+building the whole workbook in memory.
+"""
+
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+# Same header style as pandas' to_excel()
+_HEADER_FONT = Font(bold=True)
+_HEADER_BORDER = Border(*(Side(style="thin"),) * 4)
+_HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
+
+
+def write_atomic(path: Path, write: Callable[[Path], None]) -> None:
+    """
+    Write a file through a temporary sibling and rename it into place.
+
+    Args:
+        path: Final path of the file
+        write: Function writing the complete file to the path it is given
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def _excel_value(value):
+    """Convert a DataFrame cell to a value openpyxl can store, like to_excel() does."""
+    if isinstance(value, (list, tuple)):
+        return str(value)
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if hasattr(value, "item"):
+        # numpy scalars (e.g. numpy.bool_)
+        return value.item()
+    return value
+
+
+def write_xlsx(df: pd.DataFrame, path: Path) -> None:
+    """
+    Write a DataFrame to XLSX in openpyxl's write-only (streaming) mode.
+
+    Rows are appended one at a time and flushed to disk, so memory stays flat
+    however many entities there are. Produces the same cells as
+    df.to_excel(path, index=False).
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+
+    header = []
+    for column in df.columns:
+        cell = WriteOnlyCell(sheet, value=str(column))
+        cell.font = _HEADER_FONT
+        cell.border = _HEADER_BORDER
+        cell.alignment = _HEADER_ALIGNMENT
+        header.append(cell)
+    sheet.append(header)
+
+    for row in df.itertuples(index=False, name=None):
+        sheet.append([_excel_value(value) for value in row])
+    workbook.save(path)
+
+
+def export_files(
+    writers: dict[Path, Callable[[Path], None]], max_workers: int | None = None
+) -> dict[Path, float]:
+    """
+    Write several export files at the same time, each one atomically.
+
+    Args:
+        writers: Output path -> function writing that file to the path it is given
+        max_workers: Size of the thread pool (default: one thread per file)
+
+    Returns:
+        Dict mapping each output path to its write time in seconds
+
+    Raises:
+        Exception: The first error raised by a writer, after all writers finished
+
+    Example:
+        >>> export_files({
+        ...     Path("public/un-entities.csv"): lambda p: df.to_csv(p, index=False),
+        ...     Path("public/un-entities.xlsx"): lambda p: write_xlsx(df, p),
+        ... })
+    """
+
+    def timed_write(path: Path) -> float:
+        start = time.perf_counter()
+        write_atomic(path, writers[path])
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(writers)) as executor:
+        futures = {path: executor.submit(timed_write, path) for path in writers}
+    return {path: future.result() for path, future in futures.items()}
@@ -0,0 +1,426 @@
+"""
+Download and optimize entity logos from the entity_logo_url column.
+
+For every entity with entity_logo_available and an entity_logo_url in the
+Parquet snapshot written by 01-fetch_from_airtable.py, this script downloads
+the logo (concurrently, over one pooled session) into public/images/logos/:
+
+- SVGs are minified (XML declaration, comments, doctype, editor metadata and
+  indentation removed) and kept only if the result still parses as XML.
+- Raster logos are scaled down to MAX_HEIGHT and converted to WebP, unless
+  the source is smaller.
+
+Logos whose source bytes hash (or ETag) is unchanged since the last run are
+not rewritten. Only files this script wrote (manifest entries with a
+source_url) are ever deleted, and an existing SVG logo is never replaced by
+a raster one, so hand-maintained logos are left alone. A manifest with one
+entry per logo is written for the frontend:
+
+    public/images/logos/manifest.json
+    {"DPO": {"path": "/images/logos/DPO.svg", "format": "svg", "bytes": 6120,
+             "source_url": "https://...", "source_hash": "3f2a9c1e"}}
+
+With --sprite, all SVG logos are also combined into one SVG sprite,
+public/images/logos-sprite.svg, with a <symbol id="logo-<ENTITY>"> each
+(ids and CSS classes prefixed per logo), so a chart can render every logo
+with a single request: <svg><use href="/images/logos-sprite.svg#logo-DPO"/></svg>
+
+Usage:
+    uv run python/images/fetch_logos.py [--force] [--sprite] [--workers 8]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import re
+import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import pyarrow.parquet as pq
+import requests
+from PIL import Image, ImageOps
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Allow importing the pipeline modules (assets, exports) when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from assets import LOGO_EXTENSIONS, LOGOS_DIR, asset_index, web_path  # noqa: E402
+from exports import write_atomic  # noqa: E402
+from schema import BOOL, coerce_value  # noqa: E402
+
+INPUT_PATH = Path("data") / "input" / "input_entities.parquet"
+MANIFEST_PATH = LOGOS_DIR / "manifest.json"
+# Outside LOGOS_DIR, so the sprite is not indexed as an entity logo
+SPRITE_PATH = LOGOS_DIR.with_name("logos-sprite.svg")
+
+TIMEOUT = 30  # seconds
+WORKERS = 8
+# Logos are shown at most 64 px high: keep 2x for high-density screens
+MAX_HEIGHT = 128
+WEBP_QUALITY = 90
+
+_SVG_JUNK = [
+    re.compile(r"<\?xml.*?\?>", re.S),
+    re.compile(r"<!DOCTYPE[^>]*>", re.S | re.I),
+    re.compile(r"<!--.*?-->", re.S),
+    re.compile(r"<metadata\b.*?</metadata>", re.S),
+    re.compile(r"<sodipodi:namedview\b.*?(?:/>|</sodipodi:namedview>)", re.S),
+]
+# Only whitespace containing a line break, so spaces between <tspan>s survive
+_SVG_INDENT = re.compile(r">\s*\n\s*<")
+_SVG_ROOT = re.compile(r"<svg\b([^>]*)>(.*)</svg>", re.S)
+
+
+def source_hash(content: bytes) -> str:
+    """Return the first 8 hex digits of the SHA-256 of some bytes."""
+    return hashlib.sha256(content).hexdigest()[:8]
+
+
+def is_svg(content: bytes, content_type: str = "") -> bool:
+    """Whether downloaded logo bytes are an SVG document."""
+    return "svg" in content_type or b"<svg" in content[:2048]
+
+
+def minify_svg(content: bytes) -> bytes:
+    """
+    Strip comments, metadata and indentation from an SVG.
+
+    The original is returned if the minified document no longer parses.
+
+    Example:
+        >>> minify_svg(b'<?xml version="1.0"?>\\n<!-- x -->\\n<svg>\\n  <g/>\\n</svg>')
+        b'<svg><g/></svg>'
+    """
+    text = content.decode("utf-8")
+    for pattern in _SVG_JUNK:
+        text = pattern.sub("", text)
+    text = _SVG_INDENT.sub("><", text).strip()
+    try:
+        ET.fromstring(text)
+    except ET.ParseError:
+        return content
+    return text.encode("utf-8")
+
+
+def optimize_raster(content: bytes) -> bytes:
+    """Scale a raster logo down to MAX_HEIGHT and convert it to WebP."""
+    with Image.open(io.BytesIO(content)) as image:
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+        image.thumbnail((image.width, MAX_HEIGHT), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, format="WEBP", quality=WEBP_QUALITY, method=6)
+    return output.getvalue()
+
+
+def raster_extension(url: str, content_type: str) -> str:
+    """Guess the extension of a raster logo from its content type or URL."""
+    subtype = content_type.split(";")[0].removeprefix("image/").strip()
+    extension = {"jpeg": "jpg", "svg+xml": "svg"}.get(subtype, subtype)
+    if extension in LOGO_EXTENSIONS:
+        return extension
+    suffix = Path(url.split("?")[0]).suffix.lstrip(".").lower()
+    return suffix if suffix in LOGO_EXTENSIONS else "png"
+
+
+def create_session(workers: int = WORKERS) -> requests.Session:
+    """Create an HTTP session with a connection pool sized to the workers."""
+    session = requests.Session()
+    retries = Retry(
+        total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504]
+    )
+    adapter = HTTPAdapter(
+        pool_connections=workers, pool_maxsize=workers, max_retries=retries
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_logo(
+    session: requests.Session,
+    entity: str,
+    url: str,
+    previous: dict,
+    force: bool = False,
+) -> dict | None:
+    """
+    Download one logo and write its optimized file, unless it is unchanged.
+
+    Args:
+        session: Shared HTTP session
+        entity: Entity short name, used as the file name
+        url: Logo URL
+        previous: The entity's manifest entry from the last run ({} if none)
+        force: Rewrite the logo even if its source is unchanged
+
+    Returns:
+        The new manifest entry, or None if the logo is unchanged (or is a
+        raster and the entity already has an SVG logo, which is kept)
+
+    Raises:
+        requests.RequestException: If the download fails
+        ValueError: If the URL did not return an image
+    """
+    output_exists = (
+        not force
+        and bool(previous)
+        and (LOGOS_DIR / Path(previous["path"]).name).exists()
+    )
+    headers = {}
+    if output_exists and previous.get("source_url") == url and previous.get("etag"):
+        headers["If-None-Match"] = previous["etag"]
+
+    response = session.get(url, timeout=TIMEOUT, headers=headers)
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+
+    content = response.content
+    content_type = response.headers.get("content-type", "")
+    digest = source_hash(content)
+    if (
+        output_exists
+        and previous.get("source_url") == url
+        and previous.get("source_hash") == digest
+    ):
+        return None
+
+    if is_svg(content, content_type):
+        optimized, extension = minify_svg(content), "svg"
+    elif content_type.startswith("image/") or not content_type:
+        optimized, extension = optimize_raster(content), "webp"
+        if len(optimized) >= len(content):
+            # The source is already smaller (small flat PNGs)
+            optimized, extension = content, raster_extension(url, content_type)
+    else:
+        raise ValueError(f"URL did not return an image (got {content_type})")
+
+    if extension != "svg" and (LOGOS_DIR / f"{entity}.svg").exists():
+        # Never replace a vector logo with a raster one
+        return None
+
+    path = LOGOS_DIR / f"{entity}.{extension}"
+    write_atomic(path, lambda temp_path: temp_path.write_bytes(optimized))
+    # Drop the file this script wrote last time if the format changed;
+    # hand-maintained files (manifest entries without a source) are kept
+    if previous.get("source_url"):
+        written = LOGOS_DIR / Path(previous["path"]).name
+        if written != path:
+            written.unlink(missing_ok=True)
+
+    entry = {
+        "path": web_path(path),
+        "format": extension,
+        "bytes": len(optimized),
+        "source_url": url,
+        "source_hash": digest,
+    }
+    if response.headers.get("etag"):
+        entry["etag"] = response.headers["etag"]
+    return entry
+
+
+def _prefix_ids(svg: str, prefix: str) -> str:
+    """Prefix the ids and CSS classes of an SVG fragment, for the sprite."""
+    svg = re.sub(r'\bid="([^"]+)"', rf'id="{prefix}-\1"', svg)
+    svg = re.sub(r"url\(#([^)]+)\)", rf"url(#{prefix}-\1)", svg)
+    svg = re.sub(r'href="#([^"]+)"', rf'href="#{prefix}-\1"', svg)
+    svg = re.sub(
+        r'\bclass="([^"]+)"',
+        lambda m: 'class="' + " ".join(f"{prefix}-{c}" for c in m[1].split()) + '"',
+        svg,
+    )
+    return re.sub(
+        r"(<style\b[^>]*>)(.*?)(</style>)",
+        lambda m: m[1]
+        + re.sub(r"\.(-?[_a-zA-Z][\w-]*)", rf".{prefix}-\1", m[2])
+        + m[3],
+        svg,
+        flags=re.S,
+    )
+
+
+def build_sprite(logos: dict[str, Path]) -> tuple[str, list[str]]:
+    """
+    Combine SVG logos into one sprite of <symbol> elements.
+
+    Args:
+        logos: Entity -> SVG file path
+
+    Returns:
+        (sprite document, entities included); logos without a usable viewBox
+        or size are skipped
+    """
+    symbols, included = [], []
+    # Namespace prefixes used inside the logos (xlink:, inkscape:, ...)
+    namespaces = {"xmlns": "http://www.w3.org/2000/svg"}
+    for entity, path in sorted(logos.items()):
+        match = _SVG_ROOT.search(minify_svg(path.read_bytes()).decode("utf-8"))
+        if not match:
+            continue
+        attributes, body = match.groups()
+        for prefix, uri in re.findall(r'\b(xmlns:[\w-]+)="([^"]*)"', attributes):
+            namespaces.setdefault(prefix, uri)
+        view_box = re.search(r'viewBox="([^"]+)"', attributes)
+        if view_box:
+            view_box = view_box[1]
+        else:
+            width = re.search(r'\bwidth="([\d.]+)', attributes)
+            height = re.search(r'\bheight="([\d.]+)', attributes)
+            if not (width and height):
+                continue
+            view_box = f"0 0 {width[1]} {height[1]}"
+        symbol_id = f"logo-{entity}"
+        symbols.append(
+            f'<symbol id="{symbol_id}" viewBox="{view_box}">'
+            f"{_prefix_ids(body, symbol_id)}</symbol>"
+        )
+        included.append(entity)
+
+    declarations = " ".join(f'{prefix}="{uri}"' for prefix, uri in namespaces.items())
+    sprite = (
+        f'<svg {declarations} style="display:none">' + "".join(symbols) + "</svg>\n"
+    )
+
+    return sprite, included
+
+
+def load_logo_urls(path: Path = INPUT_PATH) -> dict[str, str]:
+    """Read entity -> logo URL for entities with an available logo."""
+    rows = pq.read_table(
+        path, columns=["entity", "entity_logo_url", "entity_logo_available"]
+    ).to_pylist()
+    return {
+        row["entity"]: row["entity_logo_url"].strip()
+        for row in rows
+        if row["entity_logo_url"]
+        and row["entity_logo_url"].strip()
+        and coerce_value(row["entity_logo_available"], BOOL)
+    }
+
+
+def main(force: bool = False, sprite: bool = False, workers: int = WORKERS):
+    """Fetch new and changed logos and update the logo manifest."""
+    print("🏷️  Logo Fetch Script")
+    print("=" * 50)
+
+    if not INPUT_PATH.exists():
+        print(f"\n❌ Error: Input file not found: {INPUT_PATH}")
+        print("   Run '01-fetch_from_airtable.py' first.")
+        sys.exit(1)
+
+    LOGOS_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    if MANIFEST_PATH.exists():
+        manifest = json.loads(MANIFEST_PATH.read_text())
+
+    urls = load_logo_urls()
+    print(f"\n{len(urls)} entities with a logo URL")
+    if force:
+        print("Force re-download: True")
+    print()
+
+    updated = unchanged = failed = 0
+    session = create_session(workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                fetch_logo,
+                session,
+                entity,
+                url,
+                manifest.get(entity, {}),
+                force,
+            ): entity
+            for entity, url in urls.items()
+        }
+        for future in as_completed(futures):
+            entity = futures[future]
+            try:
+                entry = future.result()
+            except (requests.RequestException, ValueError, OSError) as e:
+                print(f"  ❌ {entity}: {e}")
+                failed += 1
+                continue
+            if entry is None:
+                unchanged += 1
+                continue
+            manifest[entity] = entry
+            print(f"  ✅ {entity}: {entry['format']}, {entry['bytes'] / 1024:.1f} KB")
+            updated += 1
+
+    # Logos fetched earlier whose URL has since been removed
+    removed = sorted(
+        entity
+        for entity, entry in manifest.items()
+        if entry.get("source_url") and entity not in urls
+    )
+    for entity in removed:
+        (LOGOS_DIR / Path(manifest.pop(entity)["path"]).name).unlink(missing_ok=True)
+
+    # Hand-maintained logos are listed too, without source fields
+    logos = asset_index(LOGOS_DIR, LOGO_EXTENSIONS)
+    for entity, path in logos.items():
+        entry = manifest.get(entity, {})
+        if entry.get("path") != web_path(path):
+            manifest[entity] = {
+                "path": web_path(path),
+                "format": path.suffix.lstrip("."),
+                "bytes": path.stat().st_size,
+            }
+    manifest = {entity: manifest[entity] for entity in sorted(logos)}
+
+    for entry in manifest.values():
+        entry.pop("sprite_id", None)
+    if sprite:
+        svg_logos = {
+            entity: path for entity, path in logos.items() if path.suffix == ".svg"
+        }
+        document, included = build_sprite(svg_logos)
+        write_atomic(SPRITE_PATH, lambda path: path.write_text(document))
+        for entity in included:
+            manifest[entity]["sprite_id"] = f"logo-{entity}"
+
+    write_atomic(
+        MANIFEST_PATH,
+        lambda path: path.write_text(json.dumps(manifest, indent=2) + "\n"),
+    )
+
+    print("\n" + "=" * 50)
+    print("📊 Summary:")
+    print(f"   Updated:   {updated}")
+    print(f"   Unchanged: {unchanged}")
+    print(f"   Removed:   {len(removed)}")
+    print(f"   Failed:    {failed}")
+    print(f"\n📁 Logos saved to: {LOGOS_DIR} ({len(logos)} logos)")
+    print(f"📄 Manifest saved to: {MANIFEST_PATH}")
+    if sprite:
+        print(
+            f"🧩 Sprite saved to: {SPRITE_PATH} ({len(included)} SVG logos, "
+            f"{SPRITE_PATH.stat().st_size / 1024:.1f} KB)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch and optimize entity logos")
+    parser.add_argument(
+        "--force", action="store_true", help="Re-download and rewrite all logos"
+    )
+    parser.add_argument(
+        "--sprite",
+        action="store_true",
+        help=f"Also combine the SVG logos into {SPRITE_PATH}",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help=f"Number of concurrent downloads (default: {WORKERS})",
+    )
+    args = parser.parse_args()
+    main(force=args.force, sprite=args.sprite, workers=args.workers)
@@ -0,0 +1,228 @@
+"""
+Optimize headshots into responsive WebP/AVIF variants.
+
+For every headshot in public/images/headshots/ (as downloaded by
+03-download_headshots.py), this script writes resized copies at fixed widths
+in modern formats to public/images/headshots-optimized/, on a process pool.
+File names contain a hash of the source image, e.g. UNICEF-3f2a9c1e-128.webp,
+so they can be cached forever. A manifest with the srcset of every entity is
+written for the frontend:
+
+    public/images/headshots-optimized/manifest.json
+    {"UNICEF": {"source": "/images/headshots/UNICEF.jpg", "source_hash": "...",
+                "width": 600, "height": 750,
+                "srcset": {"avif": "/images/... 64w, ...", "webp": "..."}}}
+
+Re-runs only process headshots whose source bytes changed; variants of
+changed or removed headshots are deleted (removed ones are found from the
+variant files on disk, also with --force).
+
+AVIF output needs a Pillow build with AVIF support (11.2 or newer) and is
+skipped otherwise.
+
+Usage:
+    uv run python/images/optimize_headshots.py [--force] [--widths 64 128 192]
+        [--workers N]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Allow importing the pipeline modules (assets, exports) when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from assets import HEADSHOTS_DIR, asset_index, web_path  # noqa: E402
+from exports import write_atomic  # noqa: E402
+
+OUTPUT_DIR = HEADSHOTS_DIR.with_name("headshots-optimized")
+MANIFEST_PATH = OUTPUT_DIR / "manifest.json"
+
+# The modal shows headshots 64 px wide: 1x, 2x and 3x
+DEFAULT_WIDTHS = [64, 128, 192]
+QUALITY = {"avif": 55, "webp": 80}
+# <entity>-<hash>-<width>.<ext>; entities may contain "-"
+_VARIANT_NAME = re.compile(r"^(.+)-[0-9a-f]{8}-\d+\.(?:avif|webp)$")
+
+
+def source_hash(path: Path) -> str:
+    """Return the first 8 hex digits of the SHA-256 of a file."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()[:8]
+
+
+def supported_formats() -> list[str]:
+    """Return the output formats this Pillow build can write, best first."""
+    from PIL import features
+
+    return [fmt for fmt in ("avif", "webp") if features.check(fmt)]
+
+
+def optimize_headshot(
+    entity: str,
+    source: Path,
+    digest: str,
+    widths: list[int],
+    formats: list[str],
+    output_dir: Path = OUTPUT_DIR,
+) -> dict:
+    """
+    Write the resized variants of one headshot and return its manifest entry.
+
+    Widths larger than the source are skipped (images are never upscaled);
+    a source narrower than every width gets one variant at its own width.
+    Runs in a worker process.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        # Respect the camera orientation, and drop alpha/palette for AVIF/WebP
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        source_width, source_height = image.size
+
+        variant_widths = [width for width in widths if width < source_width]
+        variant_widths = variant_widths or [source_width]
+
+        srcset = {}
+        for fmt in formats:
+            entries = []
+            for width in variant_widths:
+                height = round(source_height * width / source_width)
+                path = output_dir / f"{entity}-{digest}-{width}.{fmt}"
+                resized = image.resize((width, height), Image.Resampling.LANCZOS)
+                write_atomic(
+                    path,
+                    lambda temp_path: resized.save(
+                        temp_path, format=fmt.upper(), quality=QUALITY[fmt]
+                    ),
+                )
+                entries.append(f"{web_path(path)} {width}w")
+            srcset[fmt] = ", ".join(entries)
+
+    return {
+        "source": web_path(source),
+        "source_hash": digest,
+        "width": source_width,
+        "height": source_height,
+        "srcset": srcset,
+    }
+
+
+def remove_variants(entity: str, keep_hash: str | None, output_dir: Path = OUTPUT_DIR):
+    """Delete the variants of an entity, except those of `keep_hash`."""
+    for path in output_dir.glob(f"{entity}-*"):
+        # Names are <entity>-<hash>-<width>.<ext>; entities may contain "-"
+        stem = path.name.removeprefix(f"{entity}-")
+        digest, _, rest = stem.partition("-")
+        if rest and rest.split(".")[0].isdigit() and digest != keep_hash:
+            path.unlink()
+
+
+def variant_entities(output_dir: Path = OUTPUT_DIR) -> set[str]:
+    """
+    Entities that have variant files in `output_dir`.
+
+    Example:
+        >>> _VARIANT_NAME.match("UN-Habitat-3f2a9c1e-128.webp")[1]
+        'UN-Habitat'
+    """
+    return {
+        match[1] for match in map(_VARIANT_NAME.match, os.listdir(output_dir)) if match
+    }
+
+
+def main(force: bool = False, widths: list[int] = DEFAULT_WIDTHS, workers=None):
+    """Optimize new and changed headshots and update the srcset manifest."""
+    formats = supported_formats()
+
+    print("🖼️  Headshot Optimization Script")
+    print("=" * 50)
+    print(f"Formats: {', '.join(formats)}; widths: {', '.join(map(str, widths))}")
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    if MANIFEST_PATH.exists():
+        manifest = json.loads(MANIFEST_PATH.read_text())
+
+    sources = asset_index(HEADSHOTS_DIR)
+    settings = {"widths": widths, "formats": formats}
+
+    # Only headshots whose source bytes (or the output settings) changed
+    jobs = {}
+    for entity, source in sorted(sources.items()):
+        digest = source_hash(source)
+        entry = manifest.get(entity, {})
+        if (
+            not force
+            and entry.get("source_hash") == digest
+            and entry.get("settings") == settings
+            and entry.get("source") == web_path(source)
+        ):
+            continue
+        jobs[entity] = (source, digest)
+
+    # From the files on disk, so variants missing from the manifest go too
+    removed = sorted((set(manifest) | variant_entities()) - set(sources))
+    for entity in removed:
+        remove_variants(entity, keep_hash=None)
+        manifest.pop(entity, None)
+
+    print(
+        f"\n{len(sources)} headshots: {len(jobs)} to optimize, "
+        f"{len(sources) - len(jobs)} unchanged, {len(removed)} removed\n"
+    )
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = {
+            entity: executor.submit(
+                optimize_headshot, entity, source, digest, widths, formats
+            )
+            for entity, (source, digest) in jobs.items()
+        }
+        for entity, future in futures.items():
+            try:
+                manifest[entity] = {**future.result(), "settings": settings}
+            except Exception as e:  # unreadable or corrupt image
+                print(f"  ❌ {entity}: {e}")
+                failed += 1
+                continue
+            remove_variants(entity, keep_hash=manifest[entity]["source_hash"])
+            print(f"  ✅ {entity}")
+
+    write_atomic(
+        MANIFEST_PATH,
+        lambda path: path.write_text(
+            json.dumps(dict(sorted(manifest.items())), indent=2) + "\n"
+        ),
+    )
+
+    print("\n" + "=" * 50)
+    print("📊 Summary:")
+    print(f"   Optimized: {len(jobs) - failed}")
+    print(f"   Unchanged: {len(sources) - len(jobs)}")
+    print(f"   Failed:    {failed}")
+    print(f"\n📁 Variants saved to: {OUTPUT_DIR}")
+    print(f"📄 Manifest saved to: {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Optimize headshots for the web")
+    parser.add_argument(
+        "--force", action="store_true", help="Re-optimize all headshots"
+    )
+    parser.add_argument(
+        "--widths",
+        type=int,
+        nargs="+",
+        default=DEFAULT_WIDTHS,
+        help=f"Output widths in px (default: {' '.join(map(str, DEFAULT_WIDTHS))})",
+    )
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPUs)")
+    args = parser.parse_args()
+    main(force=args.force, widths=sorted(args.widths), workers=args.workers)
@@ -0,0 +1,102 @@
+"""
+Precomputed lookup indexes over the public entity rows.
+
+02-process_entities_data.py writes public/un-entities-lookups.json next to
+the data, so consumers can find entities by slug, principal organ, category,
+subcategory or CEB membership without scanning or grouping the rows first.
+Entities are referred to by their row number in un-entities.json (and
+un-entities-index.json, which has the same order).
+
+Groupings are stored as one flat array of row numbers plus, per key, the
+[start, end) offsets of its slice:
+
+    {"offsets": {"General Assembly": [0, 42], ...}, "rows": [3, 8, ...]}
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from utils import create_entity_slug
+
+LOOKUPS_PATH = Path("public") / "un-entities-lookups.json"
+
+# Columns grouped into row lists (list columns group an entity under each item)
+GROUPED_COLUMNS = ["un_principal_organ", "category", "subcategory"]
+
+
+def group_rows(values: pd.Series) -> dict:
+    """
+    Group row numbers by value into a flat row array with per-key offsets.
+
+    Args:
+        values: One value (or list of values) per row; missing values are skipped
+
+    Returns:
+        Dict with "offsets" (key -> [start, end] into "rows") and "rows"
+
+    Example:
+        >>> group_rows(pd.Series([["GA"], ["GA", "SC"], None]))
+        {'offsets': {'GA': [0, 2], 'SC': [2, 3]}, 'rows': [0, 1, 1]}
+    """
+    exploded = pd.Series(
+        values.to_numpy(), index=np.arange(len(values)), dtype=object
+    ).explode()
+    exploded = exploded[exploded.notna()].astype(str)
+    pairs = pd.DataFrame({"key": exploded.to_numpy(), "row": exploded.index})
+    pairs = pairs.sort_values(["key", "row"], kind="stable")
+
+    keys, starts = np.unique(pairs["key"].to_numpy(), return_index=True)
+    ends = np.append(starts[1:], len(pairs))
+    return {
+        "offsets": {
+            str(key): [int(start), int(end)]
+            for key, start, end in zip(keys, starts, ends)
+        },
+        "rows": pairs["row"].astype(int).tolist(),
+    }
+
+
+def build_lookups(df: pd.DataFrame) -> dict:
+    """
+    Build the lookup indexes of the public entity rows, in their export order.
+
+    Returns:
+        Dict with the row count, "slug" (slug -> row), one grouping per column
+        in GROUPED_COLUMNS and "ceb_members" (rows of CEB member entities)
+    """
+    lookups = {
+        "row_count": len(df),
+        "slug": {
+            create_entity_slug(entity): row for row, entity in enumerate(df["entity"])
+        },
+    }
+    for column in GROUPED_COLUMNS:
+        lookups[column] = group_rows(df[column])
+    lookups["ceb_members"] = np.flatnonzero(df["is_ceb_member"].eq(True)).tolist()
+    return lookups
+
+
+def write_lookups(df: pd.DataFrame, path: Path) -> None:
+    """Write the lookup indexes of `df` as minified JSON."""
+    path.write_text(json.dumps(build_lookups(df), separators=(",", ":")))
+
+
+def load_lookups(path: Path = LOOKUPS_PATH) -> dict:
+    """Load the lookup indexes written by write_lookups()."""
+    return json.loads(path.read_text())
+
+
+def lookup_rows(lookups: dict, column: str, key: str) -> list[int]:
+    """
+    Return the rows grouped under `key` in a column's lookup.
+
+    Example:
+        >>> lookups = {"category": {"offsets": {"Funds": [0, 2]}, "rows": [4, 9]}}
+        >>> lookup_rows(lookups, "category", "Funds")
+        [4, 9]
+    """
+    grouping = lookups[column]
+    start, end = grouping["offsets"].get(key, (0, 0))
+    return grouping["rows"][start:end]
@@ -0,0 +1,94 @@
+"""
+Content hashes of the processed entities.
+
+02-process_entities_data.py hashes every entity (one hash per record_id) and
+the dataset as a whole, and writes them to
+data/output/un-entities-manifest.json. The file holds Airtable record IDs,
+which the public exports leave out, so it is kept outside public/. When the dataset hash matches the previous manifest nothing changed and the
+exports are skipped. Otherwise the manifest lists the entities that were
+added, changed or removed, so later steps can work only on those.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+
+MANIFEST_PATH = Path("data") / "output" / "un-entities-manifest.json"
+# Where earlier versions published the manifest; removed on the next write
+LEGACY_MANIFEST_PATH = Path("public") / "un-entities-manifest.json"
+
+
+def entity_hashes(df: pd.DataFrame, id_column: str = "record_id") -> dict[str, str]:
+    """
+    Hash every row of a DataFrame, keyed by its ID column.
+
+    Rows are serialized to JSON in one pass (one line per row) and each line
+    is hashed with SHA-256, so any change to any column changes the hash.
+
+    Args:
+        df: Entities, with the columns that make up the exports
+        id_column: Column holding the stable Airtable record ID
+
+    Returns:
+        Dict mapping record ID to hex digest, in the order of `df`
+    """
+    lines = df.to_json(orient="records", lines=True).splitlines()
+    return {
+        record_id: hashlib.sha256(line.encode()).hexdigest()
+        for record_id, line in zip(df[id_column], lines)
+    }
+
+
+def dataset_hash(hashes: dict[str, str], columns: list[str]) -> str:
+    """Hash the entity hashes and the exported columns into one dataset hash."""
+    digest = hashlib.sha256(json.dumps(columns).encode())
+    for record_id in sorted(hashes):
+        digest.update(f"{record_id}:{hashes[record_id]}\n".encode())
+    return digest.hexdigest()
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> dict:
+    """Load the previous manifest, or an empty one if there is none yet."""
+    if not path.exists() and path == MANIFEST_PATH:
+        path = LEGACY_MANIFEST_PATH
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def build_manifest(df: pd.DataFrame, previous: dict) -> dict:
+    """
+    Build the manifest of a processed DataFrame and diff it against the previous one.
+
+    Args:
+        df: Processed entities (the columns written to data/output/entities.csv)
+        previous: Manifest from the last run, as returned by load_manifest()
+
+    Returns:
+        Dict with the dataset hash, the previous dataset hash, the record IDs
+        that were added, changed or removed since then, and one hash per entity
+    """
+    hashes = entity_hashes(df)
+    old_hashes = previous.get("entities", {})
+    return {
+        "dataset": dataset_hash(hashes, list(df.columns)),
+        "previous_dataset": previous.get("dataset"),
+        "added": sorted(hashes.keys() - old_hashes.keys()),
+        "changed": sorted(
+            record_id
+            for record_id in hashes.keys() & old_hashes.keys()
+            if hashes[record_id] != old_hashes[record_id]
+        ),
+        "removed": sorted(old_hashes.keys() - hashes.keys()),
+        "entities": dict(sorted(hashes.items())),
+    }
+
+
+def write_manifest(manifest: dict, path: Path = MANIFEST_PATH) -> None:
+    """Write the manifest as indented JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2) + "\n")
+    if path == MANIFEST_PATH:
+        LEGACY_MANIFEST_PATH.unlink(missing_ok=True)
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import pandas as pd
+
+# Airtable table holding the principal organs and their contacts
+ORGANS_TABLE_ID = "tbl4mlFmIH4H7QVoX"
+
+OUTPUT_PATH = Path("data/output/organ_contacts.json")
+
+
+def export_organ_contacts(df: pd.DataFrame, output_path: Path = OUTPUT_PATH) -> int:
+    """
+    Filter the raw organs table to displayed organs and export it as JSON.
+
+    Args:
+        df: Organs table as returned by api.airtable
+        output_path: Destination JSON file
+
+    Returns:
+        Number of organs exported
+    """
+    df = df.dropna(how="all")
+    df = df.sort_values("entity", ascending=True)
+
+    df = df[df["is_displayed"] == "True"]
+
+    df = df[
+        [
+            "entity",
+            "entity_long",
+            "governing_bodies",
+            "intergov_bodies_link",
+            "secretariats",
+            "order",
+            "system_grouping",
+        ]
+    ]
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_json(output_path, orient="records", indent=2)
+
+    return len(df)
@@ -0,0 +1,6 @@
+"""
+Command line entry point for the data pipeline (`python -m pipeline`).
+
+Each stage is still a standalone script; the CLI only loads a script (and its
+heavy dependencies such as pandas or playwright) when its subcommand runs.
+"""
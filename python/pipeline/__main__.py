@@ -0,0 +1,127 @@
+"""
+Run the data pipeline stages from one command.
+
+Usage (from the repository root, with PYTHONPATH=./python as in .env.example):
+    uv run python -m pipeline <command> [options]
+
+Commands:
+    fetch       Fetch entities and organs from Airtable (01-fetch_from_airtable.py)
+    process     Process entities into the public exports (02-process_entities_data.py)
+    headshots   Download headshots (03-download_headshots.py) [--force] [--workers N]
+    images      Optimize headshots into WebP/AVIF variants
+                (images/optimize_headshots.py) [--force]
+    logos       Download and optimize entity logos
+                (images/fetch_logos.py) [--force] [--sprite] [--workers N]
+    verify      Verify entity links (verification/verify_links.py) [--screenshots]
+    meta        Extract meta descriptions (data_collection/get_meta_descriptions.py)
+    validate    Validate the entities data (validate_data.py) [--input PATH]
+    run         Run stages in dependency order, skipping unchanged ones and
+                running independent stages in parallel (pipeline/runner.py)
+                [STAGE ...] [--plan] [--force] [--jobs N]
+
+Options after the command are passed on to its script, e.g.
+`python -m pipeline verify --help`. Pass --timings before the command to
+report CLI startup and command run time.
+"""
+
+import time
+
+STARTED_AT = time.perf_counter()
+
+import argparse  # noqa: E402
+import runpy  # noqa: E402
+import sys  # noqa: E402
+from pathlib import Path  # noqa: E402
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+
+# Command name -> (script, help). Scripts are only loaded when their command runs.
+COMMANDS = {
+    "fetch": (
+        "01-fetch_from_airtable.py",
+        "Fetch entities and organs from Airtable",
+    ),
+    "process": (
+        "02-process_entities_data.py",
+        "Process entities into the public JSON/CSV/XLSX exports",
+    ),
+    "headshots": (
+        "03-download_headshots.py",
+        "Download headshots from Airtable attachments",
+    ),
+    "images": (
+        "images/optimize_headshots.py",
+        "Optimize headshots into responsive WebP/AVIF variants",
+    ),
+    "logos": (
+        "images/fetch_logos.py",
+        "Download and optimize entity logos from entity_logo_url",
+    ),
+    "verify": (
+        "verification/verify_links.py",
+        "Verify entity links",
+    ),
+    "meta": (
+        "data_collection/get_meta_descriptions.py",
+        "Extract meta descriptions from entity pages",
+    ),
+    "validate": (
+        "validate_data.py",
+        "Validate the entities data and write a report",
+    ),
+}
+
+
+def run_script(script: str, args: list[str]) -> None:
+    """Run a pipeline script as __main__ with `args` as its command line."""
+    script_path = PYTHON_DIR / script
+    if str(PYTHON_DIR) not in sys.path:
+        sys.path.insert(0, str(PYTHON_DIR))
+    sys.argv = [str(script_path), *args]
+    runpy.run_path(str(script_path), run_name="__main__")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m pipeline",
+        description="UN System Chart Navigator data pipeline",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Report CLI startup and command run time",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (script, help_text) in COMMANDS.items():
+        # Help and options of each command are handled by its script
+        subparsers.add_parser(
+            name, help=help_text, description=f"{help_text} ({script})", add_help=False
+        )
+    subparsers.add_parser(
+        "run",
+        help="Run stages in dependency order, skipping unchanged ones",
+        add_help=False,
+    )
+
+    args, script_args = parser.parse_known_args(argv)
+
+    if args.timings:
+        startup_ms = (time.perf_counter() - STARTED_AT) * 1000
+        print(f"⏱️  CLI startup: {startup_ms:.1f} ms", file=sys.stderr)
+
+    command_started_at = time.perf_counter()
+    try:
+        if args.command == "run":
+            from pipeline.runner import main as run_stages
+
+            run_stages(script_args)
+        else:
+            run_script(COMMANDS[args.command][0], script_args)
+    finally:
+        if args.timings:
+            seconds = time.perf_counter() - command_started_at
+            print(f"⏱️  {args.command}: {seconds:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
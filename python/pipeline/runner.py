@@ -0,0 +1,407 @@
+"""
+Dependency-aware runner for the pipeline stages (`python -m pipeline run`).
+
+Each stage declares the files it reads and writes. A stage runs after any
+selected stage that writes one of its inputs, independent stages run in
+parallel, and a stage is skipped when its inputs, its script and the
+pipeline modules the script imports hash the same as on its last successful
+run and its outputs still exist. Stages without file inputs (the Airtable
+fetch) always run.
+
+Inputs are hashed by content, so a fresh checkout hashes like the original.
+The Parquet snapshot is hashed without the URLs of its attachments, which
+Airtable signs and lets expire, so a re-fetch of unchanged data is a hit.
+
+Usage:
+    python -m pipeline run [STAGE ...] [--plan] [--force] [--jobs N]
+
+Without stages, runs fetch and process (like update_data.sh); `all` runs
+every stage. --plan prints the execution order without running anything.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+STATE_PATH = Path("data") / "pipeline_state.json"
+
+# Attachment fields that change on every fetch (expiring signed URLs)
+VOLATILE_ATTACHMENT_FIELDS = {"url", "thumbnails"}
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A pipeline script with the files it reads and writes."""
+
+    name: str
+    script: str
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...]
+
+
+# The organs table is fetched by 01 together with the entities
+STAGES = [
+    Stage(
+        "fetch",
+        "01-fetch_from_airtable.py",
+        inputs=(),
+        outputs=(
+            "data/input/input_entities.parquet",
+            "data/input/input_entities.csv",
+            "data/output/entity_reference.csv",
+            "data/output/organ_contacts.json",
+        ),
+    ),
+    Stage(
+        "headshots",
+        "03-download_headshots.py",
+        # Headshot URLs come from the attachment column of the fetched snapshot
+        inputs=("data/input/input_entities.parquet",),
+        outputs=("public/images/headshots",),
+    ),
+    Stage(
+        "images",
+        "images/optimize_headshots.py",
+        inputs=("public/images/headshots",),
+        outputs=("public/images/headshots-optimized",),
+    ),
+    Stage(
+        "logos",
+        "images/fetch_logos.py",
+        inputs=("data/input/input_entities.parquet",),
+        outputs=("public/images/logos",),
+    ),
+    Stage(
+        "meta",
+        "data_collection/get_meta_descriptions.py",
+        inputs=("data/input/input_entities.csv",),
+        outputs=("data/input/input_entities_with_meta.csv",),
+    ),
+    Stage(
+        "process",
+        "02-process_entities_data.py",
+        inputs=("data/input/input_entities.parquet", "public/images/headshots"),
+        outputs=(
+            "data/output/entities.csv",
+            "data/output/mandate_entities.csv",
+            "data/output/un-entities-manifest.json",
+            "public/un-entities.json",
+            "public/un-entities.csv",
+            "public/un-entities.xlsx",
+            "public/un-entities-meta.json",
+            "public/un-entities-index.json",
+            "public/un-entities-lookups.json",
+            "public/entities",
+        ),
+    ),
+    Stage(
+        "verify",
+        "verification/verify_links.py",
+        inputs=("public/un-entities.json",),
+        outputs=(
+            "data/output/entity_link_verification_results.csv",
+            "public/entity_link_verification_results.json",
+        ),
+    ),
+]
+DEFAULT_STAGES = ["fetch", "process"]
+
+
+def hash_snapshot(path: Path) -> str:
+    """
+    Hash the content of a Parquet snapshot, without volatile attachment URLs.
+
+    Attachment columns (lists of structs with a "url") keep their id,
+    filename, size and type, so a replaced attachment still changes the
+    hash but a re-signed URL does not.
+    """
+    # Imported here so that --plan and runs without a snapshot stay fast
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path)
+    for index, field in enumerate(table.schema):
+        if pa.types.is_list(field.type) and pa.types.is_struct(field.type.value_type):
+            struct = field.type.value_type
+            if struct.get_field_index("url") < 0:
+                continue
+            stable = pa.list_(
+                pa.struct(
+                    [
+                        child
+                        for child in struct
+                        if child.name not in VOLATILE_ATTACHMENT_FIELDS
+                    ]
+                )
+            )
+            table = table.set_column(
+                index, field.with_type(stable), table.column(index).cast(stable)
+            )
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return hashlib.sha256(sink.getvalue()).hexdigest()
+
+
+def hash_path(path: Path) -> str:
+    """
+    Hash a file's content, or the names and contents of a directory's files.
+
+    Parquet snapshots are hashed with hash_snapshot(). Missing paths hash
+    to "missing".
+    """
+    if path.is_dir():
+        digest = hashlib.sha256()
+        for child in sorted(path.rglob("*")):
+            if child.is_file():
+                digest.update(
+                    f"{child.relative_to(path)}:{hash_path(child)}\n".encode()
+                )
+        return digest.hexdigest()
+    if path.is_file():
+        if path.suffix == ".parquet":
+            return hash_snapshot(path)
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    return "missing"
+
+
+def local_modules(script: Path) -> list[Path]:
+    """
+    Pipeline modules a script imports, directly or through other modules.
+
+    Imports are read from the source (nothing is executed) and resolved
+    against the python/ folder; third-party and standard library imports
+    are ignored.
+    """
+    found, queue = set(), [script]
+    while queue:
+        tree = ast.parse(queue.pop().read_text())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                # "from verification import screenshots" imports a module too
+                names = [node.module] + [
+                    f"{node.module}.{alias.name}" for alias in node.names
+                ]
+            else:
+                continue
+            for name in names:
+                base = PYTHON_DIR.joinpath(*name.split("."))
+                for path in (base.with_suffix(".py"), base / "__init__.py"):
+                    if path.is_file() and path not in found and path != script:
+                        found.add(path)
+                        queue.append(path)
+    return sorted(found)
+
+
+def stage_fingerprint(stage: Stage) -> dict[str, str]:
+    """Hash a stage's script, the modules it imports and its inputs."""
+    script = PYTHON_DIR / stage.script
+    fingerprint = {stage.script: hash_path(script)}
+    for module in local_modules(script):
+        fingerprint[str(module.relative_to(PYTHON_DIR))] = hash_path(module)
+    for path in stage.inputs:
+        fingerprint[path] = hash_path(Path(path))
+    return fingerprint
+
+
+def is_up_to_date(stage: Stage, state: dict) -> bool:
+    """Whether a stage can be skipped: same inputs as its last run, outputs present."""
+    if not stage.inputs:
+        return False
+    return state.get(stage.name) == stage_fingerprint(stage) and all(
+        Path(output).exists() for output in stage.outputs
+    )
+
+
+def dependencies(stages: list[Stage]) -> dict[str, set[str]]:
+    """Map each stage to the selected stages that write one of its inputs."""
+    return {
+        stage.name: {
+            other.name
+            for other in stages
+            if other is not stage and set(other.outputs) & set(stage.inputs)
+        }
+        for stage in stages
+    }
+
+
+def plan(stages: list[Stage], state: dict, force: bool = False) -> list[list[str]]:
+    """
+    Print the stages in dependency order, grouped into waves that run in parallel.
+
+    Returns:
+        List of waves, each a list of stage names
+    """
+    depends_on = dependencies(stages)
+    waves, done = [], set()
+    while len(done) < len(stages):
+        wave = [
+            stage.name
+            for stage in stages
+            if stage.name not in done and depends_on[stage.name] <= done
+        ]
+        waves.append(wave)
+        done.update(wave)
+
+    by_name = {stage.name: stage for stage in stages}
+    for number, wave in enumerate(waves, start=1):
+        print(f"Wave {number}:")
+        for name in wave:
+            stage = by_name[name]
+            if force:
+                status = "run (--force)"
+            elif not stage.inputs:
+                status = "run (no file inputs)"
+            elif depends_on[name]:
+                upstream = ", ".join(sorted(depends_on[name]))
+                status = f"after {upstream} (skipped if its inputs are unchanged)"
+            elif is_up_to_date(stage, state):
+                status = "skip (inputs unchanged)"
+            else:
+                status = "run (inputs changed)"
+            print(f"  {name:<10} {stage.script:<42} {status}")
+    return waves
+
+
+def run_stage(stage: Stage) -> float:
+    """Run a stage's script in a subprocess and return its wall time."""
+    # Scripts in subfolders import the top-level modules (schema, utils, ...)
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(
+            [str(PYTHON_DIR), os.environ.get("PYTHONPATH", "")]
+        ),
+    }
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(PYTHON_DIR / stage.script)], check=True, env=env
+    )
+    return time.perf_counter() - start
+
+
+def run(stages: list[Stage], state: dict, force: bool = False, jobs: int = 4):
+    """
+    Run stages as soon as the stages writing their inputs have finished.
+
+    The input hashes of each finished stage are saved to `state` right away;
+    stages depending on a failed stage are not started.
+
+    Returns:
+        Dict mapping stage name to (status, seconds)
+    """
+    depends_on = dependencies(stages)
+    pending = {stage.name: stage for stage in stages}
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        running = {}
+        while pending or running:
+            progress = False
+            for name, stage in list(pending.items()):
+                upstream = [
+                    results.get(dep, ("pending",))[0] for dep in depends_on[name]
+                ]
+                if "pending" in upstream:
+                    continue
+                del pending[name]
+                progress = True
+                if "failed" in upstream or "blocked" in upstream:
+                    results[name] = ("blocked", 0.0)
+                    print(f"⏭️  {name}: blocked by a failed stage")
+                elif not force and is_up_to_date(stage, state):
+                    results[name] = ("skipped", 0.0)
+                    print(f"⏭️  {name}: inputs unchanged, skipped")
+                else:
+                    print(f"▶️  {name}: {stage.script}")
+                    # Running stages are "pending" for their dependents
+                    results[name] = ("pending", 0.0)
+                    running[executor.submit(run_stage, stage)] = stage
+
+            if not running:
+                if pending and not progress:
+                    raise RuntimeError(f"Circular stage dependencies: {list(pending)}")
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    seconds = future.result()
+                except subprocess.CalledProcessError:
+                    results[stage.name] = ("failed", 0.0)
+                    print(f"❌ {stage.name} failed")
+                    continue
+                results[stage.name] = ("ran", seconds)
+                state[stage.name] = stage_fingerprint(stage)
+                save_state(state)
+                print(f"✓ {stage.name} finished in {seconds:.1f} s")
+    return results
+
+
+def load_state(path: Path = STATE_PATH) -> dict:
+    """Load the input hashes of each stage's last successful run."""
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def save_state(state: dict, path: Path = STATE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, indent=2) + "\n")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m pipeline run",
+        description="Run pipeline stages in dependency order, skipping unchanged ones",
+    )
+    parser.add_argument(
+        "stages",
+        nargs="*",
+        metavar="STAGE",
+        help=f"Stages to run: {', '.join(stage.name for stage in STAGES)} or all "
+        f"(default: {' '.join(DEFAULT_STAGES)})",
+    )
+    parser.add_argument(
+        "--plan", action="store_true", help="Print the execution plan and exit"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Run stages even if inputs are unchanged"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=4, help="Stages to run in parallel (default: 4)"
+    )
+    args = parser.parse_args(argv)
+
+    names = args.stages or DEFAULT_STAGES
+    if "all" in names:
+        names = [stage.name for stage in STAGES]
+    unknown = set(names) - {stage.name for stage in STAGES}
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+    stages = [stage for stage in STAGES if stage.name in names]
+
+    state = load_state()
+    if args.plan:
+        plan(stages, state, force=args.force)
+        return
+
+    results = run(stages, state, force=args.force, jobs=args.jobs)
+
+    print(f"\n{'stage':<10} {'status':<8} {'seconds':>8}")
+    for stage in stages:
+        status, seconds = results[stage.name]
+        print(f"{stage.name:<10} {status:<8} {seconds:>8.1f}")
+
+    if any(status in ("failed", "blocked") for status, _ in results.values()):
+        sys.exit(1)
@@ -0,0 +1,220 @@
+"""
+Column schema of the UN entities table.
+
+Every column the pipeline reads from Airtable or derives later is declared
+once here, with its type and the outputs it is written to. The fetch step
+requests exactly these fields from the Airtable API, and each script selects
+its output columns with columns_for(). Typed fetches (Airtable's JSON cell
+format) are mapped onto the Arrow types from arrow_schema().
+"""
+
+from dataclasses import dataclass
+
+import pyarrow as pa
+
+# Column types (how Airtable stores the field)
+TEXT = "text"
+URL = "url"
+LIST = "list"
+BOOL = "bool"
+ATTACHMENT = "attachment"
+
+# Airtable attachment objects, as returned by the JSON cell format
+_THUMBNAIL = pa.struct(
+    [("url", pa.string()), ("width", pa.int64()), ("height", pa.int64())]
+)
+_ATTACHMENT = pa.struct(
+    [
+        ("id", pa.string()),
+        ("url", pa.string()),
+        ("filename", pa.string()),
+        ("size", pa.int64()),
+        ("type", pa.string()),
+        ("width", pa.int64()),
+        ("height", pa.int64()),
+        (
+            "thumbnails",
+            pa.struct(
+                [("small", _THUMBNAIL), ("large", _THUMBNAIL), ("full", _THUMBNAIL)]
+            ),
+        ),
+    ]
+)
+
+ARROW_TYPES = {
+    TEXT: pa.string(),
+    URL: pa.string(),
+    LIST: pa.list_(pa.string()),
+    BOOL: pa.bool_(),
+    ATTACHMENT: pa.list_(_ATTACHMENT),
+}
+
+# Outputs
+INPUT = "input"  # data/input/input_entities.parquet (raw snapshot, incl. attachments)
+INPUT_CSV = "input_csv"  # data/input/input_entities.csv
+PROCESSED = "processed"  # data/output/entities.csv
+PUBLIC = "public"  # public/un-entities.{json,csv,xlsx}
+INDEX = "index"  # public/un-entities-index.json (fields used for listing and filtering)
+MANDATE = "mandate"  # data/output/mandate_entities.csv
+
+# Values entered in link fields when there is no link; not URLs, but not errors
+PLACEHOLDER_URLS = frozenset(
+    {
+        "Not found",
+        "Not found.",
+        "Not applicable",
+        "No link",
+        "No link found",
+        "No annual report",
+        "null",
+        "None",
+    }
+)
+
+
+@dataclass(frozen=True)
+class Column:
+    """A column of the entities table and the outputs it is written to."""
+
+    name: str
+    type: str
+    outputs: frozenset[str]
+    # False for columns derived by the pipeline rather than fetched from Airtable
+    airtable: bool = True
+
+
+_RAW = frozenset({INPUT, INPUT_CSV, PROCESSED})
+_EXPORTED = _RAW | {PUBLIC}
+_LISTED = _EXPORTED | {INDEX}
+
+COLUMNS = [
+    # Core entity identifiers
+    Column("entity", TEXT, _LISTED | {MANDATE}),
+    Column("entity_long", TEXT, _LISTED | {MANDATE}),
+    Column("entity_combined", TEXT, _EXPORTED),
+    Column("entity_aliases", LIST, _LISTED),
+    Column("entity_description", TEXT, _EXPORTED),
+    Column("entity_footnotes", TEXT, _EXPORTED),
+    # Links and references
+    Column("entity_link", URL, _EXPORTED),
+    Column("entity_wikipedia_page", URL, _EXPORTED),
+    Column("entity_news_page", URL, _EXPORTED),
+    Column("entity_branding_page", URL, _EXPORTED),
+    Column("entity_data_page", URL, _EXPORTED),
+    Column("entity_logo_page", URL, _EXPORTED),
+    Column("entity_logo_url", URL, _EXPORTED),
+    Column("entity_logo_available", BOOL, _EXPORTED),
+    Column("entity_careers_page", URL, _EXPORTED),
+    Column("entity_headquarters", LIST, _EXPORTED),
+    # UN structure and classification
+    Column("un_principal_organ", LIST, _LISTED),
+    Column("category", TEXT, _LISTED),
+    Column("subcategory", TEXT, _LISTED),
+    Column("is_ceb_member", BOOL, _LISTED),
+    # Mandate and registry
+    Column("foundational_mandate", TEXT, _EXPORTED),
+    Column("entity_mandate_registry", URL, _EXPORTED),
+    Column("entity_custom_mandate_registry", URL, _EXPORTED),
+    # Leadership
+    Column("head_of_entity_title_general", TEXT, _RAW),
+    Column("head_of_entity_title_specific", TEXT, _RAW),
+    Column("head_of_entity_name", TEXT, _RAW),
+    Column("head_of_entity_level", TEXT, _RAW),
+    Column("head_of_entity_bio_link", URL, _RAW),
+    # Large attachment field, only kept in the Parquet snapshot for 03-download_headshots.py
+    Column("head_of_entity_headshot", ATTACHMENT, frozenset({INPUT})),
+    Column("global_leadership_team_url", URL, _RAW),
+    # Documents and resources
+    Column("organizational_chart_link", URL, _EXPORTED),
+    Column("budget_financial_reporting_link", URL, _EXPORTED),
+    Column("results_framework_link", URL, _EXPORTED),
+    Column("strategic_plan_link", URL, _EXPORTED),
+    Column("annual_reports_link", URL, _EXPORTED),
+    Column("transparency_portal_link", URL, _EXPORTED),
+    # Socials
+    Column("socials_linkedin", URL, _EXPORTED),
+    Column("socials_twitter", URL, _EXPORTED),
+    Column("socials_instagram", URL, _EXPORTED),
+    # Misc
+    Column("record_id", TEXT, _RAW),
+    # Always true in the public outputs (hidden entities are filtered out)
+    Column("on_display", BOOL, _RAW),
+    Column("is_on_pdf", BOOL, _LISTED),
+    Column("review_needed", BOOL, _LISTED),
+    # Only used to filter out form submissions pending review
+    Column("added_via_form", BOOL, frozenset()),
+    # Derived by 02-process_entities_data.py from the local headshot files
+    Column("head_of_entity_headshot_link", URL, frozenset({PROCESSED}), airtable=False),
+]
+
+# Fields requested from the Airtable API; anything else never comes over the wire
+AIRTABLE_FIELDS = [column.name for column in COLUMNS if column.airtable]
+
+
+def columns_for(output: str) -> list[str]:
+    """
+    Return the names of the columns written to an output, in declaration order.
+
+    Example:
+        >>> columns_for(MANDATE)
+        ['entity', 'entity_long']
+    """
+    return [column.name for column in COLUMNS if output in column.outputs]
+
+
+def arrow_schema(output: str) -> pa.Schema:
+    """Return the Arrow schema of an output, with each column's typed Arrow type."""
+    return pa.schema(
+        [
+            (column.name, ARROW_TYPES[column.type])
+            for column in COLUMNS
+            if output in column.outputs
+        ]
+    )
+
+
+def columns_of_type(column_type: str) -> list[str]:
+    """Return the names of all columns of a type, e.g. columns_of_type(LIST)."""
+    return [column.name for column in COLUMNS if column.type == column_type]
+
+
+def coerce_value(value, column_type: str):
+    """
+    Coerce a value from Airtable's JSON cell format to its column type.
+
+    Most fields already arrive typed; this covers formula and lookup fields,
+    which return text flags like "True"/"TRUE" or single values instead of lists.
+
+    Example:
+        >>> coerce_value("TRUE", BOOL)
+        True
+        >>> coerce_value("General Assembly", LIST)
+        ['General Assembly']
+    """
+    if value is None:
+        return None
+    if column_type == BOOL:
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().upper()
+        if text in ("TRUE", "CHECKED", "1"):
+            return True
+        if text in ("FALSE", "0"):
+            return False
+        return None
+    if column_type == LIST:
+        if isinstance(value, list):
+            return [str(item) for item in value] or None
+        return [str(value)]
+    if column_type in (TEXT, URL) and isinstance(value, list):
+        return ", ".join(str(item) for item in value) or None
+    return value
+
+
+def coerce_fields(fields: dict, output: str) -> dict:
+    """Coerce the JSON-format fields of a record to the types of an output's columns."""
+    return {
+        column.name: coerce_value(fields.get(column.name), column.type)
+        for column in COLUMNS
+        if output in column.outputs
+    }
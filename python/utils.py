@@ -1,9 +1,12 @@
 import ast
+import re
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 
-def parse_airtable_list_literal(value):
+def parse_airtable_list_literal(value, split_commas: bool = True):
     """
     Parse Airtable-exported array literals into native Python lists.
 
@@ -11,6 +14,8 @@ def parse_airtable_list_literal(value):
     "['General Assembly']". Some Airtable API responses may also flatten
     multi-select values into plain comma-delimited strings like
     "General Assembly, Security Council". Missing values are normalized to None.
+    Pass split_commas=False for fields whose items contain commas themselves
+    (e.g. "Vienna, Austria").
     """
     if pd.isna(value):
         return None
@@ -18,8 +23,67 @@ def parse_airtable_list_literal(value):
     if isinstance(value, str) and value.startswith("[") and value.endswith("]"):
         return ast.literal_eval(value)
 
-    if isinstance(value, str) and "," in value:
+    if split_commas and isinstance(value, str) and "," in value:
         items = [item.strip() for item in value.split(",") if item.strip()]
         return items or None
 
     return value
+
+
+def create_entity_slug(entity: str) -> str:
+    """
+    Create the URL slug of an entity, as createEntitySlug() in src/lib/utils.ts does.
+
+    Example:
+        >>> create_entity_slug("UN-Women")
+        'un-women'
+        >>> create_entity_slug("World Bank Group")
+        'world-bank-group'
+    """
+    slug = re.sub(r"[^a-z0-9\s-]", "-", entity.lower())
+    slug = re.sub(r"[\s-]+", "-", slug)
+    return slug.strip("-")
+
+
+def parse_airtable_list_column(
+    values: pd.Series, split_commas: bool = True, arrow: bool = False
+) -> pd.Series | pa.ListArray:
+    """
+    Parse a whole column of Airtable list literals, parsing each distinct value once.
+
+    List fields only hold a few dozen distinct values (e.g. un_principal_organ),
+    so the column is factorized, the distinct values are parsed with
+    parse_airtable_list_literal() and the results are mapped back by position.
+    Single values are wrapped in a list, so every non-missing cell is a list.
+
+    Args:
+        values: Column of list literals or comma-delimited strings
+        split_commas: See parse_airtable_list_literal()
+        arrow: Return an Arrow list<string> array instead of a Series
+
+    Returns:
+        Series of lists (None for missing values) with the index of `values`,
+        or a pyarrow ListArray of the same length
+
+    Example:
+        >>> parse_airtable_list_column(pd.Series(["['GA', 'SC']", "GA", None])).tolist()
+        [['GA', 'SC'], ['GA'], None]
+    """
+    codes, uniques = pd.factorize(values)
+    parsed = []
+    for value in uniques:
+        items = parse_airtable_list_literal(value, split_commas=split_commas)
+        if items is not None and not isinstance(items, list):
+            items = [items]
+        parsed.append([str(item) for item in items] if items else None)
+
+    # Missing values are coded -1: masked as nulls for Arrow, and pointed at
+    # the trailing None slot for pandas
+    if arrow:
+        distinct = pa.array(parsed, type=pa.list_(pa.string()))
+        return distinct.take(pa.array(codes, mask=codes < 0))
+
+    # Each distinct list object is shared by all rows holding that value
+    lists = np.empty(len(parsed) + 1, dtype=object)
+    lists[: len(parsed)] = parsed
+    return pd.Series(lists[codes], index=values.index, name=values.name, dtype=object)
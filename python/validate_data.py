@@ -1,25 +1,79 @@
+"""
+Validate the fetched entities data and summarize it.
+
+Runs the rules in validation.py over the Parquet snapshot written by
+01-fetch_from_airtable.py (or another table given with --input: .parquet,
+.csv or .json), writes the report to data/output/validation_report.json and
+prints the failed rules and the entity counts per principal organ. Exits
+with status 1 if a rule with severity "error" fails.
+
+Usage:
+    uv run python/validate_data.py [--input PATH] [--report PATH]
+"""
+
+import argparse
+import sys
 from pathlib import Path
 
-import pandas as pd
+INPUT_PATH = Path("data") / "input" / "input_entities.parquet"
+# Same as validation.REPORT_PATH; validation.py loads pandas, so it is only
+# imported once the arguments are parsed
+REPORT_PATH = Path("data") / "output" / "validation_report.json"
+
+
+def load_table(path: Path) -> "pd.DataFrame":
+    """Load the columns used by the validation rules from a table file."""
+    import pandas as pd
+    import pyarrow.parquet as pq
+    from validation import rule_columns
+
+    columns = rule_columns()
+    if path.suffix == ".parquet":
+        available = set(pq.read_schema(path).names)
+        table = pq.read_table(path, columns=[c for c in columns if c in available])
+        return table.to_pandas()
+    if path.suffix == ".csv":
+        return pd.read_csv(path, usecols=lambda column: column in columns)
+    df = pd.read_json(path, dtype=False)
+    return df[[column for column in columns if column in df]]
 
-from utils import parse_airtable_list_literal
 
-data_folder = Path("data")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate the entities data")
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=INPUT_PATH,
+        help=f"Table to validate (default: {INPUT_PATH})",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=REPORT_PATH,
+        help=f"Where to write the JSON report (default: {REPORT_PATH})",
+    )
+    args = parser.parse_args()
 
-# Load data from csv file (fetched from Airtable)
-csv_path = data_folder / "input" / "input_entities.csv"
-df = pd.read_csv(csv_path)
+    # Imported after parsing, so --help does not wait for pandas
+    from validation import prepare_frame, print_report, validate, write_report
 
-df["un_principal_organ"] = df["un_principal_organ"].apply(parse_airtable_list_literal)
+    df = prepare_frame(load_table(args.input))
+    report = validate(df)
+    write_report(report, args.report)
+    print_report(report)
+    print(f"✓ Validation report saved to: {args.report}")
 
-# Include empty values in the counts
-df["un_principal_organ"] = df["un_principal_organ"].replace("nan", None)
+    # Include empty values in the counts
+    if "un_principal_organ" in df:
+        summary_table = (
+            df.explode("un_principal_organ")
+            .groupby("un_principal_organ", dropna=False)
+            .size()
+            .reset_index(name="count")
+            .sort_values(by="count", ascending=False)
+        )
+        print("\nEntities per principal organ:")
+        print(summary_table.to_string(index=False))
 
-un_principal_organ = df.explode("un_principal_organ")
-summary_table = (
-    un_principal_organ.groupby("un_principal_organ", dropna=False)
-    .size()
-    .reset_index(name="count")
-    .sort_values(by="count", ascending=False)
-)
-print(summary_table["un_principal_organ"])
+    if not report["passed"]:
+        sys.exit(1)
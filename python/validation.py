@@ -0,0 +1,385 @@
+"""
+Rule-based validation of the entities table.
+
+Every check is a Rule in RULES: a name, the columns it reads, a severity and
+a vectorized check that returns a boolean mask of the violating rows (or a
+single bool for table-level rules such as the record-count floor). Rules
+are built from a few factories (required, unique, one_of, url_shape,
+url_safe, consistent, min_rows), like the columns in schema.py, so adding a
+check is one line. validate() runs them all and returns a JSON-serializable
+report:
+
+    {"passed": false, "row_count": 169, "errors": 1, "warnings": 3,
+     "duration_ms": 4.1,
+     "rules": [{"rule": "unique:entity", "severity": "error",
+                "columns": ["entity"], "message": "...", "violations": 2,
+                "examples": ["UNDP", "UNDP"]}, ...]}
+
+Rules whose columns are missing from the frame are reported as skipped.
+rules_for() adds a record-count floor relative to the previous snapshot, so
+a fetch that loses more than MAX_RECORD_DROP of the entities fails.
+"""
+
+import json
+import math
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from schema import BOOL, COLUMNS, LIST, PLACEHOLDER_URLS, TEXT, URL, coerce_value
+from utils import parse_airtable_list_column
+
+ERROR = "error"
+WARNING = "warning"
+
+REPORT_PATH = Path("data") / "output" / "validation_report.json"
+
+# Sanity check: a fetch may not lose more than this share of the previous
+# snapshot's records. Override with MAX_RECORD_DROP, e.g. 0.5
+MAX_RECORD_DROP = float(os.environ.get("MAX_RECORD_DROP") or 0.1)
+# Violating rows listed per rule in the report
+MAX_EXAMPLES = 10
+
+PRINCIPAL_ORGANS = [
+    "General Assembly",
+    "Security Council",
+    "Economic and Social Council",
+    "Secretariat",
+    "International Court of Justice",
+    "Trusteeship Council",
+    "Specialized Agencies",
+    "Related Organizations",
+    "Other",
+]
+CATEGORIES = [
+    "Intergovernmental and Expert Bodies",
+    "Funds and Programmes",
+    "Research and Training",
+    "Other Entities",
+    "Other Mechanisms",
+    "Other Subsidiary Bodies",
+    "Commissions and Investigative Bodies",
+    "Committees",
+    "Groups and Panels",
+    "International Tribunals",
+    "Peacekeeping Operations",
+    "Special Political Missions and Other Political Presences",
+    "Special Advisers, Representatives, Advocates and Envoys",
+    "Working Groups",
+    "Peacebuilding Commission",
+    "Functional Commissions",
+    "Regional Commissions",
+    "Other Bodies and Committees",
+    "Specialized Agencies",
+    "International Court of Justice",
+]
+
+_URL_PATTERN = r"^https?://[^\s/?#]+\.[^\s/?#]+(?:[/?#]\S*)?$"
+# Characters quote(value, safe="") leaves unchanged: the entity is used in routes
+_URL_SAFE_PATTERN = r"^[A-Za-z0-9_.~-]+$"
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A validation check over one or more columns of the entities table."""
+
+    name: str
+    columns: tuple[str, ...]
+    # Returns a boolean mask of violating rows, or one bool for the whole table
+    check: Callable[[pd.DataFrame], "pd.Series | bool"]
+    message: str
+    severity: str = ERROR
+
+
+def _blank(values: pd.Series) -> pd.Series:
+    """Mask of missing values, empty strings and empty lists."""
+    if values.dtype == object:
+        return values.isna() | values.map(len, na_action="ignore").eq(0)
+    return values.isna()
+
+
+def _matches(values: pd.Series, pattern: str) -> pd.Series:
+    """Mask of non-missing string values matching a regex, evaluated by Arrow."""
+    array = pa.array(values, type=pa.string(), from_pandas=True)
+    if isinstance(array, pa.ChunkedArray):
+        # Arrow-backed columns can have many chunks; the regex is compiled per chunk
+        array = array.combine_chunks()
+    matched = pc.match_substring_regex(array, pattern).fill_null(True)
+    return pd.Series(matched.to_numpy(zero_copy_only=False), index=values.index)
+
+
+def required(column: str, severity: str = ERROR) -> Rule:
+    """Rule: the column has a non-empty value in every row."""
+    return Rule(
+        f"required:{column}",
+        (column,),
+        lambda df: _blank(df[column]),
+        f"{column} is missing",
+        severity,
+    )
+
+
+def unique(column: str, severity: str = ERROR) -> Rule:
+    """Rule: non-missing values of the column are unique."""
+    return Rule(
+        f"unique:{column}",
+        (column,),
+        lambda df: df[column].duplicated(keep=False) & df[column].notna(),
+        f"{column} is duplicated",
+        severity,
+    )
+
+
+def one_of(column: str, allowed: list[str], severity: str = ERROR) -> Rule:
+    """Rule: every value (every item, for list columns) is in `allowed`."""
+
+    def check(df: pd.DataFrame) -> pd.Series:
+        values = df[column].explode()
+        invalid = values.notna() & ~values.isin(allowed)
+        return invalid.groupby(level=0).any().reindex(df.index, fill_value=False)
+
+    return Rule(
+        f"one_of:{column}",
+        (column,),
+        check,
+        f"{column} has a value outside the known list",
+        severity,
+    )
+
+
+def url_shape(column: str, severity: str = WARNING) -> Rule:
+    """Rule: non-missing values are absolute http(s) URLs or known placeholders."""
+    return Rule(
+        f"url_shape:{column}",
+        (column,),
+        lambda df: ~_matches(df[column], _URL_PATTERN)
+        & ~df[column].isin(PLACEHOLDER_URLS),
+        f"{column} is not an http(s) URL",
+        severity,
+    )
+
+
+def url_safe(column: str, severity: str = WARNING) -> Rule:
+    """Rule: values need no percent-encoding in a URL path segment."""
+    return Rule(
+        f"url_safe:{column}",
+        (column,),
+        lambda df: ~_matches(df[column], _URL_SAFE_PATTERN),
+        f"{column} is not URL safe",
+        severity,
+    )
+
+
+def consistent(
+    name: str,
+    columns: tuple[str, ...],
+    check: Callable[[pd.DataFrame], pd.Series],
+    message: str,
+    severity: str = WARNING,
+) -> Rule:
+    """Rule: a cross-field condition; `check` returns the inconsistent rows."""
+    return Rule(f"consistent:{name}", columns, check, message, severity)
+
+
+def min_rows(count: int, severity: str = ERROR) -> Rule:
+    """Table rule: the table has at least `count` rows."""
+    return Rule(
+        "min_rows",
+        (),
+        lambda df: len(df) < count,
+        f"Expected at least {count} records",
+        severity,
+    )
+
+
+# Links fetched from Airtable (the derived headshot link is a local path)
+URL_COLUMNS = [
+    column.name for column in COLUMNS if column.type == URL and column.airtable
+]
+
+RULES = [
+    min_rows(1),
+    required("entity"),
+    required("entity_long"),
+    unique("entity"),
+    unique("record_id"),
+    url_safe("entity"),
+    one_of("un_principal_organ", PRINCIPAL_ORGANS),
+    one_of("category", CATEGORIES, severity=WARNING),
+    *[url_shape(column) for column in URL_COLUMNS],
+    consistent(
+        "subcategory_without_category",
+        ("category", "subcategory"),
+        lambda df: df["subcategory"].notna() & df["category"].isna(),
+        "subcategory is set but category is missing",
+    ),
+    consistent(
+        "logo_url_without_logo",
+        ("entity_logo_url", "entity_logo_available"),
+        lambda df: df["entity_logo_url"].notna()
+        & ~df["entity_logo_available"].eq(True),
+        "entity_logo_url is set but entity_logo_available is not checked",
+    ),
+    consistent(
+        "combined_name",
+        ("entity", "entity_long", "entity_combined"),
+        lambda df: df["entity_combined"].notna()
+        & df["entity_combined"].ne(df["entity_long"] + " (" + df["entity"] + ")")
+        & df["entity_combined"].ne(df["entity_long"]),
+        "entity_combined is not 'entity_long (entity)'",
+    ),
+]
+
+
+def rules_for(previous_count: int | None, rules: list[Rule] = RULES) -> list[Rule]:
+    """
+    Add a record-count floor relative to the previous snapshot to the rules.
+
+    Args:
+        previous_count: Rows of the previous snapshot; None for a first fetch
+        rules: Rules to extend
+
+    Example:
+        >>> rules_for(169)[-1].message
+        'Expected at least 153 records'
+    """
+    if not previous_count:
+        return rules
+    return [*rules, min_rows(math.ceil(previous_count * (1 - MAX_RECORD_DROP)))]
+
+
+def rule_columns(rules: list[Rule] = RULES) -> list[str]:
+    """Columns read by a set of rules, for column projection when loading."""
+    return sorted({column for rule in rules for column in rule.columns})
+
+
+def prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize a frame from any of the pipeline's formats for validation.
+
+    List columns stored as text (CSV, string cells) are parsed into lists,
+    text flags in boolean columns are coerced, and empty strings become
+    missing values.
+
+    Example:
+        >>> df = pd.DataFrame({"entity_logo_url": ["https://un.org/logo.svg"],
+        ...     "entity_logo_available": pd.Series(["checked"], dtype="string")})
+        >>> prepare_frame(df)["entity_logo_available"].tolist()
+        [True]
+        >>> validate(prepare_frame(df), RULES)["warnings"]
+        0
+    """
+    df = df.copy()
+    for column in COLUMNS:
+        if column.type in (TEXT, URL) and column.name in df:
+            df[column.name] = df[column.name].replace("", None)
+        if (
+            column.type == BOOL
+            and column.name in df
+            and not pd.api.types.is_bool_dtype(df[column.name])
+        ):
+            # Text flags may be object or string dtype (pandas 3 reads them as str)
+            df[column.name] = (
+                df[column.name]
+                .astype(object)
+                .map(lambda value: coerce_value(value, BOOL), na_action="ignore")
+            )
+        if column.type == LIST and column.name in df:
+            values = df[column.name]
+            text = values.map(type, na_action="ignore").eq(str)
+            if text.any():
+                parsed = parse_airtable_list_column(
+                    values[text], split_commas=column.name != "entity_headquarters"
+                )
+                values = values.astype(object)
+                values[text] = parsed
+                df[column.name] = values
+    return df
+
+
+def validate(df: pd.DataFrame, rules: list[Rule] = RULES) -> dict:
+    """
+    Run validation rules over the entities table.
+
+    Args:
+        df: Entities table (see prepare_frame() for frames read from CSV)
+        rules: Rules to run; defaults to the full registry
+
+    Returns:
+        Report dict (see module docstring); "passed" is False if any rule
+        with severity "error" has violations
+
+    Example:
+        >>> df = pd.DataFrame({"entity": ["OLA", "OLA"], "entity_long": ["a", None]})
+        >>> report = validate(df, [required("entity_long"), unique("entity")])
+        >>> [(r["rule"], r["violations"]) for r in report["rules"]]
+        [('required:entity_long', 1), ('unique:entity', 2)]
+    """
+    started = time.perf_counter()
+    labels = df["entity"] if "entity" in df else pd.Series(df.index, index=df.index)
+    df = df.reset_index(drop=True)
+    labels = labels.reset_index(drop=True)
+
+    results = []
+    for rule in rules:
+        result = {
+            "rule": rule.name,
+            "severity": rule.severity,
+            "columns": list(rule.columns),
+            "message": rule.message,
+        }
+        if any(column not in df for column in rule.columns):
+            results.append({**result, "skipped": True, "violations": 0})
+            continue
+
+        violations = rule.check(df)
+        if isinstance(violations, (bool, np.bool_)):
+            count = int(violations)
+            examples = [] if not count else [f"{len(df)} rows"]
+        else:
+            mask = violations.to_numpy(dtype=bool)
+            count = int(mask.sum())
+            examples = labels[mask].head(MAX_EXAMPLES).astype(str).tolist()
+        results.append({**result, "violations": count, "examples": examples})
+
+    failed = [r for r in results if r["violations"]]
+    return {
+        "passed": not any(r["severity"] == ERROR for r in failed),
+        "row_count": len(df),
+        "errors": sum(r["severity"] == ERROR for r in failed),
+        "warnings": sum(r["severity"] == WARNING for r in failed),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        "rules": results,
+    }
+
+
+def write_report(report: dict, path: Path = REPORT_PATH) -> None:
+    """Write a validation report as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+
+
+def print_report(report: dict) -> None:
+    """Print the failed rules of a validation report."""
+    for result in report["rules"]:
+        if not result["violations"]:
+            continue
+        icon = "❌" if result["severity"] == ERROR else "⚠️ "
+        examples = ", ".join(result["examples"])
+        more = result["violations"] - len(result["examples"])
+        if more > 0 and result["examples"]:
+            examples += f", ... (+{more})"
+        print(f"{icon} {result['message']} [{result['rule']}]: {examples}")
+
+    skipped = sum(result.get("skipped", False) for result in report["rules"])
+    print(
+        f"\nValidation: {report['errors']} errors, {report['warnings']} warnings, "
+        f"{len(report['rules']) - skipped} rules over {report['row_count']} rows "
+        f"in {report['duration_ms']:.1f} ms"
+    )
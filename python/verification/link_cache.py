@@ -0,0 +1,175 @@
+"""
+Persistent cache of link verification results, in SQLite.
+
+For every checked URL the cache keeps the validators of the response (ETag
+and Last-Modified), the final URL, the status code, the verify_link() result,
+the body bytes scanned by the content check (0 for a status-only HEAD check)
+and the time of the check. verify_links.py uses it in two ways:
+
+- URLs whose last check was healthy and is younger than max_age are not
+  requested at all; the cached result is reused.
+- Older healthy URLs are revalidated with a conditional request
+  (If-None-Match / If-Modified-Since). A 304 Not Modified reply has no body,
+  so the cached content check still holds and nothing is downloaded.
+
+Only results of an equal or stronger check are reused: a status-only result
+is never served to a run that scans page content. Failed checks are always
+repeated. The cache is safe to share between the verification threads.
+
+Example:
+    >>> cache = LinkCache(":memory:", max_age=3600)
+    >>> cache.store("https://un.org", {"accessible": True, "status_code": 200,
+    ...     "content_valid": True}, etag='"abc"', last_modified=None, max_bytes=0)
+    >>> cache.fresh(cache.get("https://un.org"), max_bytes=0)
+    True
+    >>> cache.fresh(cache.get("https://un.org"), max_bytes=65536)
+    False
+    >>> cache.conditional_headers(cache.get("https://un.org"), max_bytes=0)
+    {'If-None-Match': '"abc"'}
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+CACHE_PATH = Path("data") / "cache" / "link_verification.sqlite"
+# Healthy results younger than this are reused without a request
+MAX_AGE = 24 * 60 * 60  # seconds
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    final_url TEXT,
+    status_code INTEGER,
+    healthy INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    checked_at REAL NOT NULL,
+    max_bytes INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+def is_healthy(result: dict) -> bool:
+    """
+    Whether a verify_link() result is good enough to skip or revalidate.
+
+    The link must be accessible and, if its content was checked, not look
+    like an error page.
+    """
+    if not result.get("accessible"):
+        return False
+    return (
+        bool(result.get("content_valid")) or result.get("has_error_indicator") is None
+    )
+
+
+class LinkCache:
+    """SQLite-backed store of verify_link() results, keyed by URL."""
+
+    def __init__(self, path: Path | str = CACHE_PATH, max_age: float = MAX_AGE):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: SQLite database file, or ":memory:"
+            max_age: Seconds during which a healthy result is reused as is
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute(_SCHEMA)
+        columns = {row["name"] for row in self._db.execute("PRAGMA table_info(links)")}
+        if "max_bytes" not in columns:
+            # Caches from before the check mode was stored count as status-only
+            self._db.execute(
+                "ALTER TABLE links ADD COLUMN max_bytes INTEGER NOT NULL DEFAULT 0"
+            )
+
+    def get(self, url: str) -> dict | None:
+        """Return the cache entry of a URL, or None if it was never checked."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM links WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["result"] = json.loads(entry["result"])
+        return entry
+
+    @staticmethod
+    def reusable(entry: dict | None, max_bytes: int) -> bool:
+        """Whether an entry is healthy and made by a check reading >= max_bytes."""
+        return bool(entry and entry["healthy"] and entry["max_bytes"] >= max_bytes)
+
+    def fresh(self, entry: dict | None, max_bytes: int) -> bool:
+        """Whether an entry is reusable for the check and younger than max_age."""
+        return self.reusable(entry, max_bytes) and (
+            time.time() - entry["checked_at"] < self.max_age
+        )
+
+    @staticmethod
+    def conditional_headers(entry: dict | None, max_bytes: int) -> dict[str, str]:
+        """Headers to revalidate a reusable entry; empty if there is nothing to send."""
+        if not LinkCache.reusable(entry, max_bytes):
+            return {}
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(
+        self,
+        url: str,
+        result: dict,
+        etag: str | None,
+        last_modified: str | None,
+        max_bytes: int,
+    ) -> None:
+        """Save the result of a check reading up to max_bytes of the body."""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO links (url, etag, last_modified, final_url, "
+                "status_code, healthy, result, checked_at, max_bytes) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    etag,
+                    last_modified,
+                    result.get("redirect_url") or url,
+                    result.get("status_code"),
+                    is_healthy(result),
+                    json.dumps(result),
+                    time.time(),
+                    max_bytes,
+                ),
+            )
+            self._db.commit()
+
+    def touch(self, url: str) -> None:
+        """Mark an entry as checked now, after a 304 Not Modified."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE links SET checked_at = ? WHERE url = ?", (time.time(), url)
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "LinkCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,318 @@
+"""
+Screenshots of entity pages with one pooled Playwright browser.
+
+One headless Chromium is launched per run. `pages` browser contexts, each
+with one page, take URLs from a shared queue with async Playwright, so
+several pages load in parallel and each context is reused across URLs.
+Every page is given a short, bounded wait for the network to go idle instead
+of a fixed pause.
+
+Each capture is compared pixel by pixel with the PNG of the previous run
+(screenshots.json next to the images records the URL each one shows). A page
+of the same size whose changed pixels (differing by more than
+PIXEL_TOLERANCE) all fit in a NOISE_BOX square is considered unchanged and its
+PNG is not rewritten. Any changed text, banner or error notice exceeds that,
+however long the page.
+
+The time spent in each stage (navigation, settling, capture, comparison,
+writing) is summed over all pages and printed at the end of the run.
+
+Used by verify_links.py --screenshots:
+
+    take_screenshots([("UNICEF", "https://www.unicef.org")], screenshot_dir)
+"""
+
+import asyncio
+import io
+import json
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from tqdm import tqdm
+
+PAGES = 4  # pages loaded in parallel
+VIEWPORT = {"width": 1920, "height": 1080}
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+NAVIGATION_TIMEOUT = 30_000  # ms
+# Upper bound on the wait for late requests after the load event
+SETTLE_TIMEOUT = 3_000  # ms
+# Per-channel differences up to this are rendering noise (anti-aliasing)
+PIXEL_TOLERANCE = 16
+# Captures whose changes fit in a square this size count as unchanged (stray
+# rendering artifacts); even a one-letter text change is larger
+NOISE_BOX = 4  # px
+PAGES_FILE = "screenshots.json"
+
+
+def screenshot_filename(entity: str) -> str:
+    """
+    File name of an entity's screenshot.
+
+    Example:
+        >>> screenshot_filename("UN-Habitat / HQ")
+        'UN-Habitat___HQ.png'
+    """
+    return (
+        "".join(c if c.isalnum() or c in ("-", "_") else "_" for c in entity) + ".png"
+    )
+
+
+def changed_region(previous: bytes, current: bytes) -> tuple[int, int] | None:
+    """
+    Width and height of the region where two PNGs differ (None if identical).
+
+    A pixel counts as changed if any channel differs by more than
+    PIXEL_TOLERANCE. Captures of different sizes differ everywhere.
+    """
+    from PIL import Image, ImageChops
+
+    with (
+        Image.open(io.BytesIO(previous)) as old,
+        Image.open(io.BytesIO(current)) as new,
+    ):
+        if old.size != new.size:
+            return max(old.width, new.width), max(old.height, new.height)
+        difference = ImageChops.difference(old.convert("RGB"), new.convert("RGB"))
+    red, green, blue = difference.split()
+    largest = ImageChops.lighter(ImageChops.lighter(red, green), blue)
+    box = largest.point(lambda value: 255 if value > PIXEL_TOLERANCE else 0).getbbox()
+    return None if box is None else (box[2] - box[0], box[3] - box[1])
+
+
+def looks_unchanged(previous: bytes | None, current: bytes) -> bool:
+    """
+    Whether a capture differs from the previous one at most in a NOISE_BOX.
+
+    Example:
+        >>> from PIL import Image, ImageDraw
+        >>> def png(text):
+        ...     image = Image.new("RGB", (400, 100), "white")
+        ...     ImageDraw.Draw(image).text((10, 40), text, fill="black")
+        ...     output = io.BytesIO()
+        ...     image.save(output, format="PNG")
+        ...     return output.getvalue()
+        >>> looks_unchanged(png("Welcome"), png("Welcome"))
+        True
+        >>> looks_unchanged(png("Welcome"), png("Page not found"))
+        False
+        >>> looks_unchanged(None, png("Welcome"))
+        False
+    """
+    if previous is None:
+        return False
+    region = changed_region(previous, current)
+    return region is None or max(region) <= NOISE_BOX
+
+
+async def _capture(
+    page,
+    entity: str,
+    url: str,
+    screenshot_dir: Path,
+    previous: dict,
+    timings: dict[str, float],
+) -> dict:
+    """Load one URL in a pooled page, compare the capture and write it if changed."""
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    result = {
+        "screenshot_taken": False,
+        "screenshot_path": None,
+        "screenshot_error": None,
+        "screenshot_changed": None,
+    }
+    path = screenshot_dir / screenshot_filename(entity)
+
+    def lap(stage: str, started: float) -> float:
+        now = time.perf_counter()
+        timings[stage] += now - started
+        return now
+
+    stage, started = "navigate", time.perf_counter()
+    try:
+        await page.goto(url, wait_until="load", timeout=NAVIGATION_TIMEOUT)
+        stage, started = "settle", lap(stage, started)
+
+        # Give late requests (fonts, lazy images) a bounded chance to finish
+        try:
+            await page.wait_for_load_state("networkidle", timeout=SETTLE_TIMEOUT)
+        except PlaywrightTimeoutError:
+            pass
+        stage, started = "capture", lap(stage, started)
+
+        png = await page.screenshot(full_page=True, type="png")
+        started = lap(stage, started)
+    except PlaywrightTimeoutError:
+        lap(stage, started)
+        result["screenshot_error"] = "Page load timeout"
+        return result
+    except Exception as e:
+        lap(stage, started)
+        result["screenshot_error"] = f"Screenshot error: {str(e)[:100]}"
+        return result
+
+    old_png = None
+    if path.exists() and previous.get(entity, {}).get("url") == url:
+        old_png = await asyncio.to_thread(path.read_bytes)
+    changed = not await asyncio.to_thread(looks_unchanged, old_png, png)
+    started = lap("compare", started)
+
+    if changed:
+        await asyncio.to_thread(path.write_bytes, png)
+        previous[entity] = {"url": url}
+    lap("write", started)
+
+    result["screenshot_taken"] = True
+    result["screenshot_path"] = str(path)
+    result["screenshot_changed"] = changed
+    return result
+
+
+async def _take_screenshots(
+    targets: list[tuple[str, str]],
+    screenshot_dir: Path,
+    pages: int,
+    pages_shown: dict,
+    timings: dict[str, float],
+) -> list[dict]:
+    """Capture every target with one browser and `pages` pooled pages."""
+    from playwright.async_api import async_playwright
+
+    results = [None] * len(targets)
+    queue = asyncio.Queue()
+    for position, target in enumerate(targets):
+        queue.put_nowait((position, *target))
+
+    async def worker(browser, progress):
+        context = await browser.new_context(viewport=VIEWPORT, user_agent=USER_AGENT)
+        page = await context.new_page()
+        try:
+            while not queue.empty():
+                position, entity, url = queue.get_nowait()
+                results[position] = await _capture(
+                    page, entity, url, screenshot_dir, pages_shown, timings
+                )
+                if page.is_closed():  # crashed or closed by the site
+                    page = await context.new_page()
+                progress.update()
+        finally:
+            await context.close()
+
+    started = time.perf_counter()
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        timings["launch"] += time.perf_counter() - started
+        try:
+            with tqdm(total=len(targets), desc="Screenshots") as progress:
+                await asyncio.gather(
+                    *(
+                        worker(browser, progress)
+                        for _ in range(min(pages, len(targets)))
+                    )
+                )
+        finally:
+            await browser.close()
+    return results
+
+
+def take_screenshots(
+    targets: list[tuple[str, str]],
+    screenshot_dir: Path,
+    pages: int = PAGES,
+) -> list[dict]:
+    """
+    Take full-page screenshots of entity pages, writing only changed ones.
+
+    Args:
+        targets: (entity, url) pairs; the entity names the file
+        screenshot_dir: Directory for the PNGs and screenshots.json
+        pages: Pages loaded in parallel in the shared browser
+
+    Returns:
+        One dict per target, in order, with screenshot_taken, screenshot_path,
+        screenshot_error and screenshot_changed (False if the page looks the
+        same as in the last run and its file was kept)
+    """
+    screenshot_dir.mkdir(parents=True, exist_ok=True)
+    pages_path = screenshot_dir / PAGES_FILE
+    pages_shown = json.loads(pages_path.read_text()) if pages_path.exists() else {}
+    timings = defaultdict(float)
+
+    # Only web URLs are handed to the browser
+    results = [
+        {
+            "screenshot_taken": False,
+            "screenshot_path": None,
+            "screenshot_error": "Invalid URL",
+            "screenshot_changed": None,
+        }
+        for _ in targets
+    ]
+    valid = [
+        position
+        for position, (_, url) in enumerate(targets)
+        if isinstance(url, str) and url.startswith(("http://", "https://"))
+    ]
+
+    started = time.perf_counter()
+    if valid:
+        try:
+            captured = asyncio.run(
+                _take_screenshots(
+                    [targets[position] for position in valid],
+                    screenshot_dir,
+                    pages,
+                    pages_shown,
+                    timings,
+                )
+            )
+        except Exception as e:  # e.g. the browser is not installed
+            error = f"Screenshot error: {str(e)[:100]}"
+            captured = [
+                {**results[position], "screenshot_error": error} for position in valid
+            ]
+        for position, result in zip(valid, captured):
+            results[position] = result
+    elapsed = time.perf_counter() - started
+
+    pages_path.write_text(
+        json.dumps(dict(sorted(pages_shown.items())), indent=2) + "\n"
+    )
+    print_timings(results, timings, elapsed, pages)
+    return results
+
+
+def print_timings(
+    results: list[dict], timings: dict[str, float], elapsed: float, pages: int
+) -> None:
+    """Print the outcome counts and the time spent in each stage."""
+    outcomes = Counter(
+        (
+            "changed"
+            if result["screenshot_changed"]
+            else (
+                "unchanged"
+                if result["screenshot_taken"]
+                else (
+                    "invalid"
+                    if result["screenshot_error"] == "Invalid URL"
+                    else "failed"
+                )
+            )
+        )
+        for result in results
+    )
+    print(
+        f"\nScreenshots: {outcomes['changed']} written, "
+        f"{outcomes['unchanged']} unchanged, {outcomes['failed']} failed "
+        f"in {elapsed:.1f}s ({pages} pages in parallel)"
+    )
+    # Stage times are summed over the parallel pages
+    print(f"  {'launch':<9} {timings.get('launch', 0):>8.1f}s")
+    loaded = max(len(results) - outcomes["invalid"], 1)
+    for stage in ("navigate", "settle", "capture", "compare", "write"):
+        print(
+            f"  {stage:<9} {timings.get(stage, 0):>8.1f}s "
+            f"{timings.get(stage, 0) / loaded * 1000:>8.0f} ms/page"
+        )
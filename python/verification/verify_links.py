@@ -1,21 +1,160 @@
+"""
+Verify entity links: HTTP status, redirects, Cloudflare protection and
+content quality, optionally with screenshots.
+
+Links are checked concurrently on a thread pool. Instead of sleeping before
+every request, politeness is enforced per host (HostLimiter): at most
+--per-host requests in flight to the same host, and request starts spaced by
+--host-delay seconds. Links on different hosts (e.g. the many un.org
+subdomains) are checked in parallel.
+
+Pages are streamed and only their first --max-kb KB are scanned for error
+phrases, all matched in one pass; the connection is closed as soon as there
+is a verdict.
+
+Results are cached in data/cache/link_verification.sqlite (link_cache.py).
+Links that were healthy less than --max-age hours ago are not requested;
+older ones are revalidated with conditional requests (ETag/Last-Modified),
+and a 304 Not Modified reuses the cached result without a body.
+
+With --screenshots, pages are captured in one shared browser with several
+pages in parallel (screenshots.py); unchanged pages are not rewritten.
+
+With --all-columns, every URL column of the export is checked instead of
+entity_link only. URLs are normalized and deduplicated across entities and
+columns, so each one is fetched once, and the results are written as one row
+per (entity, column) to data/output/entity_link_verification_all_columns.csv.
+
+Usage:
+    uv run python python/verification/verify_links.py [--screenshots]
+        [--screenshot-pages 4]
+        [--all-columns] [--workers 16] [--per-host 2] [--host-delay 0.5]
+        [--timeout 10] [--max-kb 64] [--max-age 24] [--no-cache]
+"""
+
 import json
+import re
+import sys
+import threading
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
 from http import HTTPStatus
+from itertools import chain, zip_longest
 from pathlib import Path
 from typing import Dict
+from urllib.parse import urlparse, urlsplit, urlunsplit
 
 import pandas as pd
 import requests
-from playwright.sync_api import sync_playwright
 from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 from urllib3.util.retry import Retry
 
+# Allow importing the pipeline modules (schema) when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from schema import COLUMNS, PLACEHOLDER_URLS, PUBLIC, URL  # noqa: E402
+from verification import screenshots  # noqa: E402
+from verification.link_cache import CACHE_PATH, MAX_AGE, LinkCache  # noqa: E402
+
+WORKERS = 16
+PER_HOST = 2
+HOST_DELAY = 0.5  # seconds between request starts to the same host
+TIMEOUT = 10  # seconds
+# Body bytes read for the content check; pages are never downloaded in full
+MAX_CONTENT_BYTES = 64 * 1024
+CHUNK_SIZE = 8 * 1024
+
+# Fields of a verify_link() result
+RESULT_FIELDS = [
+    "url",
+    "accessible",
+    "status_code",
+    "status_name",
+    "content_valid",
+    "content_length",
+    "has_error_indicator",
+    "error",
+    "redirect_url",
+    "cloudflare_protected",
+    "cache",
+]
+
+# Link columns checked with --all-columns (the URL columns of the public export)
+LINK_COLUMNS = [
+    column.name
+    for column in COLUMNS
+    if column.type == URL and column.airtable and PUBLIC in column.outputs
+]
+ALL_COLUMNS_OUTPUT = (
+    Path("data") / "output" / "entity_link_verification_all_columns.csv"
+)
+
+
+class HostLimiter:
+    """
+    Per-host politeness budget shared by the verification threads.
+
+    Each host gets at most `max_concurrent` requests in flight, and request
+    starts to the same host are spaced at least `min_interval` seconds apart.
+    Different hosts do not wait for each other.
+    """
+
+    def __init__(
+        self, max_concurrent: int = PER_HOST, min_interval: float = HOST_DELAY
+    ):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.Semaphore] = {}
+        self._next_start: dict[str, float] = {}
+
+    @contextmanager
+    def slot(self, url: str):
+        """Wait for a free slot on the URL's host, for the duration of a request."""
+        host = urlparse(url).hostname or ""
+        with self._lock:
+            semaphore = self._semaphores.setdefault(
+                host, threading.Semaphore(self.max_concurrent)
+            )
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.min_interval
+            time.sleep(start - now)
+            yield
+
 
-def create_session() -> requests.Session:
+def interleave_by_host(urls: list[str]) -> list[int]:
+    """
+    Order URL positions round-robin across hosts.
+
+    Submitting URLs in this order keeps the workers spread over many hosts
+    instead of queueing behind one host's politeness budget.
+
+    Example:
+        >>> interleave_by_host(["https://a.org/1", "https://a.org/2", "https://b.org/"])
+        [0, 2, 1]
+    """
+    by_host = defaultdict(list)
+    for position, url in enumerate(urls):
+        by_host[urlparse(url).hostname or ""].append(position)
+    rounds = zip_longest(*by_host.values())
+    return [
+        position for position in chain.from_iterable(rounds) if position is not None
+    ]
+
+
+def create_session(pool_size: int = WORKERS) -> requests.Session:
     """
     Create a requests session with retry logic and human-like headers.
     This prevents the requests from being blocked as automated traffic.
+
+    The connection pool holds `pool_size` connections per host, so it is
+    shared by the verification threads without blocking.
     """
     session = requests.Session()
 
@@ -26,7 +165,9 @@ def create_session() -> requests.Session:
         status_forcelist=[429, 500, 502, 503, 504],
         allowed_methods=["HEAD", "GET"],
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry_strategy
+    )
     session.mount("http://", adapter)
     session.mount("https://", adapter)
 
@@ -46,39 +187,85 @@ def create_session() -> requests.Session:
     return session
 
 
-def check_content_quality(response: requests.Response) -> dict:
+def _indicator_pattern(indicators: list[str]) -> re.Pattern:
+    """Compile phrases into one case-insensitive pattern, matched in a single pass."""
+    return re.compile(
+        b"|".join(re.escape(indicator.encode()) for indicator in indicators),
+        re.IGNORECASE,
+    )
+
+
+# Common error page indicators
+ERROR_INDICATORS = [
+    "page not found",
+    "404 error",
+    "page cannot be found",
+    "page does not exist",
+    "this page isn't available",
+    "the page you requested could not be found",
+    "no such page",
+    "error 404",
+    "not found",
+    "access denied",
+    "forbidden",
+    "403 error",
+    "500 error",
+    "internal server error",
+    "service unavailable",
+    "temporarily unavailable",
+]
+CLOUDFLARE_INDICATORS = [
+    "cloudflare",
+    "cf-ray",
+    "checking your browser",
+    "ddos protection",
+    "ray id",
+]
+_ERROR_PATTERN = _indicator_pattern(ERROR_INDICATORS)
+_CLOUDFLARE_PATTERN = _indicator_pattern(CLOUDFLARE_INDICATORS)
+
+
+def scan_body(
+    response: requests.Response, pattern: re.Pattern, max_bytes: int
+) -> tuple[int, bool]:
     """
-    Check if the page content makes sense and is not a 404/error page.
+    Stream at most `max_bytes` of a response body, looking for `pattern`.
+
+    Reading stops at the first match, so the rest of the page is never
+    downloaded; chunks overlap so matches across chunk boundaries are found.
 
     Returns:
-        Dictionary with content analysis results
+        (bytes read, whether the pattern matched)
     """
-    content = response.text.lower()
-    content_length = len(content)
-
-    # Common error page indicators
-    error_indicators = [
-        "page not found",
-        "404 error",
-        "page cannot be found",
-        "page does not exist",
-        "this page isn't available",
-        "the page you requested could not be found",
-        "no such page",
-        "error 404",
-        "not found",
-        "access denied",
-        "forbidden",
-        "403 error",
-        "500 error",
-        "internal server error",
-        "service unavailable",
-        "temporarily unavailable",
-    ]
+    # Longest literal in the alternation, to carry over between chunks
+    overlap = max(len(part) for part in pattern.pattern.split(b"|")) - 1
+    read, tail = 0, b""
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        chunk = chunk[: max_bytes - read]
+        read += len(chunk)
+        window = tail + chunk
+        if pattern.search(window):
+            return read, True
+        tail = window[-overlap:]
+        if read >= max_bytes:
+            break
+    return read, False
+
+
+def check_content_quality(
+    response: requests.Response, max_bytes: int = MAX_CONTENT_BYTES
+) -> dict:
+    """
+    Check if the page content makes sense and is not a 404/error page.
 
-    # Check if any error indicators are present
-    has_error_indicator = any(indicator in content for indicator in error_indicators)
+    Only the first `max_bytes` of the body are read, and reading stops at
+    the first error indicator.
 
+    Returns:
+        Dictionary with content analysis results; content_length is the
+        number of body bytes read (at most `max_bytes`)
+    """
+    content_length, has_error_indicator = scan_body(response, _ERROR_PATTERN, max_bytes)
     return {
         "content_length": content_length,
         "has_error_indicator": has_error_indicator,
@@ -94,88 +281,37 @@ def get_status_name(status_code: int) -> str:
         return "Unknown"
 
 
-def take_screenshot(url: str, entity_name: str, screenshot_dir: Path) -> Dict:
-    """
-    Take a screenshot of the webpage using Playwright.
-
-    Args:
-        url: URL to screenshot
-        entity_name: Name of the entity (used for filename)
-        screenshot_dir: Directory to save screenshots
-
-    Returns:
-        Dictionary with screenshot results
+def verify_link(
+    session: requests.Session,
+    url: str,
+    limiter: HostLimiter | None = None,
+    timeout: float = TIMEOUT,
+    max_bytes: int = MAX_CONTENT_BYTES,
+    cache: LinkCache | None = None,
+) -> Dict:
     """
-    result = {
-        "screenshot_taken": False,
-        "screenshot_path": None,
-        "screenshot_error": None,
-    }
-
-    # Skip invalid URLs
-    if not url or url in [
-        "Not found",
-        "Not found.",
-        "Not applicable",
-        "No link found",
-        "null",
-        "None",
-    ]:
-        result["screenshot_error"] = "Invalid URL"
-        return result
-
-    try:
-        with sync_playwright() as p:
-            # Launch browser with headless mode
-            browser = p.chromium.launch(headless=True)
-
-            # Create context with realistic viewport and user agent
-            context = browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            )
-
-            page = context.new_page()
-
-            # Navigate to the page with timeout
-            page.goto(url, wait_until="networkidle", timeout=30000)
-
-            # Wait a bit for any dynamic content to load
-            page.wait_for_timeout(2000)
-
-            # Create screenshot filename from entity name
-            safe_filename = "".join(
-                c if c.isalnum() or c in ("-", "_") else "_" for c in entity_name
-            )
-            screenshot_path = screenshot_dir / f"{safe_filename}.png"
-
-            # Take full page screenshot with high quality
-            page.screenshot(path=str(screenshot_path), full_page=True, type="png")
-
-            result["screenshot_taken"] = True
-            result["screenshot_path"] = str(screenshot_path)
-
-            browser.close()
-
-    except TimeoutError:
-        result["screenshot_error"] = "Page load timeout"
-    except Exception as e:
-        result["screenshot_error"] = f"Screenshot error: {str(e)[:100]}"
-
-    return result
+    Verify a single URL for accessibility and content quality.
 
+    The body is streamed and only its first `max_bytes` are scanned; the
+    connection is closed as soon as there is a verdict. With max_bytes=0 a
+    HEAD request checks the status only (GET if the server rejects HEAD).
 
-def verify_link(session: requests.Session, url: str, delay: float = 0.5) -> Dict:
-    """
-    Verify a single URL for accessibility and content quality.
+    With a cache, a URL whose last check was healthy (and read at least
+    max_bytes) is not requested while it is younger than the cache's
+    max_age, and revalidated with a conditional request after that; a 304
+    reuses the cached result.
 
     Args:
         session: Requests session with retry logic
         url: URL to verify
-        delay: Delay in seconds between requests (to be respectful)
+        limiter: Per-host politeness budget (to be respectful); None to not wait
+        timeout: Request timeout in seconds
+        max_bytes: Body bytes to read for the content check
+        cache: Results of previous runs; None to always check
 
     Returns:
-        Dictionary with verification results
+        Dictionary with verification results; "cache" is "fresh" (no
+        request), "not modified" (304) or None (checked)
     """
     result = {
         "url": url,
@@ -188,64 +324,72 @@ def verify_link(session: requests.Session, url: str, delay: float = 0.5) -> Dict
         "error": None,
         "redirect_url": None,
         "cloudflare_protected": False,
+        "cache": None,
     }
 
     # Skip obviously invalid URLs
-    if not url or url in [
-        "Not found",
-        "Not found.",
-        "Not applicable",
-        "No link found",
-        "null",
-        "None",
-    ]:
+    if not url or url in PLACEHOLDER_URLS:
         result["error"] = "Invalid or placeholder URL"
         return result
 
+    # Reuse a recent healthy result, or revalidate it conditionally
+    entry = cache.get(url) if cache else None
+    if cache and cache.fresh(entry, max_bytes):
+        return {**entry["result"], "url": url, "cache": "fresh"}
+    headers = LinkCache.conditional_headers(entry, max_bytes)
+    validators = (None, None)  # ETag and Last-Modified of the response
+
     try:
-        # Add delay to be respectful to servers
-        time.sleep(delay)
-
-        # Make request with timeout
-        response = session.get(url, timeout=10, allow_redirects=True)
-
-        result["status_code"] = response.status_code
-        result["status_name"] = get_status_name(response.status_code)
-
-        # Check if we were redirected
-        if response.url != url:
-            result["redirect_url"] = response.url
-
-        # Detect Cloudflare protection
-        if response.status_code == 403:
-            # Check for Cloudflare indicators in response
-            response_text = response.text.lower()
-            cloudflare_indicators = [
-                "cloudflare",
-                "cf-ray",
-                "checking your browser",
-                "ddos protection",
-                "ray id",
-            ]
-            if any(indicator in response_text for indicator in cloudflare_indicators):
-                result["cloudflare_protected"] = True
-                result["error"] = "Cloudflare protected (403)"
-
-        # Consider 2xx and 3xx as accessible
-        if 200 <= response.status_code < 400:
-            result["accessible"] = True
-
-        # If accessible, check content quality
-        if result["accessible"] and response.status_code == 200:
-            content_info = check_content_quality(response)
-            result["content_valid"] = content_info["content_valid"]
-            result["content_length"] = content_info["content_length"]
-            result["has_error_indicator"] = content_info["has_error_indicator"]
-        else:
-            result["content_length"] = 0
+        # Wait for the host's politeness budget, then make request with timeout
+        request = {"timeout": timeout, "allow_redirects": True, "headers": headers}
+        with limiter.slot(url) if limiter else nullcontext():
+            if max_bytes:
+                response = session.get(url, stream=True, **request)
+            else:
+                response = session.head(url, **request)
+                if response.status_code in (405, 501):
+                    response = session.get(url, stream=True, **request)
+
+            # Closing releases the connection without reading the rest of the body;
+            # the host slot is held until the body has been read and scanned
+            with response:
+                if response.status_code == 304 and headers:
+                    cache.touch(url)
+                    return {**entry["result"], "url": url, "cache": "not modified"}
+                validators = (
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                )
+
+                result["status_code"] = response.status_code
+                result["status_name"] = get_status_name(response.status_code)
+
+                # Check if we were redirected (not just to a canonical form)
+                if normalize_url(response.url) != normalize_url(url):
+                    result["redirect_url"] = response.url
+
+                # Detect Cloudflare protection
+                if response.status_code == 403 and max_bytes:
+                    _, cloudflare = scan_body(response, _CLOUDFLARE_PATTERN, max_bytes)
+                    if cloudflare:
+                        result["cloudflare_protected"] = True
+                        result["error"] = "Cloudflare protected (403)"
+
+                # Consider 2xx and 3xx as accessible
+                if 200 <= response.status_code < 400:
+                    result["accessible"] = True
+
+                # If accessible, check content quality
+                if result["accessible"] and response.status_code == 200 and max_bytes:
+                    content_info = check_content_quality(response, max_bytes)
+                    result["content_valid"] = content_info["content_valid"]
+                    result["content_length"] = content_info["content_length"]
+                    result["has_error_indicator"] = content_info["has_error_indicator"]
+                else:
+                    result["content_length"] = 0
 
     except requests.exceptions.Timeout:
-        result["error"] = "Request timeout (>10s)"
+        result["error"] = f"Request timeout (>{timeout:g}s)"
     except requests.exceptions.TooManyRedirects:
         result["error"] = "Too many redirects"
     except requests.exceptions.ConnectionError as e:
@@ -255,11 +399,104 @@ def verify_link(session: requests.Session, url: str, delay: float = 0.5) -> Dict
     except Exception as e:
         result["error"] = f"Unexpected error: {str(e)[:100]}"
 
+    if cache and result["status_code"] is not None:
+        cache.store(url, result, *validators, max_bytes)
     return result
 
 
+def normalize_url(url) -> str | None:
+    """
+    Normalize a link for deduplication, or return None if it is not a web URL.
+
+    Lowercases the scheme and host, drops default ports and fragments, and
+    writes an empty path as "/", so variants of the same page are fetched
+    once and match the URL a server reports after the request.
+
+    Example:
+        >>> normalize_url(" HTTPS://WWW.UN.ORG:443/#top ")
+        'https://www.un.org/'
+        >>> normalize_url("https://www.un.org")
+        'https://www.un.org/'
+        >>> normalize_url("Not found") is None
+        True
+    """
+    if not isinstance(url, str) or url.strip() in PLACEHOLDER_URLS:
+        return None
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        return None
+    netloc = parts.hostname
+    if parts.port and parts.port != {"http": 80, "https": 443}[scheme]:
+        netloc += f":{parts.port}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def check_urls(
+    urls: list[str],
+    workers: int = WORKERS,
+    limiter: HostLimiter | None = None,
+    timeout: float = TIMEOUT,
+    max_bytes: int = MAX_CONTENT_BYTES,
+    cache: LinkCache | None = None,
+) -> list[Dict]:
+    """
+    Verify URLs concurrently within the per-host politeness budget.
+
+    Args:
+        urls: URLs to verify
+        workers: Number of links checked concurrently
+        limiter: Per-host politeness budget (default: HostLimiter())
+        timeout: Request timeout in seconds
+        max_bytes: Body bytes read per page for the content check
+        cache: Results of previous runs (see verify_link()); None to check all
+
+    Returns:
+        One verify_link() result per URL, in the order of `urls`
+    """
+    session = create_session(workers)
+    limiter = limiter or HostLimiter()
+    results = [None] * len(urls)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                verify_link, session, urls[i], limiter, timeout, max_bytes, cache
+            ): i
+            for i in interleave_by_host(urls)
+        }
+        # Use tqdm for progress bar
+        for future in tqdm(
+            as_completed(futures), total=len(futures), desc="Verifying links"
+        ):
+            results[futures[future]] = future.result()
+    elapsed = time.perf_counter() - start
+    print(
+        f"Checked {len(urls)} URLs in {elapsed:.1f}s "
+        f"({len(urls) / elapsed if elapsed else 0:.1f} URLs/s, "
+        f"{workers} workers, {limiter.max_concurrent} per host)"
+    )
+    if cache:
+        statuses = [result["cache"] for result in results]
+        print(
+            f"Cache: {statuses.count('fresh')} fresh, "
+            f"{statuses.count('not modified')} not modified (304), "
+            f"{statuses.count(None)} checked"
+        )
+    return results
+
+
 def verify_entity_links(
-    df: pd.DataFrame, link_column: str = "entity_link", take_screenshots: bool = True
+    df: pd.DataFrame,
+    link_column: str = "entity_link",
+    take_screenshots: bool = True,
+    workers: int = WORKERS,
+    limiter: HostLimiter | None = None,
+    timeout: float = TIMEOUT,
+    max_bytes: int = MAX_CONTENT_BYTES,
+    cache: LinkCache | None = None,
+    screenshot_pages: int = screenshots.PAGES,
 ) -> pd.DataFrame:
     """
     Verify all entity links in the dataframe.
@@ -268,13 +505,16 @@ def verify_entity_links(
         df: DataFrame with entity data
         link_column: Name of column containing links to verify
         take_screenshots: Whether to take screenshots of the pages
+        workers: Number of links checked concurrently
+        limiter: Per-host politeness budget (default: HostLimiter())
+        timeout: Request timeout in seconds
+        max_bytes: Body bytes read per page for the content check
+        cache: Results of previous runs (see verify_link()); None to check all
+        screenshot_pages: Pages loaded in parallel for screenshots
 
     Returns:
-        DataFrame with verification results
+        DataFrame with verification results, in the order of `df`
     """
-    session = create_session()
-    results = []
-
     # Create screenshot directory if needed
     screenshot_dir = None
     if take_screenshots:
@@ -282,25 +522,90 @@ def verify_entity_links(
         screenshot_dir.mkdir(parents=True, exist_ok=True)
         print(f"Screenshots will be saved to: {screenshot_dir}")
 
-    # Use tqdm for progress bar
-    for idx, row in tqdm(df.iterrows(), total=len(df), desc="Verifying links"):
-        entity = row.get("entity", "Unknown")
-        url = row.get(link_column)
+    entities = df["entity"].tolist() if "entity" in df else ["Unknown"] * len(df)
+    urls = [url if isinstance(url, str) else "" for url in df[link_column]]
+    results = [
+        {**result, "entity": entity, "column": link_column}
+        for result, entity in zip(
+            check_urls(urls, workers, limiter, timeout, max_bytes, cache), entities
+        )
+    ]
 
-        result = verify_link(session, str(url) if url else "")
-        result["entity"] = entity
-        result["column"] = link_column
+    # Take screenshots if enabled, in one shared browser
+    if take_screenshots and screenshot_dir:
+        shots = screenshots.take_screenshots(
+            list(zip(entities, urls)), screenshot_dir, screenshot_pages
+        )
+        for result, shot in zip(results, shots):
+            result.update(shot)
 
-        # Take screenshot if enabled and URL is accessible
-        if take_screenshots and screenshot_dir:
-            screenshot_result = take_screenshot(
-                str(url) if url else "", entity, screenshot_dir
-            )
-            result.update(screenshot_result)
+    return pd.DataFrame(results)
 
-        results.append(result)
 
-    return pd.DataFrame(results)
+def collect_links(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """
+    Reshape the link columns into one row per (entity, column) with a value.
+
+    Returns:
+        DataFrame with entity, column, url and normalized_url (None for
+        placeholders such as "Not found" and other non-web values)
+    """
+    columns = [column for column in columns if column in df]
+    links = df.melt(
+        id_vars="entity", value_vars=columns, var_name="column", value_name="url"
+    )
+    links = links[links["url"].notna()]
+    links["url"] = links["url"].astype(str).str.strip()
+    links = links[links["url"].ne("")].reset_index(drop=True)
+    links["normalized_url"] = links["url"].map(normalize_url)
+    return links
+
+
+def verify_all_links(
+    df: pd.DataFrame,
+    columns: list[str] = LINK_COLUMNS,
+    workers: int = WORKERS,
+    limiter: HostLimiter | None = None,
+    timeout: float = TIMEOUT,
+    max_bytes: int = MAX_CONTENT_BYTES,
+    cache: LinkCache | None = None,
+) -> pd.DataFrame:
+    """
+    Verify every link column, fetching each distinct URL only once.
+
+    URLs are normalized and deduplicated across entities and columns, each
+    unique URL is checked once, and its result is fanned back out to every
+    (entity, column) pair that links to it. Arguments are as for
+    verify_entity_links().
+
+    Returns:
+        Long-format DataFrame: one row per (entity, column) with a value, with
+        the original url, the checked_url and the verify_link() result fields
+    """
+    links = collect_links(df, columns)
+    unique_urls = links["normalized_url"].dropna().unique().tolist()
+    print(
+        f"{len(links)} links in {links['column'].nunique()} columns: "
+        f"{len(unique_urls)} unique URLs, "
+        f"{links['normalized_url'].isna().sum()} placeholders"
+    )
+
+    checked = pd.DataFrame(
+        check_urls(unique_urls, workers, limiter, timeout, max_bytes, cache),
+        columns=RESULT_FIELDS,
+    )
+    checked = checked.rename(columns={"url": "normalized_url"})
+    results = links.merge(checked, on="normalized_url", how="left")
+
+    # Placeholders and non-web values are reported without a request
+    placeholder = results["normalized_url"].isna()
+    results.loc[placeholder, "accessible"] = False
+    results.loc[placeholder, "content_valid"] = False
+    results.loc[placeholder, "cloudflare_protected"] = False
+    results.loc[placeholder, "error"] = "Invalid or placeholder URL"
+    flags = ["accessible", "content_valid", "cloudflare_protected"]
+    results[flags] = results[flags].astype(bool)
+    return results.rename(columns={"normalized_url": "checked_url"})
 
 
 if __name__ == "__main__":
@@ -312,7 +617,66 @@ if __name__ == "__main__":
         action="store_true",
         help="Take screenshots of entity pages (requires Playwright)",
     )
+    parser.add_argument(
+        "--screenshot-pages",
+        type=int,
+        default=screenshots.PAGES,
+        help=f"Pages loaded in parallel for screenshots (default: {screenshots.PAGES})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help=f"Links checked concurrently (default: {WORKERS})",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=PER_HOST,
+        help=f"Concurrent requests per host (default: {PER_HOST})",
+    )
+    parser.add_argument(
+        "--host-delay",
+        type=float,
+        default=HOST_DELAY,
+        help=f"Seconds between requests to the same host (default: {HOST_DELAY})",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=TIMEOUT,
+        help=f"Request timeout in seconds (default: {TIMEOUT})",
+    )
+    parser.add_argument(
+        "--max-kb",
+        type=int,
+        default=MAX_CONTENT_BYTES // 1024,
+        help="KB of each page read for the content check; 0 checks the status "
+        f"only with HEAD requests (default: {MAX_CONTENT_BYTES // 1024})",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=MAX_AGE / 3600,
+        help="Hours during which a healthy cached result is reused without a "
+        "request; older ones are revalidated with conditional requests "
+        f"(default: {MAX_AGE / 3600:g})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Check every link without reading or updating {CACHE_PATH}",
+    )
+    parser.add_argument(
+        "--all-columns",
+        action="store_true",
+        help=f"Verify every link column, each unique URL once, into {ALL_COLUMNS_OUTPUT}",
+    )
     args = parser.parse_args()
+    if args.all_columns and args.screenshots:
+        parser.error("--screenshots is not supported with --all-columns")
+    limiter = HostLimiter(args.per_host, args.host_delay)
+    cache = None if args.no_cache else LinkCache(CACHE_PATH, args.max_age * 3600)
 
     input_path = Path("public") / "un-entities.json"
     with open(input_path, "r", encoding="utf-8") as f:
@@ -320,74 +684,111 @@ if __name__ == "__main__":
 
     df = pd.DataFrame(entities_json)
 
-    # Verify primary entity links
-    print(f"Verifying {len(df)} entity links...")
-    print(f"Screenshots: {'enabled' if args.screenshots else 'disabled'}")
-    results = verify_entity_links(df, "entity_link", take_screenshots=args.screenshots)
-
-    # Reorder columns to put entity and url first
-    column_order = [
-        "entity",
-        "url",
-        "accessible",
-        "content_valid",
-        "content_length",
-        "has_error_indicator",
-        "status_code",
-        "status_name",
-        "cloudflare_protected",
-        "error",
-        "redirect_url",
-    ]
-
-    # Add screenshot columns if they exist
-    if args.screenshots:
-        column_order.extend(["screenshot_taken", "screenshot_path", "screenshot_error"])
-
-    column_order.append("column")
-
-    # Only include columns that exist
-    column_order = [col for col in column_order if col in results.columns]
-    results = results[column_order]
-
-    # Print summary
-    print(f"\n{'=' * 60}")
-    print("VERIFICATION SUMMARY")
-    print(f"{'=' * 60}")
-    print(f"Total entities: {len(results)}")
-    print(
-        f"Accessible: {results['accessible'].sum()} ({results['accessible'].sum() / len(results) * 100:.1f}%)"
-    )
-    print(
-        f"Inaccessible: {(~results['accessible']).sum()} ({(~results['accessible']).sum() / len(results) * 100:.1f}%)"
-    )
-
-    # Count Cloudflare-protected sites
-    cloudflare_count = (results["status_code"] == 403).sum()
-    if cloudflare_count > 0:
-        print(f"🔒 Cloudflare/403 Protected: {cloudflare_count}")
-
-    # Show some examples of inaccessible sites
-    inaccessible = results[~results["accessible"]]
-    if len(inaccessible) > 0:
-        print(f"\nInaccessible sites:")
-        for _, row in inaccessible.head(5).iterrows():
-            status = (
-                f"{row['status_code']} {row['status_name']}"
-                if pd.notna(row["status_code"])
-                else row["error"]
+    if args.all_columns:
+        results = verify_all_links(
+            df,
+            workers=args.workers,
+            limiter=limiter,
+            timeout=args.timeout,
+            max_bytes=args.max_kb * 1024,
+            cache=cache,
+        )
+        summary = results.groupby("column", sort=False).agg(
+            links=("url", "size"),
+            checked=("checked_url", "count"),
+            accessible=("accessible", "sum"),
+        )
+        print(f"\n{summary.to_string()}\n")
+        ALL_COLUMNS_OUTPUT.parent.mkdir(parents=True, exist_ok=True)
+        results.to_csv(ALL_COLUMNS_OUTPUT, index=False)
+        print(f"📄 CSV saved to: {ALL_COLUMNS_OUTPUT}")
+
+    else:
+        # Verify primary entity links
+        print(f"Verifying {len(df)} entity links...")
+        print(f"Screenshots: {'enabled' if args.screenshots else 'disabled'}")
+        results = verify_entity_links(
+            df,
+            "entity_link",
+            take_screenshots=args.screenshots,
+            workers=args.workers,
+            limiter=limiter,
+            timeout=args.timeout,
+            max_bytes=args.max_kb * 1024,
+            cache=cache,
+            screenshot_pages=args.screenshot_pages,
+        )
+
+        # Reorder columns to put entity and url first
+        column_order = [
+            "entity",
+            "url",
+            "accessible",
+            "content_valid",
+            "content_length",
+            "has_error_indicator",
+            "status_code",
+            "status_name",
+            "cloudflare_protected",
+            "error",
+            "redirect_url",
+        ]
+
+        # Add screenshot columns if they exist
+        if args.screenshots:
+            column_order.extend(
+                [
+                    "screenshot_taken",
+                    "screenshot_path",
+                    "screenshot_error",
+                    "screenshot_changed",
+                ]
             )
-            print(f"  - {row['entity']}: {status}")
-        if len(inaccessible) > 5:
-            print(f"  ... and {len(inaccessible) - 5} more")
-    print(f"{'=' * 60}\n")
-
-    # Save results
-    output_path = Path("data") / "output" / "entity_link_verification_results.csv"
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    results.to_csv(output_path, index=False)
-    print(f"📄 CSV saved to: {output_path}")
-
-    output_path = Path("public") / "entity_link_verification_results.json"
-    results.to_json(output_path, orient="records", indent=2)
-    print(f"📄 JSON saved to: {output_path}")
+
+        column_order.append("column")
+
+        # Only include columns that exist
+        column_order = [col for col in column_order if col in results.columns]
+        results = results[column_order]
+
+        # Print summary
+        print(f"\n{'=' * 60}")
+        print("VERIFICATION SUMMARY")
+        print(f"{'=' * 60}")
+        print(f"Total entities: {len(results)}")
+        print(
+            f"Accessible: {results['accessible'].sum()} ({results['accessible'].sum() / len(results) * 100:.1f}%)"
+        )
+        print(
+            f"Inaccessible: {(~results['accessible']).sum()} ({(~results['accessible']).sum() / len(results) * 100:.1f}%)"
+        )
+
+        # Count Cloudflare-protected sites
+        cloudflare_count = (results["status_code"] == 403).sum()
+        if cloudflare_count > 0:
+            print(f"🔒 Cloudflare/403 Protected: {cloudflare_count}")
+
+        # Show some examples of inaccessible sites
+        inaccessible = results[~results["accessible"]]
+        if len(inaccessible) > 0:
+            print(f"\nInaccessible sites:")
+            for _, row in inaccessible.head(5).iterrows():
+                status = (
+                    f"{row['status_code']} {row['status_name']}"
+                    if pd.notna(row["status_code"])
+                    else row["error"]
+                )
+                print(f"  - {row['entity']}: {status}")
+            if len(inaccessible) > 5:
+                print(f"  ... and {len(inaccessible) - 5} more")
+        print(f"{'=' * 60}\n")
+
+        # Save results
+        output_path = Path("data") / "output" / "entity_link_verification_results.csv"
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        results.to_csv(output_path, index=False)
+        print(f"📄 CSV saved to: {output_path}")
+
+        output_path = Path("public") / "entity_link_verification_results.json"
+        results.to_json(output_path, orient="records", indent=2)
+        print(f"📄 JSON saved to: {output_path}")
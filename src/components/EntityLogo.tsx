@@ -7,7 +7,7 @@ interface EntityLogoProps {
   className?: string;
 }
 
-const LOGO_EXTENSIONS = ["svg", "png", "jpg", "jpeg"];
+const LOGO_EXTENSIONS = ["svg", "webp", "png", "jpg", "jpeg"];
 
 export default function EntityLogo({
   entityName,
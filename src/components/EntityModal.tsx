@@ -351,7 +351,7 @@ export default function EntityModal({
             {entity!.entity_headquarters && (
               <Field label="Headquarters">
                 <span className="text-sm text-gray-900">
-                  {entity!.entity_headquarters}
+                  {[entity!.entity_headquarters].flat().join("; ")}
                 </span>
               </Field>
             )}
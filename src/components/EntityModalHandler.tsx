@@ -3,7 +3,7 @@
 import { useSearchParams, useRouter } from "next/navigation";
 import { useState, useEffect } from "react";
 import EntityModal from "./EntityModal";
-import { getEntityBySlug } from "@/lib/entities";
+import { fetchEntityDetails, getEntityBySlug } from "@/lib/entities";
 import { Entity } from "@/types/entity";
 import { isEntityAlias, resolveEntityAlias } from "@/lib/entityAliases";
 
@@ -46,21 +46,30 @@ export default function ModalHandler() {
     setLoading(true);
     setError(null);
 
-    try {
-      const foundEntity = getEntityBySlug(entitySlug);
-
-      if (!foundEntity) {
-        console.warn(`Entity "${entitySlug}" not found`);
-        setError("Entity not found");
-      } else {
-        setEntity(foundEntity);
-      }
-    } catch (err) {
-      console.error("Error loading entity:", err);
-      setError("Failed to load entity");
-    } finally {
+    const foundEntity = getEntityBySlug(entitySlug);
+    if (!foundEntity) {
+      console.warn(`Entity "${entitySlug}" not found`);
+      setError("Entity not found");
       setLoading(false);
+      return;
     }
+
+    // Show the index entry right away, then the full record once loaded
+    setEntity(foundEntity);
+    let cancelled = false;
+    fetchEntityDetails(foundEntity)
+      .then((details) => {
+        if (!cancelled) setEntity(details);
+      })
+      .catch((err) => {
+        console.error("Error loading entity:", err);
+      })
+      .finally(() => {
+        if (!cancelled) setLoading(false);
+      });
+    return () => {
+      cancelled = true;
+    };
   }, [entitySlug, router]);
 
   const handleClose = () => {
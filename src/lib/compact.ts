@@ -0,0 +1,42 @@
+/**
+ * Compact, dictionary-encoded entity data as written by the Python pipeline
+ * (python/compact.py, `02-process_entities_data.py --compact`).
+ * Rows are arrays in `columns` order; columns listed in `dictionaries` hold
+ * integer codes (or arrays of codes) into their dictionary instead of strings.
+ */
+export interface CompactData {
+  columns: string[];
+  dictionaries: Record<string, string[]>;
+  rows: unknown[][];
+}
+
+/**
+ * Decodes compact entity data back into the records of the original JSON file.
+ *
+ * @param data - Parsed contents of a `*.compact.json` file
+ * @returns Array of records, identical to the regular JSON export
+ *
+ * @example
+ * const response = await fetch("/un-entities.compact.json");
+ * const entities = decodeCompact(await response.json()) as Entity[];
+ */
+export function decodeCompact(data: CompactData): Record<string, unknown>[] {
+  const { columns, dictionaries, rows } = data;
+  const columnDictionaries = columns.map((column) => dictionaries[column]);
+
+  return rows.map((row) => {
+    const record: Record<string, unknown> = {};
+    columns.forEach((column, index) => {
+      const value = row[index];
+      const dictionary = columnDictionaries[index];
+      if (!dictionary || value === null) {
+        record[column] = value;
+      } else if (Array.isArray(value)) {
+        record[column] = value.map((code: number) => dictionary[code]);
+      } else {
+        record[column] = dictionary[value as number];
+      }
+    });
+    return record;
+  });
+}
@@ -1,5 +1,6 @@
 import { Entity, EntityFilters } from "@/types/entity";
-import entitiesData from "../../public/un-entities.json";
+import entitiesData from "../../public/un-entities-index.json";
+import lookups from "../../public/un-entities-lookups.json";
 import { hiddenDisplayCategoryGroups, placeholderEntities } from "./constants";
 import { createEntitySlug, parseEntityAliases } from "./utils";
 
@@ -44,41 +45,40 @@ function shouldHideEntityFromDisplay(entity: Entity): boolean {
   );
 }
 
+/**
+ * Entities of the index, in file order: row numbers in un-entities-lookups.json
+ * refer to positions in this array.
+ */
+const indexEntities: Entity[] = (entitiesData as Record<string, unknown>[]).map(
+  (entity) =>
+    ({
+      ...entity,
+      un_principal_organ: parseUnPrincipalOrgan(entity.un_principal_organ),
+    }) as Entity,
+);
+
 /**
  * Pre-loaded array of all UN System entities.
- * Data is imported from un-entities.json at build time for optimal performance.
+ * Data is imported from un-entities-index.json at build time for optimal performance.
  * The un_principal_organ field is parsed on load to ensure consistent array format.
  *
  * @remarks
- * This is loaded once at module initialization (~180KB JSON file).
- * Use this for operations requiring the full dataset.
+ * The index only holds the fields used for listing, searching and filtering
+ * (~45KB instead of the ~280KB full dataset). The remaining fields are loaded
+ * per entity with {@link fetchEntityDetails}.
  */
 export const entities: Entity[] = [
-  ...((entitiesData as Record<string, unknown>[])
-    .map(
-      (entity) =>
-        ({
-          ...entity,
-          un_principal_organ: parseUnPrincipalOrgan(entity.un_principal_organ),
-        }) as Entity,
-    )
-    .filter((entity) => !shouldHideEntityFromDisplay(entity)) as Entity[]),
+  ...indexEntities.filter((entity) => !shouldHideEntityFromDisplay(entity)),
   // Hardcoded display-only placeholders — not in Airtable or the dataset.
   // Cast via unknown: only the fields used for rendering are present.
   ...(placeholderEntities as unknown as Entity[]),
 ];
 
 /**
- * Pre-computed map of entity slugs to entity objects for O(1) lookups.
- * Enables fast entity retrieval by URL-safe slug without array iteration.
- *
- * @example
- * entitySlugMap.get('unicef') // Returns the UNICEF entity object
- * entitySlugMap.get('un-women') // Returns the UN-Women entity object
+ * Row numbers of the entities by slug, precomputed by the Python pipeline
+ * (python/lookups.py) for O(1) lookups without building a map on load.
  */
-export const entitySlugMap = new Map(
-  entities.map((entity) => [createEntitySlug(entity.entity), entity]),
-);
+const slugRows: Record<string, number> = lookups.slug;
 
 /**
  * Centralized function for filtering and searching entities.
@@ -152,7 +152,7 @@ export const getAllEntities = () => entities;
 
 /**
  * Retrieves a single entity by its URL slug.
- * Uses pre-computed map for O(1) lookup performance.
+ * Uses the precomputed slug lookup for O(1) lookup performance.
  *
  * @param slug - URL-safe entity identifier (e.g., "unicef", "un-women")
  * @returns Entity object if found, null otherwise
@@ -163,7 +163,41 @@ export const getAllEntities = () => entities;
  */
 export const getEntityBySlug = (slug: string): Entity | null => {
   const decodedSlug = decodeURIComponent(slug).toLowerCase();
-  return entitySlugMap.get(decodedSlug) || null;
+  if (Object.hasOwn(slugRows, decodedSlug)) {
+    const entity = indexEntities[slugRows[decodedSlug]];
+    return shouldHideEntityFromDisplay(entity) ? null : entity;
+  }
+  return (
+    (placeholderEntities as unknown as Entity[]).find(
+      (entity) => createEntitySlug(entity.entity) === decodedSlug,
+    ) || null
+  );
+};
+
+/**
+ * Loads the full record of an entity from its detail file (public/entities/<slug>.json)
+ * and merges it over the index entry.
+ * Falls back to the index entry if the detail file cannot be loaded.
+ *
+ * @param entity - Index entry of the entity
+ * @returns Entity with all fields
+ */
+export const fetchEntityDetails = async (entity: Entity): Promise<Entity> => {
+  try {
+    const response = await fetch(
+      `/entities/${createEntitySlug(entity.entity)}.json`,
+    );
+    if (!response.ok) return entity;
+    const details = await response.json();
+    // Keep the organs parsed on load
+    return {
+      ...entity,
+      ...details,
+      un_principal_organ: entity.un_principal_organ,
+    };
+  } catch {
+    return entity;
+  }
 };
 
 /**
@@ -39,20 +39,25 @@ export function createEntitySlug(entityName: string): string {
 }
 
 /**
- * Parses entity aliases from Airtable string format to an array.
- * Handles JSON-like string representations with single quotes.
+ * Parses entity aliases to an array.
+ * Accepts the array exported from typed Airtable fetches, as well as the
+ * JSON-like string representations with single quotes from older exports.
  *
- * @param aliasString - String representation of aliases (e.g., "['RCS','UNDCO']")
+ * @param aliasString - Aliases array or string representation (e.g., "['RCS','UNDCO']")
  * @returns Array of alias strings, or empty array if parsing fails
  *
  * @example
  * parseEntityAliases("['RCS','UNDCO']") // Returns: ['RCS', 'UNDCO']
+ * parseEntityAliases(["RCS", "UNDCO"]) // Returns: ['RCS', 'UNDCO']
  * parseEntityAliases(null) // Returns: []
  * parseEntityAliases("invalid") // Returns: []
  */
 export function parseEntityAliases(
-  aliasString: string | null | undefined,
+  aliasString: string[] | string | null | undefined,
 ): string[] {
+  if (Array.isArray(aliasString)) {
+    return aliasString.filter((alias) => typeof alias === "string");
+  }
   if (!aliasString || typeof aliasString !== "string") return [];
 
   try {
@@ -73,14 +73,14 @@ export interface Entity {
   entity_wikipedia_page: string | null;
   /** Special notes or footnotes about this entity */
   entity_footnotes: string | null;
-  /** Alternative names or acronyms (JSON string format) */
-  entity_aliases: string | null;
+  /** Alternative names or acronyms (array, or JSON string from older exports) */
+  entity_aliases: string[] | string | null;
   /** Link to UN mandate registry */
   entity_mandate_registry: string | null;
   /** Custom mandate registry link (if different from standard) */
   entity_custom_mandate_registry: string | null;
-  /** Headquarters location */
-  entity_headquarters: string | null;
+  /** Headquarters location(s) */
+  entity_headquarters: string[] | string | null;
   /** Airtable record ID for reference */
   record_id: string;
   /** Flag indicating if entity data needs review/verification */
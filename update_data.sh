@@ -8,12 +8,9 @@ set -e  # Exit on any error
 echo "🚀 Starting data update process..."
 echo ""
 
-echo "📡 Step 1: Fetching data from Airtable..."
-uv run python/01-fetch_from_airtable.py
-
-echo ""
-echo "⚙️ Step 2: Processing entities data..."
-uv run python/02-process_entities_data.py
+echo "📡 Fetching data from Airtable and processing entities data..."
+# Runs 01 then 02, skipping 02 when the fetched data is unchanged
+PYTHONPATH=python uv run python -m pipeline run fetch process
 
 echo ""
 echo "✅ Data update complete!"
@@ -21,8 +18,9 @@ echo "📄 Updated files:"
 echo "  - data/input/input_entities.csv"
 echo "  - public/un-entities.json"
 echo "  - public/un-entities.csv"
+echo "  - data/output/un-entities-manifest.json (entity hashes, changed entities)"
 echo ""
-echo "💡 Optional steps:"
+echo "💡 Optional steps (or run them all in parallel: PYTHONPATH=python uv run python -m pipeline run all):"
 echo "   • Download/update headshot images:"
 echo "     uv run python/03-download_headshots.py [--force]"
 echo "   • Verify entity links:"